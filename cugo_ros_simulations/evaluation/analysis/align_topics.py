@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+토픽 시간 정렬 (as-of join / 균일 리샘플링)
+
+/odom(~50 Hz), /imu/data_raw(~100 Hz), /cmd_vel(~20 Hz), /amcl_pose(드문드문)는
+수신 시각이 서로 달라 combined CSV에서는 빈 칸이 섞인 행으로 나옵니다.
+이 모듈은 bag_to_csv.py가 저장한 토픽별 테이블을 하나의 시계(clock)에 맞춰
+한 테이블로 합칩니다.
+
+- 시계: 기준 토픽의 timestamp (as-of join) 또는 --rate Hz 균일 시각 (리샘플링)
+- 모든 토픽의 int64 timestamp를 한 번 병합 정렬해서 각 시계 시각 이하의
+  마지막 샘플 위치를 한꺼번에 구합니다 (토픽 수와 무관하게 정렬 1회).
+- 연속 신호(위치, 속도, IMU)는 앞뒤 샘플 사이 선형 보간, yaw는 unwrap 후 보간,
+  명령(/cmd_vel)과 드문 추정값(/amcl_pose)은 마지막 값 유지(hold).
+- 앞뒤 샘플 간격이 max_gap(초)보다 넓은 구간(토픽 끊김)과 첫 샘플 이전은 NaN.
+
+출력은 컬럼 이름이 '<토픽>.<컬럼>'(예: 'odom.twist.twist.linear.x')인
+'aligned' 테이블이며, 입력과 같은 디렉토리에 저장합니다.
+
+사용 예:
+    python3 align_topics.py --table-dirs '../rosbags/*/*/parquet' --rate 50
+
+    # bag 변환과 함께
+    python3 bag_to_csv.py --bag-path <bag> --output-dir <bag>/parquet --format parquet --align-clock /odom
+
+    from align_topics import align_table_dir
+    aligned = align_table_dir("../rosbags/teb/stage123_xxx/csv", rate=50.0)
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# 같은 디렉토리 모듈 import를 위한 경로 설정
+script_dir = os.path.dirname(os.path.abspath(__file__))
+if script_dir not in sys.path:
+    sys.path.insert(0, script_dir)
+
+from fast_decoders import quaternion_to_yaw
+from nav_metrics import expand_dirs, wrap_angle
+from table_io import FORMATS, read_topic_table, topic_file_stem, topic_table_path, write_topic_table
+
+
+# 정렬 방식
+INTERP = "interp"   # 선형 보간
+ANGLE = "angle"     # unwrap 후 선형 보간, [-pi, pi)로 되돌림
+HOLD = "hold"       # 마지막 값 유지
+
+ALIGN_METHODS = (INTERP, ANGLE, HOLD)
+
+# 쿼터니언에서 계산하는 파생 컬럼
+YAW = "yaw"
+_ORIENTATION = "pose.pose.orientation"
+
+# 토픽 → [(컬럼, 방식)]
+DEFAULT_SIGNALS: Dict[str, List[Tuple[str, str]]] = {
+    "/odom": [
+        ("pose.pose.position.x", INTERP),
+        ("pose.pose.position.y", INTERP),
+        (YAW, ANGLE),
+        ("twist.twist.linear.x", INTERP),
+        ("twist.twist.angular.z", INTERP),
+    ],
+    "/imu/data_raw": [
+        ("linear_acceleration.x", INTERP),
+        ("linear_acceleration.y", INTERP),
+        ("angular_velocity.z", INTERP),
+    ],
+    "/cmd_vel": [
+        ("linear.x", HOLD),
+        ("angular.z", HOLD),
+    ],
+    "/amcl_pose": [
+        ("pose.pose.position.x", HOLD),
+        ("pose.pose.position.y", HOLD),
+        (YAW, HOLD),
+    ],
+}
+
+DEFAULT_CLOCK = "/odom"
+# 보간을 허용하는 최대 샘플 간격 (초). 이보다 길게 끊긴 구간은 NaN
+DEFAULT_MAX_GAP = 0.5
+
+# 출력 테이블 이름 (aligned.csv / aligned.parquet ...)
+ALIGNED_TABLE = "/aligned"
+
+Table = Dict[str, np.ndarray]
+
+
+def asof_indices(clock: np.ndarray, sources: Sequence[np.ndarray]) -> List[np.ndarray]:
+    """시계의 각 시각 이하인 마지막 샘플 인덱스 (없으면 -1)를 소스별로 반환.
+
+    clock과 sources는 모두 오름차순 int64 ns. 전체를 이어 붙여 stable 정렬
+    한 번으로 병합하며, 같은 시각이면 소스 샘플이 시계보다 앞에 오도록
+    소스를 먼저 이어 붙입니다.
+    """
+    keys = np.concatenate([np.asarray(s, dtype=np.int64) for s in sources] + [clock])
+    tags = np.repeat(
+        np.arange(len(sources) + 1, dtype=np.int32),
+        [len(s) for s in sources] + [len(clock)],
+    )
+    # 정렬된 구간들을 이어 붙인 배열이므로 stable(timsort) 정렬은 병합과 같음
+    tags = tags[np.argsort(keys, kind="stable")]
+    at_clock = tags == len(sources)
+    return [np.cumsum(tags == s)[at_clock] - 1 for s in range(len(sources))]
+
+
+def interpolate(
+    t: np.ndarray,
+    values: np.ndarray,
+    clock: np.ndarray,
+    prev: np.ndarray,
+    max_gap_ns: Optional[int] = None,
+) -> np.ndarray:
+    """prev(asof_indices 결과)와 그 다음 샘플 사이 선형 보간.
+
+    시계 시각이 샘플 시각과 정확히 같으면 그 값, 마지막 샘플 이후와 간격이
+    max_gap_ns보다 넓은 구간은 NaN.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(len(clock), np.nan)
+
+    exact = prev >= 0
+    exact[exact] = t[prev[exact]] == clock[exact]
+    out[exact] = values[prev[exact]]
+
+    between = (prev >= 0) & (prev + 1 < len(t)) & ~exact
+    i = prev[between]
+    # prev는 clock 이하인 마지막 샘플이므로 t[i] <= clock < t[i + 1]
+    dt = t[i + 1] - t[i]
+    w = (clock[between] - t[i]) / dt
+    result = values[i] + w * (values[i + 1] - values[i])
+    if max_gap_ns is not None:
+        result[dt > max_gap_ns] = np.nan
+    out[between] = result
+    return out
+
+
+def hold(values: np.ndarray, prev: np.ndarray) -> np.ndarray:
+    """시계 시각 이하인 마지막 샘플 값 (첫 샘플 이전은 NaN)."""
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(len(prev), np.nan)
+    valid = prev >= 0
+    out[valid] = values[prev[valid]]
+    return out
+
+
+def uniform_clock(tables: Dict[str, Table], signals: Dict[str, List[Tuple[str, str]]], rate: float) -> np.ndarray:
+    """rate Hz 균일 시각. 보간 신호가 모두 있는 구간(없으면 전체 구간)을 덮음."""
+    if rate <= 0:
+        raise ValueError(f"rate는 0보다 커야 합니다: {rate}")
+    spans = [
+        (int(table["timestamp"][0]), int(table["timestamp"][-1]))
+        for topic, table in tables.items()
+        if len(table["timestamp"]) and any(m != HOLD for _, m in signals[topic])
+    ]
+    if spans:
+        start, end = max(s for s, _ in spans), min(e for _, e in spans)
+    else:
+        spans = [(int(t["timestamp"][0]), int(t["timestamp"][-1])) for t in tables.values() if len(t["timestamp"])]
+        if not spans:
+            return np.zeros(0, dtype=np.int64)
+        start, end = min(s for s, _ in spans), max(e for _, e in spans)
+    period = int(round(1e9 / rate))
+    if end < start:
+        return np.zeros(0, dtype=np.int64)
+    return start + np.arange(0, end - start + 1, period, dtype=np.int64)
+
+
+def _sorted_by_time(table: Table) -> Table:
+    t = table["timestamp"]
+    if len(t) < 2 or np.all(t[1:] >= t[:-1]):
+        return table
+    order = np.argsort(t, kind="stable")
+    return {name: values[order] for name, values in table.items()}
+
+
+def align_tables(
+    tables: Dict[str, Table],
+    signals: Optional[Dict[str, List[Tuple[str, str]]]] = None,
+    clock_topic: Optional[str] = DEFAULT_CLOCK,
+    rate: Optional[float] = None,
+    max_gap: Optional[float] = DEFAULT_MAX_GAP,
+) -> Table:
+    """토픽 테이블들을 하나의 시계에 맞춘 테이블로 합침.
+
+    Args:
+        tables: 토픽 → 컬럼 배열 (timestamp 포함, 없는 토픽은 빼고 전달)
+        signals: 토픽 → [(컬럼, 방식)] (기본: DEFAULT_SIGNALS)
+        clock_topic: as-of join 기준 토픽 (rate를 지정하면 무시)
+        rate: 지정하면 이 주파수(Hz)로 균일 리샘플링
+        max_gap: 보간을 허용하는 최대 샘플 간격 (초, None이면 제한 없음)
+    """
+    signals = DEFAULT_SIGNALS if signals is None else signals
+    tables = {topic: _sorted_by_time(tables[topic]) for topic in signals if topic in tables}
+
+    if rate is not None:
+        clock = uniform_clock(tables, signals, rate)
+    else:
+        if clock_topic not in tables:
+            raise ValueError(f"시계 토픽 '{clock_topic}' 테이블이 없습니다.")
+        clock = tables[clock_topic]["timestamp"].astype(np.int64)
+
+    topics = list(tables)
+    prev_of = dict(zip(topics, asof_indices(clock, [tables[topic]["timestamp"] for topic in topics])))
+    max_gap_ns = None if max_gap is None else int(max_gap * 1e9)
+
+    aligned: Table = {"timestamp": clock}
+    for topic in topics:
+        table, prev = tables[topic], prev_of[topic]
+        t = table["timestamp"].astype(np.int64)
+        stem = topic_file_stem(topic)
+        for column, method in signals[topic]:
+            if method == HOLD:
+                values = hold(table[column], prev)
+            elif method == ANGLE:
+                values = wrap_angle(
+                    interpolate(t, np.unwrap(table[column]), clock, prev, max_gap_ns)
+                )
+            elif method == INTERP:
+                values = interpolate(t, table[column], clock, prev, max_gap_ns)
+            else:
+                raise ValueError(f"지원하지 않는 정렬 방식입니다: {method} (가능: {', '.join(ALIGN_METHODS)})")
+            aligned[f"{stem}.{column}"] = values
+    return aligned
+
+
+def load_signal_tables(
+    table_dir: Path,
+    signals: Optional[Dict[str, List[Tuple[str, str]]]] = None,
+) -> Dict[str, Table]:
+    """bag_to_csv.py 출력 디렉토리에서 signals에 필요한 컬럼만 로드 (yaw는 쿼터니언에서 계산).
+
+    변환하지 않은 토픽은 결과에서 빠집니다.
+    """
+    signals = DEFAULT_SIGNALS if signals is None else signals
+    quaternion = [f"{_ORIENTATION}.{axis}" for axis in "xyzw"]
+
+    tables: Dict[str, Table] = {}
+    for topic, specs in signals.items():
+        columns = ["timestamp"]
+        for column, _ in specs:
+            columns += quaternion if column == YAW else [column]
+        try:
+            table = read_topic_table(table_dir, topic, columns=list(dict.fromkeys(columns)))
+        except (FileNotFoundError, KeyError, ValueError):
+            continue
+        if not all(c in table for c in columns):
+            continue
+        if any(column == YAW for column, _ in specs):
+            table[YAW] = quaternion_to_yaw(*(table.pop(c) for c in quaternion))
+        tables[topic] = table
+    return tables
+
+
+def detect_format(table_dir: Path, topics: Sequence[str]) -> str:
+    """디렉토리에 저장된 토픽 테이블의 형식."""
+    for topic in topics:
+        for fmt in ("feather", "parquet", "npz", "csv"):
+            if topic_table_path(table_dir, topic, fmt).exists():
+                return fmt
+    raise FileNotFoundError(f"토픽 테이블이 없습니다: {table_dir}")
+
+
+def align_table_dir(
+    table_dir: Path,
+    signals: Optional[Dict[str, List[Tuple[str, str]]]] = None,
+    clock_topic: Optional[str] = DEFAULT_CLOCK,
+    rate: Optional[float] = None,
+    max_gap: Optional[float] = DEFAULT_MAX_GAP,
+) -> Table:
+    return align_tables(
+        load_signal_tables(Path(table_dir), signals), signals,
+        clock_topic=clock_topic, rate=rate, max_gap=max_gap,
+    )
+
+
+def write_aligned(
+    table_dir: Path,
+    fmt: Optional[str] = None,
+    signals: Optional[Dict[str, List[Tuple[str, str]]]] = None,
+    clock_topic: Optional[str] = DEFAULT_CLOCK,
+    rate: Optional[float] = None,
+    max_gap: Optional[float] = DEFAULT_MAX_GAP,
+) -> Path:
+    """table_dir의 토픽 테이블을 정렬해서 같은 디렉토리에 aligned 테이블로 저장.
+
+    fmt를 지정하지 않으면 입력 테이블과 같은 형식으로 저장합니다.
+    """
+    table_dir = Path(table_dir)
+    signals = DEFAULT_SIGNALS if signals is None else signals
+    if fmt is None:
+        fmt = detect_format(table_dir, list(signals))
+    aligned = align_table_dir(table_dir, signals, clock_topic=clock_topic, rate=rate, max_gap=max_gap)
+    return write_topic_table(aligned, table_dir, ALIGNED_TABLE, fmt)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="토픽별 테이블을 하나의 시계에 맞춰 정렬 (as-of join / 균일 리샘플링)",
+    )
+    parser.add_argument(
+        "--table-dirs",
+        nargs="+",
+        required=True,
+        help="bag_to_csv.py 출력 디렉토리 또는 glob 패턴 (예: '../rosbags/*/*/csv')",
+    )
+    parser.add_argument(
+        "--clock",
+        type=str,
+        default=DEFAULT_CLOCK,
+        help=f"as-of join 기준 토픽 (기본: {DEFAULT_CLOCK}, --rate 지정 시 무시)",
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=None,
+        help="균일 리샘플링 주파수 Hz (예: 50)",
+    )
+    parser.add_argument(
+        "--max-gap",
+        type=float,
+        default=DEFAULT_MAX_GAP,
+        help=f"보간을 허용하는 최대 샘플 간격 초 (기본: {DEFAULT_MAX_GAP})",
+    )
+    parser.add_argument(
+        "--topics",
+        nargs="*",
+        default=[],
+        help=f"정렬할 토픽 (기본: {', '.join(DEFAULT_SIGNALS)})",
+    )
+    parser.add_argument(
+        "--format",
+        choices=FORMATS,
+        default=None,
+        help="출력 형식 (기본: 입력 테이블과 같은 형식)",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+
+    unknown = [topic for topic in args.topics if topic not in DEFAULT_SIGNALS]
+    if unknown:
+        raise ValueError(f"정렬 컬럼이 정의되지 않은 토픽입니다: {', '.join(unknown)}")
+    signals = {topic: DEFAULT_SIGNALS[topic] for topic in args.topics} if args.topics else None
+
+    table_dirs = expand_dirs(args.table_dirs)
+    if not table_dirs:
+        raise FileNotFoundError(f"테이블 디렉토리를 찾지 못했습니다: {args.table_dirs}")
+
+    failures = 0
+    for table_dir in table_dirs:
+        try:
+            path = write_aligned(
+                table_dir, args.format, signals,
+                clock_topic=args.clock, rate=args.rate, max_gap=args.max_gap,
+            )
+        except (FileNotFoundError, ValueError) as e:
+            failures += 1
+            print(f"[ERROR] {table_dir}: {e}")
+            continue
+        print(f"[INFO] Aligned table written to {path}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
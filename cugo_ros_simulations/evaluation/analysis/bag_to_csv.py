@@ -2,7 +2,7 @@
 """
 ROS2 rosbag2 (.db3) → CSV 변환 스크립트
 
-주요 토픽(/odom, /cmd_vel, /imu/data_raw, /local_plan, /global_plan, /amcl_pose)을
+주요 토픽(/odom, /cmd_vel, /imu/data_raw, /local_plan, /global_plan, /plan, /amcl_pose)을
 각각 별도의 CSV 파일로 저장합니다.
 
 사용 예:
@@ -10,27 +10,79 @@ ROS2 rosbag2 (.db3) → CSV 변환 스크립트
         --bag-path ~/dev_ws/cugo_ws/src/rtc-teb_local_planner/cugo_ros_simulations/evaluation/rosbags/teb/stage123_trial1 \
         --output-dir ~/dev_ws/cugo_ws/src/rtc-teb_local_planner/cugo_ros_simulations/evaluation/rosbags/teb/stage123_trial1/csv
 
+nav_msgs/Path, teb_msgs/TrajectoryMsg 토픽은 포즈 수만큼 컬럼을 늘리지 않고
+'<topic>_poses' long 테이블(timestamp, msg_index, pose_index, x, y, z, yaw, ...)로
+따로 저장하며, 원래 테이블에는 헤더와 msg_index, num_poses만 남깁니다.
+
+토픽별 컬럼형 테이블(parquet / feather / npz)로 저장하려면 --format을 지정합니다:
+    python3 bag_to_csv.py --bag-path <bag> --output-dir <bag>/parquet --format parquet
+
+여러 bag을 한 번에 병렬 변환하려면 --bag-root(디렉토리 또는 glob)와 --jobs를 사용합니다:
+    python3 bag_to_csv.py --bag-root 'evaluation/rosbags/*/*' --combined --jobs 8
+
+출력 디렉토리의 .export_cache.json으로 변경 없는 bag은 건너뛰고, 메시지가 추가된 bag은
+추가된 부분만 변환합니다. 항상 처음부터 다시 변환하려면 --force를 사용합니다.
+
+변환 중에는 metadata.yaml의 메시지 수 기준 진행률을 출력하고, 끝나면 토픽별 처리량과
+단계별(read/deserialize/flatten/write) 시간을 요약합니다. --profile을 주면 같은 내용을
+출력 디렉토리의 export_profile.json으로 저장합니다.
+
+긴 실험의 일부 구간만 뽑으려면 --start/--end(bag 시작 기준 상대 초 또는 절대 ns)를
+지정합니다. 토픽 선택과 시작 시각은 rosbag2 StorageFilter/seek로 storage 계층에서
+처리하므로 선택하지 않은 토픽(/tf 등)과 구간 밖의 메시지는 읽지 않습니다:
+    python3 bag_to_csv.py --bag-path <bag> --output-dir <bag>/stage2 --start 30 --end 75
+
+--align-clock(기준 토픽) 또는 --align-rate(Hz)를 주면 변환 후 align_topics.py로
+/odom, /imu/data_raw, /cmd_vel, /amcl_pose를 하나의 시계에 맞춘 aligned 테이블도 만듭니다
+(토픽별 출력에서만 사용 가능, --combined 불가).
+
 ROS 2 환경(예: `source /opt/ros/humble/setup.bash` 및 workspace setup.bash)을 먼저 설정해야 합니다.
 """
 
 import argparse
 import csv
 import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import Any, Dict, Iterable, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
+import numpy as np
 import rosbag2_py
 from rclpy.serialization import deserialize_message
 from rosidl_runtime_py.utilities import get_message
 from rosidl_runtime_py.convert import message_to_ordereddict
+from rosidl_parser.definition import AbstractNestedType, Array, NamespacedType
+
+# table_io.py를 같은 디렉토리에서 import하기 위한 경로 설정
+script_dir = os.path.dirname(os.path.abspath(__file__))
+if script_dir not in sys.path:
+    sys.path.insert(0, script_dir)
+
+from fast_decoders import FieldExtractor, PoseSequenceExtractor, TypedTable, get_extractor
+from sqlite_bag_reader import bag_compression, discover_bags, resolve_time_window
+from align_topics import DEFAULT_CLOCK as ALIGN_DEFAULT_CLOCK, write_aligned
+from export_profile import ExportStats
+from export_cache import (
+    AppendNotPossible, bag_signature, export_key, plan_export, save_manifest,
+)
+from table_io import (
+    FORMATS, columns_to_arrays, pose_table_name, read_topic_table, topic_table_path,
+    write_topic_table,
+)
 
 
+# 출력 형식이 바뀌면 올려서 기존 캐시를 무효화
+CONVERTER_VERSION = "2"
+
 DEFAULT_TOPICS = {
     "/odom",
     "/cmd_vel",
     "/imu/data_raw",
     "/local_plan",
     "/global_plan",
+    "/plan",
     "/amcl_pose",
 }
 
@@ -59,6 +111,22 @@ def flatten_dict(
     return items
 
 
+def flatten_message(msg: Any, msg_type_str: str) -> Dict[str, Any]:
+    """메시지 → flat dict. 등록된 타입은 고정 컬럼 추출기, 그 외는 flatten_dict 사용."""
+    extractor = get_extractor(msg_type_str)
+    if extractor is not None:
+        return extractor.flat(msg)
+    return flatten_dict(message_to_ordereddict(msg))
+
+
+def topic_message_counts(reader: rosbag2_py.SequentialReader) -> Dict[str, int]:
+    """bag metadata의 토픽별 메시지 수 (버퍼 미리 할당용)."""
+    return {
+        info.topic_metadata.name: info.message_count
+        for info in reader.get_metadata().topics_with_message_count
+    }
+
+
 def ensure_output_dir(path: Path) -> None:
     path.mkdir(parents=True, exist_ok=True)
 
@@ -91,16 +159,25 @@ def open_bag_reader(bag_path: Path) -> Tuple[rosbag2_py.SequentialReader, Dict[i
     return reader, {}  # id 매핑은 사용하지 않음
 
 
-def convert_bag_to_csv(
+def open_selected_reader(
     bag_path: Path,
-    output_dir: Path,
-    topics: Iterable[str] = (),
-) -> None:
+    topics: Iterable[str],
+    start_ns: Optional[int] = None,
+    after_ns: Optional[Dict[str, Optional[int]]] = None,
+) -> Tuple[rosbag2_py.SequentialReader, Dict[str, str]]:
+    """SequentialReader를 열고 선택된 토픽의 이름 → 타입 매핑을 반환.
+
+    선택된 토픽은 StorageFilter로 storage 계층에 넘겨서 다른 토픽(/tf 등)의
+    메시지는 아예 읽지 않는다. start_ns를 지정하면 해당 시각(ns, 포함)
+    이후부터 읽도록 seek 한다. after_ns(토픽별로 이미 변환한 마지막 timestamp)를
+    주면 모든 선택 토픽이 이미 변환된 구간은 건너뛰도록 그중 가장 이른 시각 다음부터 읽는다.
+    """
     topics = set(topics) if topics else set(DEFAULT_TOPICS)
 
     if bag_path.is_dir():
         uri = str(bag_path)
     else:
+        # *.db3 파일이 주어졌다면 상위 디렉토리를 URI로 사용
         uri = str(bag_path.parent)
 
     storage_options = rosbag2_py.StorageOptions(uri=uri, storage_id="sqlite3")
@@ -109,7 +186,11 @@ def convert_bag_to_csv(
         output_serialization_format="cdr",
     )
 
-    reader = rosbag2_py.SequentialReader()
+    # --bag-compression으로 기록한 bag은 압축 해제 리더로 읽음
+    if bag_compression(bag_path):
+        reader = rosbag2_py.SequentialCompressionReader()
+    else:
+        reader = rosbag2_py.SequentialReader()
     reader.open(storage_options, converter_options)
 
     topic_types: Dict[str, str] = {
@@ -126,8 +207,156 @@ def convert_bag_to_csv(
             f"지정한 토픽들이 bag에 없습니다. 사용 가능한 토픽: {list(topic_types.keys())}"
         )
 
+    reader.set_filter(rosbag2_py.StorageFilter(topics=sorted(selected_topic_types)))
+    if after_ns:
+        exported = [after_ns.get(name) for name in selected_topic_types]
+        if None not in exported:
+            first_ns = min(exported) + 1
+            start_ns = first_ns if start_ns is None else max(start_ns, first_ns)
+    if start_ns is not None:
+        reader.seek(start_ns)
+
+    return reader, selected_topic_types
+
+
+def already_exported(after_ns: Optional[Dict[str, Optional[int]]], topic_name: str, t: int) -> bool:
+    """이어쓰기: 이 토픽에서 이미 변환한 마지막 timestamp 이하의 메시지인지."""
+    if not after_ns:
+        return False
+    last = after_ns.get(topic_name)
+    return last is not None and t <= last
+
+
+def _read_csv_header(path: Path) -> List[str]:
+    with path.open("r", newline="") as f:
+        return next(csv.reader(f), [])
+
+
+def pose_sequence_topics(selected_topic_types: Dict[str, str]) -> Dict[str, PoseSequenceExtractor]:
+    """포즈 배열 타입(nav_msgs/Path 등) 토픽 → 추출기."""
+    result: Dict[str, PoseSequenceExtractor] = {}
+    for topic_name, msg_type_str in selected_topic_types.items():
+        extractor = get_extractor(msg_type_str)
+        if isinstance(extractor, PoseSequenceExtractor):
+            result[topic_name] = extractor
+    return result
+
+
+def pose_long_columns(
+    extractor: PoseSequenceExtractor,
+    timestamp: int,
+    msg_index: int,
+    msg: Any,
+) -> Dict[str, np.ndarray]:
+    """메시지 하나의 포즈들 → long 테이블 컬럼 (timestamp, msg_index, pose_index, x, y, z, yaw, ...)."""
+    raw = extractor.pose_array(msg)
+    n = len(raw)
+    columns: Dict[str, np.ndarray] = {
+        "timestamp": np.full(n, timestamp, dtype=np.int64),
+        "msg_index": np.full(n, msg_index, dtype=np.int64),
+        "pose_index": np.arange(n, dtype=np.int64),
+    }
+    columns.update(extractor.pose_columns_from_array(raw))
+    return columns
+
+
+def next_msg_indices(
+    output_dir: Path,
+    topic_names: Iterable[str],
+    fmt: str,
+    combined_path: Optional[Path] = None,
+) -> Dict[str, int]:
+    """이어쓰기 시작 msg_index: 기존 헤더 행의 msg_index 최댓값 + 1."""
+    topic_names = list(topic_names)
+    result = {topic_name: 0 for topic_name in topic_names}
+    if not topic_names:
+        return result
+
+    if combined_path is not None:
+        if not combined_path.exists():
+            return result
+        with combined_path.open("r", newline="") as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            if "msg_index" not in header:
+                raise AppendNotPossible("기존 combined CSV에 msg_index 컬럼이 없음")
+            topic_col, index_col = header.index("topic"), header.index("msg_index")
+            for row in reader:
+                if row[topic_col] in result and row[index_col] != "":
+                    result[row[topic_col]] = max(result[row[topic_col]], int(row[index_col]) + 1)
+        return result
+
+    for topic_name in topic_names:
+        if not topic_table_path(output_dir, topic_name, fmt).exists():
+            continue
+        try:
+            indices = read_topic_table(output_dir, topic_name, columns=["msg_index"], fmt=fmt)["msg_index"]
+        except (KeyError, ValueError) as e:
+            raise AppendNotPossible(f"{topic_name}: 기존 테이블에 msg_index 컬럼이 없음") from e
+        if len(indices):
+            result[topic_name] = int(np.nanmax(indices)) + 1
+    return result
+
+
+class PoseCsvWriters:
+    """포즈 long 테이블('<topic>_poses.csv')을 토픽별로 스트리밍 기록."""
+
+    def __init__(self, output_dir: Path, append: bool = False):
+        self.output_dir = output_dir
+        self.append = append
+        self._files: Dict[str, Tuple[Any, Any]] = {}
+
+    def write(self, topic_name: str, columns: Dict[str, np.ndarray]) -> None:
+        if topic_name not in self._files:
+            path = topic_table_path(self.output_dir, pose_table_name(topic_name), "csv")
+            if self.append and path.exists():
+                f = path.open("a", newline="")
+                writer = csv.writer(f)
+            else:
+                f = path.open("w", newline="")
+                writer = csv.writer(f)
+                writer.writerow(list(columns.keys()))
+            self._files[topic_name] = (writer, f)
+            print(f"[INFO] Writing poses of '{topic_name}' to {path}")
+        writer = self._files[topic_name][0]
+        writer.writerows(zip(*(c.tolist() for c in columns.values())))
+
+    def close(self) -> None:
+        for _, f in self._files.values():
+            f.close()
+        self._files = {}
+
+
+def convert_bag_to_csv(
+    bag_path: Path,
+    output_dir: Path,
+    topics: Iterable[str] = (),
+    start_ns: Optional[int] = None,
+    end_ns: Optional[int] = None,
+    append: bool = False,
+    stats: Optional[ExportStats] = None,
+    after_ns: Optional[Dict[str, Optional[int]]] = None,
+) -> Dict[str, Optional[int]]:
+    """토픽별 CSV로 저장하고 토픽별로 마지막으로 쓴 메시지의 timestamp를 반환.
+
+    [start_ns, end_ns) 구간의 메시지만 읽고, append=True면 기존 CSV 뒤에 이어 쓴다
+    (after_ns에 있는 토픽은 그 timestamp 이후의 메시지만).
+    포즈 배열 토픽(nav_msgs/Path 등)은 헤더 행만 '<topic>.csv'에, 포즈는
+    '<topic>_poses.csv' long 테이블에 저장한다. stats를 넘기면 단계별 시간을 기록한다.
+    """
+    reader, selected_topic_types = open_selected_reader(bag_path, topics, start_ns, after_ns)
+    stats = stats if stats is not None else ExportStats(progress=False)
+    stats.begin(selected_topic_types, topic_message_counts(reader))
+
     ensure_output_dir(output_dir)
 
+    pose_topics = pose_sequence_topics(selected_topic_types)
+    msg_indices = (
+        next_msg_indices(output_dir, pose_topics, "csv") if append
+        else {topic_name: 0 for topic_name in pose_topics}
+    )
+    pose_writers = PoseCsvWriters(output_dir, append=append)
+
     # topic → (csv_writer, file_handle, header_written)
     writers: Dict[str, Tuple[csv.DictWriter, Any, bool]] = {}
 
@@ -138,24 +367,36 @@ def convert_bag_to_csv(
         # 파일 이름에서 '/' 제거
         safe_name = topic_name.strip("/").replace("/", "_")
         csv_path = output_dir / f"{safe_name}.csv"
-        f = csv_path.open("w", newline="")
-        # timestamp(ns) 컬럼을 제일 앞으로
-        field_list = ["timestamp"] + [fn for fn in fieldnames if fn != "timestamp"]
-        writer = csv.DictWriter(f, fieldnames=field_list)
-        writer.writeheader()
+        if append and csv_path.exists():
+            # 기존 헤더 그대로 이어쓰기 (새 컬럼이 나오면 DictWriter가 ValueError)
+            f = csv_path.open("a", newline="")
+            writer = csv.DictWriter(f, fieldnames=_read_csv_header(csv_path))
+        else:
+            f = csv_path.open("w", newline="")
+            # timestamp(ns) 컬럼을 제일 앞으로
+            field_list = ["timestamp"] + [fn for fn in fieldnames if fn != "timestamp"]
+            writer = csv.DictWriter(f, fieldnames=field_list)
+            writer.writeheader()
         writers[topic_name] = (writer, f, True)
         print(f"[INFO] Writing topic '{topic_name}' to {csv_path}")
         return writer
 
+    last_timestamps: Dict[str, Optional[int]] = {name: None for name in selected_topic_types}
     try:
         # 메시지 타입 캐시
         type_cache: Dict[str, Any] = {}
+        clock = time.perf_counter
+        mark = clock()
 
         while reader.has_next():
             topic_name, data, t = reader.read_next()
+            if end_ns is not None and t >= end_ns:
+                break
 
             if topic_name not in selected_topic_types:
                 continue
+            if already_exported(after_ns, topic_name, t):
+                continue
 
             msg_type_str = selected_topic_types[topic_name]
 
@@ -164,21 +405,88 @@ def convert_bag_to_csv(
                 type_cache[msg_type_str] = get_message(msg_type_str)
 
             msg_type = type_cache[msg_type_str]
+            t_read = clock()
             msg = deserialize_message(data, msg_type)
+            t_deserialize = clock()
 
-            msg_dict = message_to_ordereddict(msg)
-            flat = flatten_dict(msg_dict)
+            flat = flatten_message(msg, msg_type_str)
 
             # timestamp(ns) 추가 (ROS 시간 기준)
             flat["timestamp"] = t
 
+            extractor = pose_topics.get(topic_name)
+            pose_columns = None
+            if extractor is not None:
+                msg_index = msg_indices[topic_name]
+                msg_indices[topic_name] += 1
+                flat["msg_index"] = msg_index
+                pose_columns = pose_long_columns(extractor, t, msg_index, msg)
+            t_flatten = clock()
+
+            if pose_columns is not None:
+                pose_writers.write(topic_name, pose_columns)
             writer = get_writer(topic_name, flat.keys())
-            writer.writerow(flat)
+            try:
+                writer.writerow(flat)
+            except ValueError as e:
+                if append:
+                    raise AppendNotPossible(f"{topic_name}: 새 컬럼 등장") from e
+                raise
+            last_timestamps[topic_name] = t
+
+            now = clock()
+            stats.record(
+                topic_name, t_read - mark, t_deserialize - t_read,
+                t_flatten - t_deserialize, now - t_flatten,
+            )
+            mark = now
 
     finally:
         # 파일 핸들 닫기
         for _, (_, f, _) in writers.items():
             f.close()
+        pose_writers.close()
+
+    return last_timestamps
+
+
+def message_fieldnames(msg_type: Any, parent_key: str = "") -> Optional[List[str]]:
+    """메시지 타입 정의에서 flatten_dict와 동일한 컬럼 이름 목록을 도출.
+
+    고정 길이 필드만으로 구성된 타입이면 컬럼 목록을, 가변 길이 시퀀스
+    (예: nav_msgs/Path의 poses)가 포함되어 정적으로 알 수 없으면 None을 반환.
+    """
+    names: List[str] = []
+    fields = msg_type.get_fields_and_field_types().keys()
+    for field, slot in zip(fields, msg_type.SLOT_TYPES):
+        key = f"{parent_key}.{field}" if parent_key else field
+        if isinstance(slot, Array):
+            # 고정 길이 배열 (예: covariance[36])
+            for i in range(slot.size):
+                idx_key = f"{key}[{i}]"
+                if isinstance(slot.value_type, NamespacedType):
+                    sub = message_fieldnames(_nested_type(slot.value_type), idx_key)
+                    if sub is None:
+                        return None
+                    names.extend(sub)
+                else:
+                    names.append(idx_key)
+        elif isinstance(slot, AbstractNestedType):
+            # 가변 길이 시퀀스: 메시지마다 컬럼 수가 달라짐
+            return None
+        elif isinstance(slot, NamespacedType):
+            sub = message_fieldnames(_nested_type(slot), key)
+            if sub is None:
+                return None
+            names.extend(sub)
+        else:
+            names.append(key)
+    return names
+
+
+def _nested_type(slot: NamespacedType) -> Any:
+    """NamespacedType(예: geometry_msgs/msg/Pose) → 메시지 클래스."""
+    return get_message("/".join(slot.namespaces + [slot.name]))
 
 
 def convert_bag_to_csv_combined(
@@ -186,115 +494,562 @@ def convert_bag_to_csv_combined(
     output_dir: Path,
     topics: Iterable[str] = (),
     filename: str = "combined.csv",
-) -> None:
-    """여러 토픽을 하나의 CSV 파일로 결합해서 저장."""
-    topics = set(topics) if topics else set(DEFAULT_TOPICS)
+    start_ns: Optional[int] = None,
+    end_ns: Optional[int] = None,
+    append: bool = False,
+    stats: Optional[ExportStats] = None,
+    after_ns: Optional[Dict[str, Optional[int]]] = None,
+) -> Dict[str, Optional[int]]:
+    """여러 토픽을 하나의 CSV 파일로 결합해서 저장.
+
+    bag은 한 번만 읽고 메시지도 한 번만 역직렬화한다. 토픽별 컬럼은 메시지
+    타입 정의에서 미리 도출하고, 가변 길이 필드가 있는 타입은 메시지에서 새
+    컬럼이 나타날 때마다 뒤에 추가한다. 행은 임시 파일로 바로 스트리밍하고,
+    마지막에 최종 헤더를 붙이면서 짧은 행의 빈 칸만 채운다.
+
+    [start_ns, end_ns) 구간의 메시지만 읽는다. append=True면 기존 파일의
+    헤더를 그대로 쓰고 새 행만 덧붙인다 (after_ns는 convert_bag_to_csv와 같음).
+    토픽별로 마지막으로 쓴 메시지의 timestamp를 반환.
+    """
+    reader, selected_topic_types = open_selected_reader(bag_path, topics, start_ns, after_ns)
+    stats = stats if stats is not None else ExportStats(progress=False)
+    stats.begin(selected_topic_types, topic_message_counts(reader))
 
-    if bag_path.is_dir():
-        uri = str(bag_path)
-    else:
-        uri = str(bag_path.parent)
+    ensure_output_dir(output_dir)
 
-    storage_options = rosbag2_py.StorageOptions(uri=uri, storage_id="sqlite3")
-    converter_options = rosbag2_py.ConverterOptions(
-        input_serialization_format="cdr",
-        output_serialization_format="cdr",
-    )
+    csv_path = output_dir / filename
+    type_cache: Dict[str, Any] = {}
+    for msg_type_str in selected_topic_types.values():
+        if msg_type_str not in type_cache:
+            type_cache[msg_type_str] = get_message(msg_type_str)
 
-    # 1st pass: 필드 이름 수집
-    reader = rosbag2_py.SequentialReader()
-    reader.open(storage_options, converter_options)
+    pose_topics = pose_sequence_topics(selected_topic_types)
 
-    topic_types: Dict[str, str] = {
-        t.name: t.type for t in reader.get_all_topics_and_types()
-    }
+    append = append and csv_path.exists()
+    if append:
+        fieldnames = _read_csv_header(csv_path)
+        msg_indices = next_msg_indices(output_dir, pose_topics, "csv", combined_path=csv_path)
+    else:
+        # 타입 정의에서 알 수 있는 컬럼은 미리 등록 (토픽 이름 순으로 고정)
+        fieldnames = ["timestamp", "topic"]
+        for topic_name in sorted(selected_topic_types):
+            if topic_name in pose_topics:
+                static_fields = ["msg_index"] + pose_topics[topic_name].header_columns
+            else:
+                static_fields = message_fieldnames(type_cache[selected_topic_types[topic_name]])
+            for k in static_fields or ():
+                if k not in fieldnames:
+                    fieldnames.append(k)
+        msg_indices = {topic_name: 0 for topic_name in pose_topics}
+    field_index: Dict[str, int] = {fn: i for i, fn in enumerate(fieldnames)}
+    pose_writers = PoseCsvWriters(output_dir, append=append)
+
+    body_path = csv_path if append else output_dir / f".{filename}.body"
+    last_timestamps: Dict[str, Optional[int]] = {name: None for name in selected_topic_types}
+
+    clock = time.perf_counter
+    # 스트리밍/복사 중 예외가 나도 숨김 본문 파일(.<filename>.body)은 남기지 않음
+    try:
+        # 단일 패스: 읽기 → 역직렬화 → 행 스트리밍
+        with body_path.open("a" if append else "w", newline="") as body:
+            body_writer = csv.writer(body)
+            mark = clock()
+
+            while reader.has_next():
+                topic_name, data, t = reader.read_next()
+                if end_ns is not None and t >= end_ns:
+                    break
+                if topic_name not in selected_topic_types:
+                    continue
+                if already_exported(after_ns, topic_name, t):
+                    continue
+
+                msg_type_str = selected_topic_types[topic_name]
+                t_read = clock()
+                msg = deserialize_message(data, type_cache[msg_type_str])
+                t_deserialize = clock()
+                flat = flatten_message(msg, msg_type_str)
+
+                extractor = pose_topics.get(topic_name)
+                pose_columns = None
+                if extractor is not None:
+                    # 포즈는 '<topic>_poses.csv' long 테이블로 분리
+                    msg_index = msg_indices[topic_name]
+                    msg_indices[topic_name] += 1
+                    flat["msg_index"] = msg_index
+                    pose_columns = pose_long_columns(extractor, t, msg_index, msg)
+
+                # 가변 길이 타입 등 처음 보는 컬럼은 뒤에 추가
+                for k in flat.keys():
+                    if k not in field_index:
+                        if append:
+                            raise AppendNotPossible(f"{topic_name}: 새 컬럼 '{k}' 등장")
+                        field_index[k] = len(fieldnames)
+                        fieldnames.append(k)
+
+                row: List[Any] = [""] * len(fieldnames)
+                row[0] = t
+                row[1] = topic_name
+                for k, v in flat.items():
+                    row[field_index[k]] = v
+                t_flatten = clock()
+
+                if pose_columns is not None:
+                    pose_writers.write(topic_name, pose_columns)
+                body_writer.writerow(row)
+                last_timestamps[topic_name] = t
+
+                now = clock()
+                stats.record(
+                    topic_name, t_read - mark, t_deserialize - t_read,
+                    t_flatten - t_deserialize, now - t_flatten,
+                )
+                mark = now
+
+        if append:
+            print(f"[INFO] Combined CSV appended to {csv_path}")
+            return last_timestamps
+
+        # 최종 헤더 + 본문 복사 (역직렬화 없이 텍스트만 처리)
+        t_copy = clock()
+        n_fields = len(fieldnames)
+        with csv_path.open("w", newline="") as f, body_path.open("r", newline="") as body:
+            writer = csv.writer(f)
+            writer.writerow(fieldnames)
+            for row in csv.reader(body):
+                if len(row) < n_fields:
+                    row.extend([""] * (n_fields - len(row)))
+                writer.writerow(row)
+        stats.record_write(filename, clock() - t_copy)
+    finally:
+        pose_writers.close()
+        if not append:
+            body_path.unlink(missing_ok=True)
 
-    selected_topic_types = {
-        name: msg_type for name, msg_type in topic_types.items() if name in topics
-    }
+    print(f"[INFO] Combined CSV written to {csv_path}")
+    return last_timestamps
 
-    if not selected_topic_types:
-        raise RuntimeError(
-            f"지정한 토픽들이 bag에 없습니다. 사용 가능한 토픽: {list(topic_types.keys())}"
-        )
+
+def _merge_with_existing(
+    output_dir: Path,
+    topic_name: str,
+    fmt: str,
+    columns: Dict[str, np.ndarray],
+) -> Dict[str, np.ndarray]:
+    """이어쓰기: 기존 테이블 뒤에 새 행을 붙임 (컬럼 구성이 같을 때만)."""
+    if not topic_table_path(output_dir, topic_name, fmt).exists():
+        return columns
+    existing = read_topic_table(output_dir, topic_name, fmt=fmt)
+    if set(existing) != set(columns):
+        raise AppendNotPossible(f"{topic_name}: 컬럼 구성이 바뀜")
+    merged: Dict[str, np.ndarray] = {}
+    for name in columns:
+        old, new = existing[name], np.asarray(columns[name])
+        if old.dtype.kind in "OU" or new.dtype.kind in "OU":
+            old, new = old.astype(str), new.astype(str)
+        merged[name] = np.concatenate([old, new])
+    return merged
+
+
+def convert_bag_to_columnar(
+    bag_path: Path,
+    output_dir: Path,
+    topics: Iterable[str] = (),
+    fmt: str = "parquet",
+    start_ns: Optional[int] = None,
+    end_ns: Optional[int] = None,
+    append: bool = False,
+    stats: Optional[ExportStats] = None,
+    after_ns: Optional[Dict[str, Optional[int]]] = None,
+) -> Dict[str, Optional[int]]:
+    """토픽별 컬럼형 테이블(parquet / feather / npz)로 저장.
+
+    combined CSV처럼 빈 칸이 대부분인 행 대신 토픽마다 타입이 있는 컬럼을
+    만들고, timestamp는 int64(ns)로 저장한다. [start_ns, end_ns) 구간의
+    메시지만 디코딩하고, append=True면 기존 테이블 뒤에 붙인다. 포즈 배열 토픽의 포즈는
+    '<topic>_poses' long 테이블로 따로 저장한다. 토픽별 마지막 timestamp를 반환
+    (after_ns는 convert_bag_to_csv와 같음).
+    """
+    reader, selected_topic_types = open_selected_reader(bag_path, topics, start_ns, after_ns)
+    expected_counts = topic_message_counts(reader)
+    stats = stats if stats is not None else ExportStats(progress=False)
+    stats.begin(selected_topic_types, expected_counts)
 
     ensure_output_dir(output_dir)
 
     type_cache: Dict[str, Any] = {}
-    all_fields: Dict[str, None] = {}
+    # 고정 컬럼 타입: metadata의 메시지 수만큼 미리 할당한 구조화 배열
+    # (구간을 지정했으면 일부만 읽으므로 작게 시작해서 필요할 때 확장)
+    windowed = start_ns is not None or end_ns is not None
+    message_counts = {} if windowed else expected_counts
+    typed_tables: Dict[str, TypedTable] = {}
+    for topic_name, msg_type_str in selected_topic_types.items():
+        extractor = get_extractor(msg_type_str)
+        if isinstance(extractor, FieldExtractor):
+            typed_tables[topic_name] = TypedTable(
+                extractor, message_counts.get(topic_name, 0)
+            )
+
+    # 포즈 배열 타입: 메시지별 long 테이블 조각
+    pose_topics = pose_sequence_topics(selected_topic_types)
+    msg_indices = (
+        next_msg_indices(output_dir, pose_topics, fmt) if append
+        else {topic_name: 0 for topic_name in pose_topics}
+    )
+    pose_parts: Dict[str, List[Dict[str, np.ndarray]]] = {}
 
+    # 그 외 타입: topic → (컬럼 이름 → 값 리스트, 행 수)
+    tables: Dict[str, Dict[str, List[Any]]] = {}
+    row_counts: Dict[str, int] = {}
+    last_timestamps: Dict[str, Optional[int]] = {name: None for name in selected_topic_types}
+
+    # 메모리 버퍼에만 쌓으므로 메시지별 시간은 read/deserialize/flatten,
+    # write는 마지막 파일 저장 시간
+    clock = time.perf_counter
+    mark = clock()
     while reader.has_next():
         topic_name, data, t = reader.read_next()
+        if end_ns is not None and t >= end_ns:
+            break
         if topic_name not in selected_topic_types:
             continue
+        if already_exported(after_ns, topic_name, t):
+            continue
 
         msg_type_str = selected_topic_types[topic_name]
         if msg_type_str not in type_cache:
             type_cache[msg_type_str] = get_message(msg_type_str)
-        msg_type = type_cache[msg_type_str]
-
-        msg = deserialize_message(data, msg_type)
-        msg_dict = message_to_ordereddict(msg)
-        flat = flatten_dict(msg_dict)
 
-        for k in flat.keys():
-            all_fields.setdefault(k, None)
+        t_read = clock()
+        msg = deserialize_message(data, type_cache[msg_type_str])
+        t_deserialize = clock()
+        last_timestamps[topic_name] = t
 
-    # 필드 리스트 구성
-    fieldnames = ["timestamp", "topic"] + sorted(all_fields.keys())
+        typed = typed_tables.get(topic_name)
+        if typed is not None:
+            typed.append(t, msg)
+        else:
+            flat = flatten_message(msg, msg_type_str)
+            flat["timestamp"] = t
 
-    # 2nd pass: 실제 CSV 쓰기
-    reader = rosbag2_py.SequentialReader()
-    reader.open(storage_options, converter_options)
+            extractor = pose_topics.get(topic_name)
+            if extractor is not None:
+                msg_index = msg_indices[topic_name]
+                msg_indices[topic_name] += 1
+                flat["msg_index"] = msg_index
+                pose_parts.setdefault(topic_name, []).append(
+                    pose_long_columns(extractor, t, msg_index, msg)
+                )
+
+            columns = tables.setdefault(topic_name, {"timestamp": []})
+            n = row_counts.get(topic_name, 0)
+            for k, v in flat.items():
+                if k not in columns:
+                    # 처음 보는 컬럼은 이전 행들을 빈 값으로 채움
+                    columns[k] = [None] * n
+                columns[k].append(v)
+            n += 1
+            for values in columns.values():
+                if len(values) < n:
+                    values.append(None)
+            row_counts[topic_name] = n
+
+        now = clock()
+        stats.record(topic_name, t_read - mark, t_deserialize - t_read, now - t_deserialize, 0.0)
+        mark = now
+
+    t_write = clock()
+    outputs: Dict[str, Dict[str, np.ndarray]] = {}
+    for topic_name, typed in typed_tables.items():
+        if typed.size > 0:
+            outputs[topic_name] = typed.to_columns()
+    for topic_name, columns in tables.items():
+        outputs[topic_name] = columns_to_arrays(columns)
+    for topic_name, parts in pose_parts.items():
+        outputs[pose_table_name(topic_name)] = {
+            name: np.concatenate([part[name] for part in parts]) for name in parts[0]
+        }
+
+    if append:
+        # 모든 토픽의 병합 가능 여부를 먼저 확인한 뒤에 기록
+        outputs = {
+            topic_name: _merge_with_existing(output_dir, topic_name, fmt, arrays)
+            for topic_name, arrays in outputs.items()
+        }
+
+    # 배열 변환/병합 시간은 토픽 구분 없이 한 번에 기록
+    stats.record_write("(columns)", clock() - t_write)
+    for topic_name, arrays in outputs.items():
+        t_write = clock()
+        path = write_topic_table(arrays, output_dir, topic_name, fmt)
+        stats.record_write(topic_name, clock() - t_write)
+        print(f"[INFO] Writing topic '{topic_name}' to {path}")
+
+    return last_timestamps
+
+
+def convert_bag(
+    bag_path: Path,
+    output_dir: Path,
+    topics: Iterable[str],
+    fmt: str = "csv",
+    combined: bool = False,
+    filename: str = "combined.csv",
+    use_cache: bool = True,
+    start_ns: Optional[int] = None,
+    end_ns: Optional[int] = None,
+    progress: bool = True,
+    profile: bool = False,
+    align_clock: Optional[str] = None,
+    align_rate: Optional[float] = None,
+) -> None:
+    """옵션에 맞는 변환 함수 하나를 호출 (단일/배치 모드 공통).
+
+    출력 디렉토리의 캐시 manifest를 보고 bag이 바뀌지 않았으면 건너뛰고,
+    bag에 메시지가 추가되기만 했으면 새로 추가된 부분만 변환한다.
+    start_ns/end_ns(절대 ns)를 지정하면 [start_ns, end_ns) 구간만 변환한다.
+    progress=True면 진행률을 주기적으로 출력하고, profile=True면 단계별 시간
+    요약을 출력 디렉토리의 export_profile.json으로 저장한다.
+    align_clock/align_rate를 지정하면 변환 결과로 aligned 테이블을 만든다
+    (캐시로 변환을 건너뛴 경우에도 정렬 옵션이 바뀔 수 있으므로 매번 다시 만든다).
+    """
+    if fmt != "csv" and combined:
+        raise ValueError("--combined는 --format csv에서만 사용할 수 있습니다.")
+    align = align_clock is not None or align_rate is not None
+    if align and combined:
+        raise ValueError("--align-clock/--align-rate는 --combined와 함께 사용할 수 없습니다.")
+
+    bag_dir = bag_path if bag_path.is_dir() else bag_path.parent
+    key = export_key(
+        topics if topics else DEFAULT_TOPICS, fmt, CONVERTER_VERSION,
+        combined=combined, filename=filename if combined else None,
+        start_ns=start_ns, end_ns=end_ns,
+    )
+    if use_cache:
+        action, last_exported, signature = plan_export(bag_dir, output_dir, key)
+    else:
+        action, last_exported, signature = "full", None, bag_signature(bag_dir)
+
+    stats = ExportStats(progress=progress)
+
+    def run(
+        first_ns: Optional[int], append: bool, after_ns: Optional[Dict[str, Optional[int]]] = None,
+    ) -> Dict[str, Optional[int]]:
+        nonlocal stats
+        # 이어쓰기 실패 후 전체 재변환하면 계측도 처음부터
+        stats = ExportStats(progress=progress)
+        if fmt != "csv":
+            return convert_bag_to_columnar(
+                bag_path, output_dir, topics, fmt=fmt,
+                start_ns=first_ns, end_ns=end_ns, append=append, stats=stats, after_ns=after_ns,
+            )
+        if combined:
+            return convert_bag_to_csv_combined(
+                bag_path, output_dir, topics, filename=filename,
+                start_ns=first_ns, end_ns=end_ns, append=append, stats=stats, after_ns=after_ns,
+            )
+        return convert_bag_to_csv(
+            bag_path, output_dir, topics, start_ns=first_ns, end_ns=end_ns,
+            append=append, stats=stats, after_ns=after_ns,
+        )
 
-    csv_path = output_dir / filename
-    with csv_path.open("w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
+    def write_alignment() -> None:
+        if align:
+            path = write_aligned(
+                output_dir, fmt, clock_topic=align_clock or ALIGN_DEFAULT_CLOCK, rate=align_rate,
+            )
+            print(f"[INFO] Aligned table written to {path}")
+
+    if action == "skip":
+        print(f"[INFO] 변경 없음, 캐시된 결과 사용: {output_dir}")
+        write_alignment()
+        return
+
+    last_timestamps: Dict[str, Optional[int]] = {}
+    if action == "append":
+        # 토픽마다 이미 변환한 마지막 timestamp 이후만 (sim time에서는 여러 토픽의
+        # timestamp가 같을 수 있으므로 전역 커서 하나로는 다른 토픽 메시지를 놓침)
+        print("[INFO] bag에 추가된 메시지만 변환 (토픽별 마지막 timestamp 이후)")
+        try:
+            last_timestamps = dict(last_exported)
+            for topic_name, t in run(start_ns, append=True, after_ns=last_exported).items():
+                if t is not None:
+                    last_timestamps[topic_name] = t
+        except AppendNotPossible as e:
+            print(f"[INFO] 이어쓰기 불가 ({e}), 전체 재변환")
+            action = "full"
+
+    if action == "full":
+        last_timestamps = run(start_ns, append=False)
+
+    save_manifest(
+        output_dir, key, signature, last_timestamps,
+        exported_files(output_dir, fmt, combined, filename, last_timestamps),
+    )
 
-        type_cache = {}
+    stats.finish()
+    if progress:
+        stats.print_summary()
+    if profile:
+        print(f"[INFO] Profile written to {stats.write_json(output_dir)}")
+    write_alignment()
 
-        while reader.has_next():
-            topic_name, data, t = reader.read_next()
-            if topic_name not in selected_topic_types:
-                continue
 
-            msg_type_str = selected_topic_types[topic_name]
-            if msg_type_str not in type_cache:
-                type_cache[msg_type_str] = get_message(msg_type_str)
-            msg_type = type_cache[msg_type_str]
+def exported_files(
+    output_dir: Path,
+    fmt: str,
+    combined: bool,
+    filename: str,
+    last_timestamps: Dict[str, Optional[int]],
+) -> List[str]:
+    """manifest에 남길 변환 결과 파일 이름 (메시지를 쓴 토픽의 테이블 중 실제로 있는 것)."""
+    topics = [topic_name for topic_name, t in last_timestamps.items() if t is not None]
+    names = {filename} if combined else {topic_table_path(output_dir, t, fmt).name for t in topics}
+    names.update(topic_table_path(output_dir, pose_table_name(t), fmt).name for t in topics)
+    return sorted(name for name in names if (output_dir / name).exists())
+
+
+def _convert_bag_job(
+    job: Tuple[
+        Path, Path, List[str], str, bool, str, bool,
+        Optional[str], Optional[str], bool, Optional[str], Optional[float],
+    ],
+) -> Tuple[Path, Optional[str], float]:
+    """프로세스 풀 작업 단위: (bag, 에러 메시지 또는 None, 소요 시간) 반환.
+
+    상대 시각(--start/--end)은 bag마다 시작 시각이 다르므로 여기서 변환한다.
+    여러 프로세스의 진행률 출력이 섞이지 않도록 bag 단위 완료 메시지만 출력한다.
+    """
+    bag_path = job[0]
+    start = time.monotonic()
+    try:
+        start_ns, end_ns = resolve_time_window(bag_path, job[7], job[8])
+        convert_bag(
+            *job[:7], start_ns=start_ns, end_ns=end_ns, progress=False, profile=job[9],
+            align_clock=job[10], align_rate=job[11],
+        )
+    except Exception as e:  # 한 bag의 실패가 배치 전체를 멈추지 않도록
+        return bag_path, f"{type(e).__name__}: {e}", time.monotonic() - start
+    return bag_path, None, time.monotonic() - start
+
+
+def bag_root_base(bag_root: str) -> Optional[Path]:
+    """--bag-root의 기준 디렉토리: 디렉토리면 그대로, glob이면 와일드카드 앞까지.
+
+    예: 'rosbags/*/stage123_*' → rosbags (출력은 <output-dir>/<planner>/<bag>/).
+    """
+    parts: List[str] = []
+    for part in Path(os.path.expanduser(bag_root)).parts:
+        if any(c in part for c in "*?["):
+            break
+        parts.append(part)
+    base = Path(*parts) if parts else Path(".")
+    return base.resolve() if base.is_dir() else None
+
+
+def batch_output_dir(bag_dir: Path, root: Optional[Path], output_root: Optional[Path], fmt: str) -> Path:
+    """배치 모드 출력 위치: 기본은 <bag>/<format>/, --output-dir 지정 시 그 아래 bag 상대 경로."""
+    if output_root is None:
+        return bag_dir / fmt
+    if root is not None and root in bag_dir.parents:
+        return output_root / bag_dir.relative_to(root)
+    # 기준 디렉토리 밖(심볼릭 링크 등): teb/mppi 아래 같은 이름의 bag이 겹치지 않도록 상위 이름 포함
+    return output_root / bag_dir.parent.name / bag_dir.name
+
+
+def convert_bags_parallel(
+    bag_root: str,
+    output_root: Optional[Path],
+    topics: Iterable[str],
+    fmt: str = "csv",
+    combined: bool = False,
+    filename: str = "combined.csv",
+    jobs: int = 1,
+    use_cache: bool = True,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    profile: bool = False,
+    align_clock: Optional[str] = None,
+    align_rate: Optional[float] = None,
+) -> int:
+    """bag_root 아래(또는 glob에 맞는) 모든 bag을 jobs개 프로세스로 병렬 변환.
+
+    start/end는 --start/--end 값 그대로 (bag 시작 기준 상대 초 또는 절대 ns).
+
+    Returns:
+        실패한 bag 수
+    """
+    bags = discover_bags(bag_root)
+    if not bags:
+        raise FileNotFoundError(f"metadata.yaml이 있는 bag을 찾지 못했습니다: {bag_root}")
+
+    root = bag_root_base(bag_root)
+    topic_list = list(topics)
+    work = [
+        (
+            bag, batch_output_dir(bag, root, output_root, fmt), topic_list,
+            fmt, combined, filename, use_cache, start, end, profile,
+            align_clock, align_rate,
+        )
+        for bag in bags
+    ]
 
-            msg = deserialize_message(data, msg_type)
-            msg_dict = message_to_ordereddict(msg)
-            flat = flatten_dict(msg_dict)
+    print(f"[INFO] {len(work)}개 bag 변환 시작 (jobs={jobs})")
+    failures = 0
 
-            row = {fn: "" for fn in fieldnames}
-            row["timestamp"] = t
-            row["topic"] = topic_name
-            for k, v in flat.items():
-                if k in row:
-                    row[k] = v
+    def report(result: Tuple[Path, Optional[str], float], done: int) -> None:
+        nonlocal failures
+        bag_path, error, elapsed = result
+        if error is None:
+            print(f"[INFO] ({done}/{len(work)}) {bag_path} 완료 ({elapsed:.1f}s)")
+        else:
+            failures += 1
+            print(f"[ERROR] ({done}/{len(work)}) {bag_path} 실패: {error}")
 
-            writer.writerow(row)
+    if jobs <= 1:
+        for done, job in enumerate(work, 1):
+            report(_convert_bag_job(job), done)
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(_convert_bag_job, job) for job in work]
+            for done, future in enumerate(as_completed(futures), 1):
+                report(future.result(), done)
 
-    print(f"[INFO] Combined CSV written to {csv_path}")
+    return failures
 
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="ROS2 rosbag2 (.db3) → CSV 변환 도구",
     )
-    parser.add_argument(
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument(
         "--bag-path",
-        required=True,
         type=str,
         help="rosbag2 디렉토리 또는 .db3 파일 경로",
     )
+    source.add_argument(
+        "--bag-root",
+        type=str,
+        help=(
+            "배치 모드: bag들이 있는 상위 디렉토리 또는 glob 패턴 "
+            "(예: 'evaluation/rosbags/teb/*'). metadata.yaml로 bag을 찾음"
+        ),
+    )
     parser.add_argument(
         "--output-dir",
-        required=True,
         type=str,
-        help="CSV를 저장할 디렉토리",
+        default=None,
+        help=(
+            "CSV를 저장할 디렉토리 (--bag-path 사용 시 필수). 배치 모드에서는 "
+            "미지정 시 각 bag 아래 <format>/ 에 저장"
+        ),
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="배치 모드 병렬 프로세스 수 (기본: CPU 코어 수)",
     )
     parser.add_argument(
         "--topics",
@@ -316,11 +1071,86 @@ def parse_args() -> argparse.Namespace:
         default="combined.csv",
         help="출력 CSV 파일 이름 (--combined 옵션 사용 시, 기본: combined.csv)",
     )
+    parser.add_argument(
+        "--format",
+        choices=FORMATS,
+        default="csv",
+        help=(
+            "출력 형식 (기본: csv). parquet/feather/npz는 토픽별 컬럼형 테이블로 "
+            "저장하며 --combined와 함께 사용할 수 없음"
+        ),
+    )
+    parser.add_argument(
+        "--start",
+        type=str,
+        default=None,
+        help=(
+            "변환 시작 시각 (포함). bag 시작 기준 상대 초(예: 12.5) 또는 "
+            "절대 시각 ns(예: 1764684455370781164)"
+        ),
+    )
+    parser.add_argument(
+        "--end",
+        type=str,
+        default=None,
+        help="변환 종료 시각 (미포함). --start와 같은 형식",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help=(
+            "단계별(read/deserialize/flatten/write) 시간과 토픽/메시지 타입별 처리량을 "
+            "출력 디렉토리의 export_profile.json으로 저장"
+        ),
+    )
+    parser.add_argument(
+        "--align-clock",
+        type=str,
+        default=None,
+        help=(
+            "변환 후 이 토픽의 timestamp에 다른 토픽을 as-of join한 aligned 테이블 저장 "
+            "(예: /odom, /imu/data_raw)"
+        ),
+    )
+    parser.add_argument(
+        "--align-rate",
+        type=float,
+        default=None,
+        help="변환 후 이 주파수(Hz)로 균일 리샘플링한 aligned 테이블 저장 (예: 50)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="캐시(.export_cache.json)를 무시하고 항상 처음부터 다시 변환",
+    )
     return parser.parse_args()
 
 
 def main() -> int:
     args = parse_args()
+    topics = args.topics if args.topics else list(DEFAULT_TOPICS)
+
+    if args.bag_root:
+        output_root = (
+            Path(os.path.expanduser(args.output_dir)).resolve() if args.output_dir else None
+        )
+        print(f"[INFO] Bag root: {args.bag_root}")
+        print(f"[INFO] Topics: {topics}")
+        failures = convert_bags_parallel(
+            args.bag_root, output_root, topics, fmt=args.format,
+            combined=args.combined, filename=args.output_filename, jobs=args.jobs,
+            use_cache=not args.force, start=args.start, end=args.end,
+            profile=args.profile, align_clock=args.align_clock, align_rate=args.align_rate,
+        )
+        if failures:
+            print(f"[ERROR] {failures}개 bag 변환 실패")
+            return 1
+        print(f"[INFO] 완료: {args.format} 배치 변환이 끝났습니다.")
+        return 0
+
+    if not args.output_dir:
+        raise ValueError("--bag-path 사용 시 --output-dir을 지정해야 합니다.")
+
     bag_path = Path(os.path.expanduser(args.bag_path)).resolve()
     output_dir = Path(os.path.expanduser(args.output_dir)).resolve()
 
@@ -329,15 +1159,20 @@ def main() -> int:
 
     print(f"[INFO] Bag: {bag_path}")
     print(f"[INFO] Output dir: {output_dir}")
-    topics = args.topics if args.topics else list(DEFAULT_TOPICS)
     print(f"[INFO] Topics: {topics}")
 
-    if args.combined:
-        convert_bag_to_csv_combined(bag_path, output_dir, topics, filename=args.output_filename)
-    else:
-        convert_bag_to_csv(bag_path, output_dir, topics)
+    start_ns, end_ns = resolve_time_window(bag_path, args.start, args.end)
+    if start_ns is not None or end_ns is not None:
+        print(f"[INFO] Time window (ns): [{start_ns}, {end_ns})")
+
+    convert_bag(
+        bag_path, output_dir, topics, fmt=args.format,
+        combined=args.combined, filename=args.output_filename,
+        use_cache=not args.force, start_ns=start_ns, end_ns=end_ns,
+        profile=args.profile, align_clock=args.align_clock, align_rate=args.align_rate,
+    )
 
-    print("[INFO] 완료: CSV 변환이 끝났습니다.")
+    print(f"[INFO] 완료: {args.format} 변환이 끝났습니다.")
     return 0
 
 
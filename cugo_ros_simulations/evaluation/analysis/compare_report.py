@@ -0,0 +1,532 @@
+#!/usr/bin/env python3
+"""
+TEB vs MPPI 다중 trial 비교 리포트
+
+evaluation/rosbags/<planner>/<trial> bag마다 주행 메트릭(nav_metrics.py)과 제어 주기
+메트릭(cycle_time.py)을 여러 프로세스에서 병렬로 계산하고, planner × 시나리오별로
+평균 / 표준편차 / 백분위수 / 성공률을 집계합니다.
+
+- trial별 결과는 <results>/trials/<planner>/<trial>.json에 bag 지문(export_cache.bag_signature)과
+  함께 캐시하므로, trial을 추가하면 새 trial만 계산합니다 (--force로 전체 재계산).
+- 테이블은 bag 아래에 이미 변환된 디렉토리(feather / parquet / npz / csv)를 사용하고,
+  없으면 sqlite_bag_reader.py로 <bag>/npz에 변환합니다 (ROS 2 불필요).
+  압축 bag(--bag-compression)은 bag_to_csv.py(rosbag2_py, ROS 2 필요)로 변환합니다.
+- 시나리오는 trial 이름에서 기록 시각(_YYYYMMDD_HHMMSS)과 _trialN을 뗀 부분입니다
+  (예: stage123_20251202_230735 → stage123).
+- 성공: goal_error ≤ xy_goal_tolerance 그리고 goal_yaw_error ≤ yaw_goal_tolerance
+  (evaluation/configs의 general_goal_checker 설정).
+
+결과:
+- <results>/trial_metrics.csv: trial별 전체 메트릭
+- <results>/summary.csv: planner × 시나리오 × 메트릭별 n, mean, std, p10, p50, p90, min, max
+- <results>/plots/*.png: 주요 메트릭 box plot과 성공률 (matplotlib 필요)
+- COMPARISON_TABLE.md의 자동 생성 구간(마커 사이)을 결과 표로 교체
+
+사용 예:
+    python3 compare_report.py --jobs 8
+"""
+
+import argparse
+import json
+import math
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# 같은 디렉토리 모듈 import를 위한 경로 설정
+script_dir = os.path.dirname(os.path.abspath(__file__))
+if script_dir not in sys.path:
+    sys.path.insert(0, script_dir)
+
+from cycle_time import LOCAL_PLAN_TOPIC, analyze_trial, planner_config
+from export_cache import bag_signature
+from nav_metrics import ODOM_TOPIC, compute_trial_metrics, write_rows
+from sqlite_bag_reader import bag_compression, discover_bags, export_tables
+from table_io import pose_table_name, topic_table_path
+
+
+EVALUATION_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_ROSBAG_ROOT = EVALUATION_DIR / "rosbags"
+DEFAULT_RESULTS_DIR = EVALUATION_DIR / "results"
+DEFAULT_TABLE_MD = EVALUATION_DIR / "COMPARISON_TABLE.md"
+PLANNERS = ("teb", "mppi")
+
+# 계산 방식이 바뀌면 올려서 trial 캐시를 무효화
+REPORT_VERSION = "4"
+
+# 이미 변환된 테이블을 찾을 bag 하위 디렉토리 (우선순위 순)
+TABLE_DIR_NAMES = ("feather", "parquet", "npz", "csv")
+DEFAULT_GOAL_TOLERANCE = (0.25, 0.25)
+
+BEGIN_MARKER = "<!-- BEGIN GENERATED: compare_report.py -->"
+END_MARKER = "<!-- END GENERATED: compare_report.py -->"
+
+# 표와 그래프에 넣는 메트릭: (컬럼, 표시 이름, 소수 자릿수)
+KEY_METRICS: List[Tuple[str, str, int]] = [
+    ("total_time", "주행 시간 [s]", 1),
+    ("total_distance", "주행 거리 [m]", 2),
+    ("average_speed", "평균 속도 [m/s]", 3),
+    ("angular_vel_std", "각속도 표준편차 [rad/s]", 3),
+    ("jerk_rms", "저크 RMS [m/s³]", 3),
+    ("harsh_accel_count", "급가속 횟수", 1),
+    ("curvature_mean", "평균 곡률 [1/m]", 3),
+    ("goal_error", "목표 위치 오차 [m]", 3),
+    ("path_deviation_mean", "경로 추종 오차 평균 [m]", 3),
+    ("path_deviation_max", "경로 추종 오차 최대 [m]", 3),
+    ("cmd_vel_rate", "실제 제어 주파수 [Hz]", 2),
+    ("cmd_vel_period_p99_ms", "제어 주기 p99 [ms]", 1),
+    ("cmd_vel_deadline_miss_ratio", "deadline miss 비율", 3),
+]
+
+# 집계에서 제외하는 (숫자가 아니거나 설정값인) 컬럼
+_NON_METRIC_COLUMNS = {
+    "planner", "scenario", "trial", "bag", "table_dir", "error", "success", "controller_frequency",
+}
+
+_TIMESTAMP_SUFFIX = re.compile(r"_\d{8}_\d{6}$")
+_TRIAL_SUFFIX = re.compile(r"_trial\d+$")
+
+
+def scenario_name(trial: str) -> str:
+    """trial 이름 → 시나리오 (예: 'stage123_20251202_230735' → 'stage123')."""
+    return _TRIAL_SUFFIX.sub("", _TIMESTAMP_SUFFIX.sub("", trial)) or trial
+
+
+def goal_tolerance(planner: str) -> Tuple[float, float]:
+    """planner 설정의 (xy_goal_tolerance, yaw_goal_tolerance)."""
+    config = planner_config(planner)
+    try:
+        checker = config["controller_server"]["ros__parameters"]["general_goal_checker"]
+        return float(checker["xy_goal_tolerance"]), float(checker["yaw_goal_tolerance"])
+    except (KeyError, TypeError):
+        return DEFAULT_GOAL_TOLERANCE
+
+
+def find_table_dir(bag_dir: Path) -> Optional[Path]:
+    """bag 아래 이미 변환된 토픽별 테이블 디렉토리 (/odom 테이블 기준)."""
+    for name in TABLE_DIR_NAMES:
+        if topic_table_path(bag_dir / name, ODOM_TOPIC, name).exists():
+            return bag_dir / name
+    return None
+
+
+def trial_cache_path(results_dir: Path, planner: str, trial: str) -> Path:
+    return Path(results_dir) / "trials" / planner / f"{trial}.json"
+
+
+def load_cached_trial(path: Path, signature: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """캐시된 trial 행 (버전이나 bag 지문이 다르면 None)."""
+    if not path.exists():
+        return None
+    try:
+        with path.open("r") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if cached.get("version") != REPORT_VERSION or cached.get("signature") != signature:
+        return None
+    return cached.get("row")
+
+
+def _finite(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+
+def _stale_export(table_dir: Path, bag_dir: Path) -> bool:
+    """이전 버전 export_tables 출력 (Path 토픽의 '_poses' 테이블만 있고 헤더 테이블 없음)."""
+    if table_dir != bag_dir / "npz":
+        return False
+    return (
+        topic_table_path(table_dir, pose_table_name(LOCAL_PLAN_TOPIC), "npz").exists()
+        and not topic_table_path(table_dir, LOCAL_PLAN_TOPIC, "npz").exists()
+    )
+
+
+def compute_trial(bag_dir: Path, planner: str) -> Dict[str, Any]:
+    """bag 하나의 메트릭 행 (주행 메트릭 + 제어 주기 요약 + 성공 여부)."""
+    table_dir = find_table_dir(bag_dir)
+    if table_dir is None or _stale_export(table_dir, bag_dir):
+        table_dir = bag_dir / "npz"
+        if bag_compression(bag_dir):
+            # 압축 bag은 고속 경로(sqlite_bag_reader)로 읽을 수 없으므로 rosbag2_py로 변환
+            from bag_to_csv import convert_bag
+            convert_bag(bag_dir, table_dir, (), fmt="npz", progress=False)
+        else:
+            export_tables(bag_dir, table_dir, fmt="npz")
+
+    row: Dict[str, Any] = {
+        "planner": planner,
+        "scenario": scenario_name(bag_dir.name),
+        "trial": bag_dir.name,
+        "bag": str(bag_dir),
+        "table_dir": str(table_dir),
+    }
+    row.update(compute_trial_metrics(table_dir))
+    row.update(analyze_trial(table_dir, planner=planner)[0])
+
+    xy_tolerance, yaw_tolerance = goal_tolerance(planner)
+    yaw_error = row.get("goal_yaw_error")
+    row["success"] = bool(
+        _finite(row.get("goal_error")) and row["goal_error"] <= xy_tolerance
+        and (not _finite(yaw_error) or yaw_error <= yaw_tolerance)
+    )
+    return row
+
+
+def _trial_job(job: Tuple[Path, str, Dict[str, Any], Path]) -> Tuple[Path, Dict[str, Any], float]:
+    """프로세스 풀 작업 단위: (bag, 메트릭 행 또는 error 행, 소요 시간).
+
+    성공한 trial만 캐시에 저장합니다.
+    """
+    bag_dir, planner, signature, cache_path = job
+    start = time.monotonic()
+    try:
+        row = compute_trial(bag_dir, planner)
+    except Exception as e:  # 한 trial의 실패가 리포트 전체를 멈추지 않도록
+        row = {
+            "planner": planner, "scenario": scenario_name(bag_dir.name), "trial": bag_dir.name,
+            "bag": str(bag_dir), "error": f"{type(e).__name__}: {e}",
+        }
+        return bag_dir, row, time.monotonic() - start
+
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    with cache_path.open("w") as f:
+        json.dump(
+            {"version": REPORT_VERSION, "signature": signature, "row": row},
+            f, indent=2, ensure_ascii=False,
+        )
+    return bag_dir, row, time.monotonic() - start
+
+
+def collect_trials(
+    rosbag_root: Path,
+    results_dir: Path,
+    planners: Iterable[str] = PLANNERS,
+    jobs: int = 1,
+    use_cache: bool = True,
+) -> List[Dict[str, Any]]:
+    """<rosbag_root>/<planner>/* 의 모든 trial 메트릭 행 (캐시에 없는 trial만 병렬 계산)."""
+    rows: List[Dict[str, Any]] = []
+    work: List[Tuple[Path, str, Dict[str, Any], Path]] = []
+    for planner in planners:
+        planner_root = Path(rosbag_root) / planner
+        if not planner_root.is_dir():
+            print(f"[INFO] {planner_root} 없음, 건너뜀")
+            continue
+        for bag_dir in discover_bags(str(planner_root)):
+            signature = bag_signature(bag_dir)
+            cache_path = trial_cache_path(results_dir, planner, bag_dir.name)
+            cached = load_cached_trial(cache_path, signature) if use_cache else None
+            if cached is not None:
+                rows.append(cached)
+            else:
+                work.append((bag_dir, planner, signature, cache_path))
+
+    print(f"[INFO] trial {len(rows) + len(work)}개 (캐시 {len(rows)}개, 새로 계산 {len(work)}개, jobs={jobs})")
+
+    def report(result: Tuple[Path, Dict[str, Any], float], done: int) -> None:
+        bag_dir, row, elapsed = result
+        rows.append(row)
+        if "error" in row:
+            print(f"[ERROR] ({done}/{len(work)}) {bag_dir} 실패: {row['error']}")
+        else:
+            print(f"[INFO] ({done}/{len(work)}) {bag_dir} 완료 ({elapsed:.1f}s)")
+
+    if jobs <= 1:
+        for done, job in enumerate(work, 1):
+            report(_trial_job(job), done)
+    elif work:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(_trial_job, job) for job in work]
+            for done, future in enumerate(as_completed(futures), 1):
+                report(future.result(), done)
+
+    rows.sort(key=lambda row: (row["planner"], row["scenario"], row["trial"]))
+    return rows
+
+
+def metric_columns(rows: List[Dict[str, Any]]) -> List[str]:
+    """행들에 나오는 숫자 메트릭 컬럼 (처음 나온 순서)."""
+    columns: Dict[str, None] = {}
+    for row in rows:
+        for name, value in row.items():
+            if name not in _NON_METRIC_COLUMNS and _finite(value):
+                columns.setdefault(name, None)
+    return list(columns)
+
+
+def aggregate(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """planner × 시나리오 × 메트릭별 통계 (long 형식). 성공률은 metric='success_rate'."""
+    groups: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+    for row in rows:
+        if "error" not in row:
+            groups.setdefault((row["planner"], row["scenario"]), []).append(row)
+
+    columns = metric_columns(rows)
+    summary: List[Dict[str, Any]] = []
+    for (planner, scenario), group in sorted(groups.items()):
+        successes = sum(1 for row in group if row.get("success"))
+        summary.append({
+            "planner": planner, "scenario": scenario, "metric": "success_rate",
+            "n": len(group), "mean": successes / len(group),
+        })
+        for name in columns:
+            values = np.asarray([row[name] for row in group if _finite(row.get(name))], dtype=np.float64)
+            if not len(values):
+                continue
+            p10, p50, p90 = np.percentile(values, [10, 50, 90])
+            summary.append({
+                "planner": planner, "scenario": scenario, "metric": name, "n": len(values),
+                "mean": float(np.mean(values)),
+                "std": float(np.std(values, ddof=1)) if len(values) > 1 else 0.0,
+                "p10": float(p10), "p50": float(p50), "p90": float(p90),
+                "min": float(np.min(values)), "max": float(np.max(values)),
+            })
+    return summary
+
+
+def render_markdown(
+    rows: List[Dict[str, Any]],
+    summary: List[Dict[str, Any]],
+    plots: List[Path],
+    relative_to: Path,
+) -> str:
+    """COMPARISON_TABLE.md 자동 생성 구간 (마커 포함)."""
+    stats = {(s["planner"], s["scenario"], s["metric"]): s for s in summary}
+    planners = [p for p in PLANNERS if any(s["planner"] == p for s in summary)]
+    planners += sorted({s["planner"] for s in summary} - set(planners))
+    scenarios = sorted({s["scenario"] for s in summary})
+    failed = [row for row in rows if "error" in row]
+
+    lines = [
+        BEGIN_MARKER,
+        "",
+        "## 📈 실험 결과 (자동 생성)",
+        "",
+        f"> `analysis/compare_report.py`가 생성한 구간입니다. 직접 수정하지 마세요. "
+        f"({datetime.now():%Y-%m-%d %H:%M}, trial {len(rows) - len(failed)}개"
+        + (f", 실패 {len(failed)}개" if failed else "") + ")",
+        "",
+        "값은 `평균 ± 표준편차 (중앙값)`, 성공 기준은 `general_goal_checker` 허용오차입니다.",
+    ]
+    for scenario in scenarios:
+        header = ["메트릭"]
+        for planner in planners:
+            n = stats.get((planner, scenario, "success_rate"), {}).get("n", 0)
+            header.append(f"{planner.upper()} (n={n})")
+        lines += ["", f"### {scenario}", "", "| " + " | ".join(header) + " |",
+                  "|" + "|".join("-----" for _ in header) + "|"]
+
+        cells = ["**성공률**"]
+        for planner in planners:
+            s = stats.get((planner, scenario, "success_rate"))
+            cells.append("-" if s is None else f"{s['mean'] * 100:.0f}% ({round(s['mean'] * s['n'])}/{s['n']})")
+        lines.append("| " + " | ".join(cells) + " |")
+
+        for name, label, digits in KEY_METRICS:
+            cells = [label]
+            for planner in planners:
+                s = stats.get((planner, scenario, name))
+                cells.append(
+                    "-" if s is None
+                    else f"{s['mean']:.{digits}f} ± {s['std']:.{digits}f} ({s['p50']:.{digits}f})"
+                )
+            if any(cell != "-" for cell in cells[1:]):
+                lines.append("| " + " | ".join(cells) + " |")
+
+    if plots:
+        lines += ["", "### 그래프", ""]
+        for path in plots:
+            lines.append(f"![{path.stem}]({os.path.relpath(path, relative_to)})")
+
+    if failed:
+        lines += ["", "### 계산 실패 trial", ""]
+        lines += [f"- `{row['planner']}/{row['trial']}`: {row['error']}" for row in failed]
+
+    lines += ["", END_MARKER]
+    return "\n".join(lines) + "\n"
+
+
+def update_table_md(path: Path, section: str) -> None:
+    """마커 사이 구간을 교체 (마커가 없으면 파일 끝에 추가). 나머지 수기 내용은 그대로 둠."""
+    text = path.read_text() if path.exists() else ""
+    begin, end = text.find(BEGIN_MARKER), text.find(END_MARKER)
+    if begin != -1 and end > begin:
+        text = text[:begin] + section + text[end + len(END_MARKER):].lstrip("\n")
+    else:
+        text = text.rstrip("\n") + "\n\n---\n\n" + section
+    path.write_text(text)
+
+
+def _require_matplotlib() -> Any:
+    try:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except ImportError as exc:
+        raise RuntimeError(
+            "그래프 생성에는 matplotlib가 필요합니다: pip install matplotlib"
+        ) from exc
+    return plt
+
+
+def write_plots(rows: List[Dict[str, Any]], summary: List[Dict[str, Any]], plot_dir: Path) -> List[Path]:
+    """주요 메트릭별 planner × 시나리오 box plot과 성공률 막대 그래프.
+
+    기본 글꼴에 한글이 없는 환경이 많으므로 축 이름은 컬럼 이름을 그대로 씁니다.
+    """
+    plt = _require_matplotlib()
+    plot_dir.mkdir(parents=True, exist_ok=True)
+
+    rows = [row for row in rows if "error" not in row]
+    planners = [p for p in PLANNERS if any(row["planner"] == p for row in rows)]
+    planners += sorted({row["planner"] for row in rows} - set(planners))
+    scenarios = sorted({row["scenario"] for row in rows})
+    width = 0.8 / max(len(planners), 1)
+    x = np.arange(len(scenarios))
+    paths: List[Path] = []
+
+    for name, _, _ in KEY_METRICS:
+        fig, ax = plt.subplots(figsize=(max(6, 2 * len(scenarios) + 2), 4))
+        drawn = False
+        for k, planner in enumerate(planners):
+            data = [
+                [row[name] for row in rows
+                 if row["planner"] == planner and row["scenario"] == scenario and _finite(row.get(name))]
+                for scenario in scenarios
+            ]
+            keep = [i for i, values in enumerate(data) if values]
+            if not keep:
+                continue
+            box = ax.boxplot(
+                [data[i] for i in keep], positions=x[keep] + (k - (len(planners) - 1) / 2) * width,
+                widths=width * 0.9, patch_artist=True,
+            )
+            for patch in box["boxes"]:
+                patch.set_facecolor(f"C{k}")
+                patch.set_alpha(0.6)
+            ax.plot([], [], color=f"C{k}", linewidth=8, alpha=0.6, label=planner.upper())
+            drawn = True
+        if not drawn:
+            plt.close(fig)
+            continue
+        ax.set_xticks(x)
+        ax.set_xticklabels(scenarios)
+        ax.set_ylabel(name)
+        ax.legend()
+        ax.grid(axis="y", alpha=0.3)
+        fig.tight_layout()
+        path = plot_dir / f"{name}.png"
+        fig.savefig(path, dpi=120)
+        plt.close(fig)
+        paths.append(path)
+
+    rates = {(s["planner"], s["scenario"]): s["mean"] for s in summary if s["metric"] == "success_rate"}
+    if rates:
+        fig, ax = plt.subplots(figsize=(max(6, 2 * len(scenarios) + 2), 4))
+        for k, planner in enumerate(planners):
+            ax.bar(
+                x + (k - (len(planners) - 1) / 2) * width,
+                [rates.get((planner, scenario), 0.0) * 100 for scenario in scenarios],
+                width * 0.9, label=planner.upper(), color=f"C{k}", alpha=0.8,
+            )
+        ax.set_xticks(x)
+        ax.set_xticklabels(scenarios)
+        ax.set_ylabel("success rate [%]")
+        ax.set_ylim(0, 105)
+        ax.legend()
+        fig.tight_layout()
+        path = plot_dir / "success_rate.png"
+        fig.savefig(path, dpi=120)
+        plt.close(fig)
+        paths.append(path)
+    return paths
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="TEB vs MPPI 다중 trial 메트릭 집계 및 비교 리포트 생성",
+    )
+    parser.add_argument(
+        "--rosbag-root",
+        type=str,
+        default=str(DEFAULT_ROSBAG_ROOT),
+        help="planner별 bag 디렉토리의 상위 경로 (기본: evaluation/rosbags)",
+    )
+    parser.add_argument(
+        "--planners",
+        nargs="+",
+        default=list(PLANNERS),
+        help=f"비교할 planner 디렉토리 (기본: {' '.join(PLANNERS)})",
+    )
+    parser.add_argument(
+        "--results-dir",
+        type=str,
+        default=str(DEFAULT_RESULTS_DIR),
+        help="trial 캐시, 집계 CSV, 그래프 저장 디렉토리 (기본: evaluation/results)",
+    )
+    parser.add_argument(
+        "--table-md",
+        type=str,
+        default=str(DEFAULT_TABLE_MD),
+        help="결과 표를 갱신할 마크다운 파일 (기본: evaluation/COMPARISON_TABLE.md)",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="병렬 프로세스 수 (기본: CPU 코어 수)",
+    )
+    parser.add_argument(
+        "--no-plots",
+        action="store_true",
+        help="그래프를 만들지 않음",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="trial 캐시를 무시하고 모든 trial을 다시 계산",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    rosbag_root = Path(os.path.expanduser(args.rosbag_root)).resolve()
+    results_dir = Path(os.path.expanduser(args.results_dir)).resolve()
+    table_md = Path(os.path.expanduser(args.table_md)).resolve()
+    results_dir.mkdir(parents=True, exist_ok=True)
+
+    rows = collect_trials(rosbag_root, results_dir, args.planners, args.jobs, use_cache=not args.force)
+    if not rows:
+        raise FileNotFoundError(f"trial bag을 찾지 못했습니다: {rosbag_root}/{{{','.join(args.planners)}}}/*")
+
+    summary = aggregate(rows)
+    write_rows(rows, results_dir / "trial_metrics.csv")
+    write_rows(summary, results_dir / "summary.csv")
+    print(f"[INFO] Trial metrics written to {results_dir / 'trial_metrics.csv'}")
+    print(f"[INFO] Summary written to {results_dir / 'summary.csv'}")
+
+    plots: List[Path] = []
+    if not args.no_plots:
+        try:
+            plots = write_plots(rows, summary, results_dir / "plots")
+            print(f"[INFO] {len(plots)}개 그래프 저장: {results_dir / 'plots'}")
+        except RuntimeError as e:
+            print(f"[INFO] 그래프 생략: {e}")
+
+    update_table_md(table_md, render_markdown(rows, summary, plots, table_md.parent))
+    print(f"[INFO] Comparison table updated: {table_md}")
+
+    return 1 if any("error" in row for row in rows) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+제어 주기(cycle time) / 실제 제어 주파수 분석
+
+controller_server는 controller_frequency(기본 20 Hz)마다 /cmd_vel을 발행하고,
+TEB는 같은 주기에 /local_plan을 발행합니다. 한 주기의 계산(TEB 최적화, MPPI
+샘플링)이 주기보다 오래 걸리면 다음 발행이 늦어지므로, bag에 기록된 발행 간격으로
+실제 제어 주기를 추정할 수 있습니다.
+
+토픽별로 다음을 계산합니다 (bag_to_csv.py 출력 테이블의 timestamp만 사용):
+- rate: 주행 중 실제 발행 주파수 (Hz)와 설정값 대비 비율 (rate_ratio)
+- period_*: 발행 간격 평균 / 표준편차 / p50 / p90 / p99 / p99.9 / 최대 (ms)
+- jitter_*: 설정 주기 대비 간격 오차 (평균 절댓값, 표준편차)와 히스토그램
+- deadline_misses: 간격이 1/controller_frequency × (1 + tolerance)를 넘은 주기 수
+- missed_cycles: 늦어진 간격 동안 건너뛴 것으로 보이는 주기 수
+- pauses: idle_gap보다 긴 간격 (목표 도착 후 정지 등, 주기 통계에서 제외)
+
+controller_frequency는 trial 경로를 거슬러 올라가 찾은 플래너 디렉토리(teb/ 또는
+mppi/)로 evaluation/configs의 설정 파일에서 읽으며, --controller-frequency로 직접
+지정할 수 있습니다. 둘 다 없으면 기본값을 쓰지 않고 오류로 처리합니다.
+
+사용 예:
+    python3 cycle_time.py --table-dirs '../rosbags/*/*/csv' --output cycle_time.json
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import yaml
+
+# 같은 디렉토리 모듈 import를 위한 경로 설정
+script_dir = os.path.dirname(os.path.abspath(__file__))
+if script_dir not in sys.path:
+    sys.path.insert(0, script_dir)
+
+from nav_metrics import expand_dirs, planner_from_path, trial_label, write_rows
+from table_io import read_topic_table
+
+
+CMD_VEL_TOPIC = "/cmd_vel"
+LOCAL_PLAN_TOPIC = "/local_plan"
+CYCLE_TOPICS = (CMD_VEL_TOPIC, LOCAL_PLAN_TOPIC)
+
+CONFIG_DIR = Path(__file__).resolve().parent.parent / "configs"
+PLANNER_CONFIGS = {
+    "teb": "cugo_v3_teb.yaml",
+    "mppi": "cugo_v3_mppi.yaml",
+}
+
+# 이보다 긴 발행 간격은 제어 중단(목표 도착, 웨이포인트 사이 대기)으로 보고 제외 (초)
+IDLE_GAP = 1.0
+# 설정 주기보다 이 비율 이상 늦으면 deadline miss
+DEADLINE_TOLERANCE = 0.1
+# 지터 히스토그램 칸 너비 (ms)
+JITTER_BIN_MS = 5.0
+# 요약에 남기는 가장 긴 주기 수
+WORST_CYCLES = 5
+
+
+def planner_config(planner: str, config_dir: Path = CONFIG_DIR) -> Optional[Dict[str, Any]]:
+    """planner('teb' / 'mppi')의 evaluation/configs 설정 (없으면 None)."""
+    name = PLANNER_CONFIGS.get(planner)
+    if name is None or not (Path(config_dir) / name).exists():
+        return None
+    with (Path(config_dir) / name).open("r") as f:
+        return yaml.safe_load(f)
+
+
+def controller_frequency(planner: str, config_dir: Path = CONFIG_DIR) -> Optional[float]:
+    """planner 설정 파일의 controller_server.controller_frequency."""
+    config = planner_config(planner, config_dir)
+    try:
+        return float(config["controller_server"]["ros__parameters"]["controller_frequency"])
+    except (KeyError, TypeError):
+        return None
+
+
+def jitter_histogram(periods: np.ndarray, nominal: float, bin_ms: float = JITTER_BIN_MS) -> Dict[str, Any]:
+    """(간격 - 설정 주기) 히스토그램. 범위는 [-주기, +3주기), 넘는 값은 overflow."""
+    nominal_ms = nominal * 1e3
+    edges = np.arange(-nominal_ms, 3.0 * nominal_ms + bin_ms, bin_ms)
+    jitter_ms = (periods - nominal) * 1e3
+    counts, _ = np.histogram(jitter_ms, bins=edges)
+    return {
+        "edges_ms": [round(e, 3) for e in edges.tolist()],
+        "counts": counts.tolist(),
+        "overflow": int(np.count_nonzero(jitter_ms >= edges[-1])),
+    }
+
+
+def cycle_stats(
+    timestamps: np.ndarray,
+    frequency: float,
+    idle_gap: float = IDLE_GAP,
+    tolerance: float = DEADLINE_TOLERANCE,
+) -> Tuple[Dict[str, float], np.ndarray]:
+    """발행 시각(int64 ns) → (주기 통계, 주행 중 발행 간격 배열(초))."""
+    t = np.sort(np.asarray(timestamps, dtype=np.int64))
+    periods = np.diff(t) * 1e-9
+    active = periods < idle_gap
+    p = periods[active]
+    nominal = 1.0 / frequency
+
+    stats: Dict[str, float] = {
+        "messages": int(len(t)),
+        "pauses": int(np.count_nonzero(~active)),
+    }
+    if not len(p):
+        return stats, p
+
+    active_time = float(np.sum(p))
+    rate = len(p) / active_time if active_time > 0 else float("nan")
+    late = p > nominal * (1.0 + tolerance)
+    percentiles = np.percentile(p, [50, 90, 99, 99.9]) * 1e3
+    stats.update({
+        "active_time": active_time,
+        "rate": rate,
+        "rate_ratio": rate / frequency,
+        "period_mean_ms": float(np.mean(p)) * 1e3,
+        "period_std_ms": float(np.std(p)) * 1e3,
+        "period_p50_ms": float(percentiles[0]),
+        "period_p90_ms": float(percentiles[1]),
+        "period_p99_ms": float(percentiles[2]),
+        "period_p999_ms": float(percentiles[3]),
+        "period_max_ms": float(np.max(p)) * 1e3,
+        "jitter_abs_mean_ms": float(np.mean(np.abs(p - nominal))) * 1e3,
+        "jitter_std_ms": float(np.std(p - nominal)) * 1e3,
+        "deadline_misses": int(np.count_nonzero(late)),
+        "deadline_miss_ratio": float(np.mean(late)),
+        "missed_cycles": int(np.sum(np.maximum(np.round(p / nominal) - 1, 0))),
+    })
+    return stats, p
+
+
+def worst_cycles(timestamps: np.ndarray, idle_gap: float = IDLE_GAP, count: int = WORST_CYCLES) -> List[Dict[str, float]]:
+    """가장 길었던 주행 중 발행 간격 (시작 기준 시각 초, 간격 ms)."""
+    t = np.sort(np.asarray(timestamps, dtype=np.int64))
+    if len(t) < 2:
+        return []
+    periods = np.diff(t) * 1e-9
+    candidates = np.flatnonzero(periods < idle_gap)
+    order = candidates[np.argsort(periods[candidates])[::-1][:count]]
+    return [
+        {"time": round(float(t[i + 1] - t[0]) * 1e-9, 3), "period_ms": round(float(periods[i]) * 1e3, 3)}
+        for i in order
+    ]
+
+
+def analyze_trial(
+    table_dir: Path,
+    frequency: Optional[float] = None,
+    idle_gap: float = IDLE_GAP,
+    tolerance: float = DEADLINE_TOLERANCE,
+    planner: Optional[str] = None,
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """trial 하나의 (요약 행, 상세 - 토픽별 지터 히스토그램과 가장 긴 주기).
+
+    요약 행의 컬럼은 '<토픽>_<통계>' (예: cmd_vel_rate, local_plan_deadline_misses).
+    /local_plan 테이블이 없으면 MPPI에서는 건너뛰고, 그 밖의 플래너에서는 경고합니다.
+    planner를 주지 않으면 경로의 teb/ 또는 mppi/ 디렉토리에서 찾습니다.
+    """
+    table_dir = Path(table_dir)
+    if planner is None:
+        planner = planner_from_path(table_dir)
+    if frequency is None:
+        if planner is None:
+            raise ValueError(
+                f"{table_dir}: 경로에서 플래너(teb/mppi)를 찾지 못했습니다. "
+                "--controller-frequency로 제어 주파수를 지정하세요."
+            )
+        frequency = controller_frequency(planner)
+        if frequency is None:
+            raise ValueError(
+                f"{planner} 설정에서 controller_frequency를 읽지 못했습니다. "
+                "--controller-frequency로 제어 주파수를 지정하세요."
+            )
+
+    row: Dict[str, Any] = {"controller_frequency": frequency}
+    details: Dict[str, Any] = {}
+    for topic in CYCLE_TOPICS:
+        try:
+            timestamps = read_topic_table(table_dir, topic, columns=["timestamp"])["timestamp"]
+        except (FileNotFoundError, KeyError, ValueError) as e:
+            if topic == CMD_VEL_TOPIC:
+                continue
+            # MPPI는 /local_plan을 발행하지 않음
+            if planner != "mppi":
+                print(f"[WARN] {table_dir}: {planner or '플래너 미상'} trial의 {topic} 테이블을 읽지 못해 "
+                      f"제어 주기 통계에서 빠집니다 ({type(e).__name__}: {e})")
+            continue
+        stats, periods = cycle_stats(timestamps, frequency, idle_gap, tolerance)
+        prefix = topic.strip("/").replace("/", "_")
+        row.update({f"{prefix}_{name}": value for name, value in stats.items()})
+        details[prefix] = {
+            "jitter_histogram": jitter_histogram(periods, 1.0 / frequency),
+            "worst_cycles": worst_cycles(timestamps, idle_gap),
+        }
+
+    if CMD_VEL_TOPIC.strip("/") not in details:
+        raise ValueError(f"{CMD_VEL_TOPIC} 테이블이 없거나 비어 있습니다.")
+    return row, details
+
+
+def analyze_dirs(
+    table_dirs: Iterable[Path],
+    frequency: Optional[float] = None,
+    idle_gap: float = IDLE_GAP,
+    tolerance: float = DEADLINE_TOLERANCE,
+    with_details: bool = False,
+) -> List[Dict[str, Any]]:
+    """여러 trial의 요약 행 목록 (with_details면 'details' 항목 포함, 실패한 trial은 error만)."""
+    rows: List[Dict[str, Any]] = []
+    for table_dir in table_dirs:
+        row: Dict[str, Any] = {"trial": trial_label(table_dir), "path": str(table_dir)}
+        try:
+            summary, details = analyze_trial(table_dir, frequency, idle_gap, tolerance)
+        except (ValueError, KeyError, OSError) as e:
+            row["error"] = f"{type(e).__name__}: {e}"
+        else:
+            row.update(summary)
+            if with_details:
+                row["details"] = details
+        rows.append(row)
+    return rows
+
+
+def print_histogram(histogram: Dict[str, Any], width: int = 40) -> None:
+    counts = histogram["counts"]
+    peak = max(max(counts, default=0), histogram["overflow"], 1)
+    edges = histogram["edges_ms"]
+    for lo, count in zip(edges, counts):
+        if count:
+            print(f"    {lo:+7.1f}ms {'#' * max(1, round(count / peak * width))} {count}")
+    if histogram["overflow"]:
+        print(f"    >={edges[-1]:+6.1f}ms {'#' * max(1, round(histogram['overflow'] / peak * width))} {histogram['overflow']}")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="bag_to_csv.py 출력 테이블에서 제어 주기 / 실제 제어 주파수 분석",
+    )
+    parser.add_argument(
+        "--table-dirs",
+        nargs="+",
+        required=True,
+        help="bag_to_csv.py 출력 디렉토리 또는 glob 패턴 (예: '../rosbags/*/*/csv')",
+    )
+    parser.add_argument(
+        "--controller-frequency",
+        type=float,
+        default=None,
+        help="설정 제어 주파수 Hz (미지정 시 경로의 teb/mppi 디렉토리로 evaluation/configs의 "
+             "planner 설정에서 읽음, 플래너를 알 수 없는 경로면 필수)",
+    )
+    parser.add_argument(
+        "--idle-gap",
+        type=float,
+        default=IDLE_GAP,
+        help=f"제어 중단으로 보고 제외할 발행 간격 초 (기본: {IDLE_GAP})",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEADLINE_TOLERANCE,
+        help=f"deadline miss 판정 여유 비율 (기본: {DEADLINE_TOLERANCE})",
+    )
+    parser.add_argument(
+        "--histogram",
+        action="store_true",
+        help="trial별 /cmd_vel 지터 히스토그램 출력",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        help="결과 저장 경로 (.csv 또는 .json, json은 히스토그램 포함)",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+
+    table_dirs = expand_dirs(args.table_dirs)
+    if not table_dirs:
+        raise FileNotFoundError(f"테이블 디렉토리를 찾지 못했습니다: {args.table_dirs}")
+
+    output = Path(os.path.expanduser(args.output)) if args.output else None
+    rows = analyze_dirs(
+        table_dirs, args.controller_frequency, args.idle_gap, args.tolerance,
+        with_details=True,
+    )
+    for row in rows:
+        if "error" in row:
+            print(f"[ERROR] {row['trial']}: {row['error']}")
+            continue
+        for prefix in ("cmd_vel", "local_plan"):
+            if f"{prefix}_rate" not in row:
+                continue
+            print(
+                f"[INFO] {row['trial']} {prefix}: {row[f'{prefix}_rate']:.2f} Hz "
+                f"(설정 {row['controller_frequency']:g} Hz), "
+                f"p99 {row[f'{prefix}_period_p99_ms']:.1f}ms, max {row[f'{prefix}_period_max_ms']:.1f}ms, "
+                f"deadline miss {row[f'{prefix}_deadline_misses']} "
+                f"({row[f'{prefix}_deadline_miss_ratio'] * 100:.1f}%)"
+            )
+        if args.histogram:
+            print_histogram(row["details"]["cmd_vel"]["jitter_histogram"])
+
+    if output is not None:
+        if output.suffix != ".json":
+            # CSV에는 요약 컬럼만
+            rows = [{k: v for k, v in row.items() if k != "details"} for row in rows]
+        write_rows(rows, output)
+        print(f"[INFO] Cycle-time summary written to {output}")
+
+    return 1 if any("error" in row for row in rows) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+bag 변환 결과 캐시 (manifest)
+
+bag_to_csv.py는 출력 디렉토리에 .export_cache.json을 남깁니다. 다음 실행 때
+bag의 지문(metadata.yaml 해시, .db3 파일 크기/수정 시각)과 변환 옵션
+(토픽 선택, 출력 형식, 변환기 버전)을 비교해서
+
+- 모두 같고 지난번 결과 파일이 남아 있으면 변환을 건너뛰고 (skip)
+- 기존 파일이 그대로이거나 커지기만 했으면 토픽별로 마지막으로 변환한 timestamp
+  이후의 메시지만 이어서 변환하고 (append)
+- 그 외에는 (결과 파일을 지운 경우 포함) 처음부터 다시 변환합니다 (full).
+
+노트북 시작 부분에서 변환기를 무조건 호출해도 비용이 거의 들지 않습니다.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import yaml
+
+
+MANIFEST_NAME = ".export_cache.json"
+
+
+class AppendNotPossible(Exception):
+    """이어쓰기를 할 수 없는 경우 (새 컬럼 등장 등) → 전체 재변환."""
+
+
+def _bag_files(bag_dir: Path) -> Iterable[Path]:
+    meta_path = bag_dir / "metadata.yaml"
+    if meta_path.exists():
+        with meta_path.open("r") as f:
+            info = (yaml.safe_load(f) or {}).get("rosbag2_bagfile_information", {})
+        if info.get("relative_file_paths"):
+            return [bag_dir / p for p in info["relative_file_paths"]]
+    return sorted(bag_dir.glob("*.db3"))
+
+
+def bag_signature(bag_dir: Path) -> Dict[str, Any]:
+    """bag 지문: metadata.yaml 해시와 데이터 파일별 [크기, mtime_ns]."""
+    meta_path = bag_dir / "metadata.yaml"
+    meta_hash = (
+        hashlib.sha1(meta_path.read_bytes()).hexdigest() if meta_path.exists() else None
+    )
+    files: Dict[str, Any] = {}
+    for path in _bag_files(bag_dir):
+        if path.exists():
+            stat = path.stat()
+            files[path.name] = [stat.st_size, stat.st_mtime_ns]
+    return {"metadata_sha1": meta_hash, "files": files}
+
+
+def export_key(
+    topics: Iterable[str],
+    fmt: str,
+    version: str,
+    **options: Any,
+) -> Dict[str, Any]:
+    """출력 내용을 결정하는 변환 옵션 (하나라도 바뀌면 전체 재변환)."""
+    key = {"topics": sorted(topics), "format": fmt, "version": version}
+    key.update(options)
+    return key
+
+
+def load_manifest(output_dir: Path) -> Optional[Dict[str, Any]]:
+    path = output_dir / MANIFEST_NAME
+    if not path.exists():
+        return None
+    try:
+        with path.open("r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_manifest(
+    output_dir: Path,
+    key: Dict[str, Any],
+    signature: Dict[str, Any],
+    last_timestamps: Dict[str, Optional[int]],
+    outputs: Iterable[str] = (),
+) -> None:
+    output_dir.mkdir(parents=True, exist_ok=True)
+    path = output_dir / MANIFEST_NAME
+    tmp = path.with_suffix(".tmp")
+    with tmp.open("w") as f:
+        json.dump(
+            {
+                "key": key, "bag": signature, "last_timestamps": last_timestamps,
+                "outputs": list(outputs),
+            },
+            f, indent=2,
+        )
+    tmp.replace(path)
+
+
+def _is_append_only(old: Dict[str, Any], new: Dict[str, Any]) -> bool:
+    """기존 데이터 파일이 모두 남아 있고 줄어든 파일이 없으면 이어쓰기로 판단."""
+    old_files = old.get("files", {})
+    new_files = new.get("files", {})
+    if not old_files:
+        return False
+    for name, (size, _) in old_files.items():
+        if name not in new_files or new_files[name][0] < size:
+            return False
+    return True
+
+
+def plan_export(
+    bag_dir: Path,
+    output_dir: Path,
+    key: Dict[str, Any],
+) -> Tuple[str, Optional[Dict[str, Optional[int]]], Dict[str, Any]]:
+    """이번 변환 방법 결정.
+
+    Returns:
+        (action, after_ns, signature)
+        action은 'skip' / 'append' / 'full', append일 때 after_ns는
+        토픽별로 이미 변환된 마지막 timestamp
+    """
+    signature = bag_signature(bag_dir)
+    manifest = load_manifest(output_dir)
+
+    if manifest is None or manifest.get("key") != key:
+        return "full", None, signature
+    # 결과 파일(예: odom.csv)을 손으로 지웠으면 건너뛰거나 이어쓰지 않고 다시 만듦
+    outputs = manifest.get("outputs")
+    if outputs is None or not all((output_dir / name).exists() for name in outputs):
+        return "full", None, signature
+    if manifest.get("bag") == signature:
+        return "skip", None, signature
+
+    # 토픽별 커서가 없는 예전 manifest(last_timestamp 하나)는 전체 재변환
+    last = manifest.get("last_timestamps")
+    if isinstance(last, dict) and _is_append_only(manifest.get("bag", {}), signature):
+        return "append", last, signature
+    return "full", None, signature
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+bag 변환 진행률 / 처리량 계측
+
+bag_to_csv.py의 변환 루프가 메시지마다 단계별 소요 시간
+(read, deserialize, flatten, write)을 기록하면, metadata.yaml의 토픽별
+message_count를 기준으로 진행률과 남은 시간을 주기적으로 출력하고,
+변환이 끝나면 토픽/메시지 타입별 처리량(msg/s)과 단계별 시간을 요약합니다.
+
+--profile 옵션을 주면 같은 요약을 출력 디렉토리의 export_profile.json으로 저장합니다.
+"""
+
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+PHASES = ("read", "deserialize", "flatten", "write")
+
+PROFILE_NAME = "export_profile.json"
+
+# 진행률 확인 주기 (메시지 수, 2의 거듭제곱 - 1)
+_CHECK_MASK = 0x3FF
+
+
+class ExportStats:
+    """변환 한 번의 토픽별 메시지 수와 단계별 누적 시간."""
+
+    def __init__(self, progress: bool = True, interval: float = 2.0):
+        self.progress = progress
+        self.interval = interval
+        self.expected = 0
+        self.done = 0
+        self.topic_types: Dict[str, str] = {}
+        self.counts: Dict[str, int] = {}
+        # topic → [read, deserialize, flatten, write] 누적 초
+        self.timings: Dict[str, List[float]] = {}
+        self._start = time.perf_counter()
+        self._last_report = self._start
+        self._wall: Optional[float] = None
+
+    def begin(self, topic_types: Dict[str, str], expected_counts: Dict[str, int]) -> None:
+        """변환할 토픽과 metadata의 예상 메시지 수 등록 (진행률 기준)."""
+        self.topic_types.update(topic_types)
+        self.expected += sum(expected_counts.get(name, 0) for name in topic_types)
+        for name in topic_types:
+            self.counts.setdefault(name, 0)
+            self.timings.setdefault(name, [0.0] * len(PHASES))
+
+    def record(
+        self,
+        topic_name: str,
+        read: float,
+        deserialize: float,
+        flatten: float,
+        write: float,
+    ) -> None:
+        """메시지 한 개의 단계별 소요 시간(초) 기록."""
+        timing = self.timings[topic_name]
+        timing[0] += read
+        timing[1] += deserialize
+        timing[2] += flatten
+        timing[3] += write
+        self.counts[topic_name] += 1
+        self.done += 1
+        if self.progress and not self.done & _CHECK_MASK:
+            now = time.perf_counter()
+            if now - self._last_report >= self.interval:
+                self._last_report = now
+                self._report(now)
+
+    def record_write(self, name: str, seconds: float) -> None:
+        """루프 밖에서 한 번에 기록하는 시간 (컬럼형 파일 저장, combined CSV 헤더 처리 등)."""
+        timing = self.timings.setdefault(name, [0.0] * len(PHASES))
+        self.counts.setdefault(name, 0)
+        timing[3] += seconds
+
+    def _report(self, now: float) -> None:
+        elapsed = now - self._start
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        if self.expected:
+            # 구간 지정 시 실제로는 더 적게 읽으므로 예상치는 상한
+            ratio = min(self.done / self.expected, 1.0)
+            remaining = (self.expected - self.done) / rate if rate > 0 else 0.0
+            print(
+                f"[INFO] 진행 {ratio * 100:5.1f}% ({self.done:,}/{self.expected:,} msg, "
+                f"{rate:,.0f} msg/s, 남은 시간 ~{max(remaining, 0.0):.0f}s)"
+            )
+        else:
+            print(f"[INFO] 진행 {self.done:,} msg ({rate:,.0f} msg/s)")
+
+    def finish(self) -> None:
+        self._wall = time.perf_counter() - self._start
+
+    def summary(self) -> Dict[str, Any]:
+        """JSON으로 저장할 요약: 전체, 토픽별, 메시지 타입별 처리량과 단계별 시간."""
+        wall = self._wall if self._wall is not None else time.perf_counter() - self._start
+
+        def entry(count: int, timing: List[float]) -> Dict[str, Any]:
+            busy = sum(timing)
+            return {
+                "messages": count,
+                "seconds": {phase: round(t, 6) for phase, t in zip(PHASES, timing)},
+                "total_seconds": round(busy, 6),
+                "messages_per_second": round(count / busy, 1) if busy > 0 else None,
+            }
+
+        topics = {
+            name: dict(entry(self.counts[name], timing), type=self.topic_types.get(name))
+            for name, timing in self.timings.items()
+        }
+
+        by_type: Dict[str, List[Any]] = {}
+        for name, timing in self.timings.items():
+            msg_type = self.topic_types.get(name)
+            if msg_type is None:
+                continue
+            acc = by_type.setdefault(msg_type, [0, [0.0] * len(PHASES)])
+            acc[0] += self.counts[name]
+            acc[1] = [a + b for a, b in zip(acc[1], timing)]
+
+        phase_totals = [sum(timing[i] for timing in self.timings.values()) for i in range(len(PHASES))]
+        return {
+            "wall_seconds": round(wall, 6),
+            "messages": self.done,
+            "expected_messages": self.expected,
+            "messages_per_second": round(self.done / wall, 1) if wall > 0 else None,
+            "phases": {phase: round(t, 6) for phase, t in zip(PHASES, phase_totals)},
+            "topics": topics,
+            "types": {msg_type: entry(count, timing) for msg_type, (count, timing) in by_type.items()},
+        }
+
+    def print_summary(self) -> None:
+        summary = self.summary()
+        phases = ", ".join(f"{phase} {t:.2f}s" for phase, t in summary["phases"].items())
+        print(
+            f"[INFO] {summary['messages']:,} msg / {summary['wall_seconds']:.2f}s "
+            f"({summary['messages_per_second'] or 0:,.0f} msg/s) - {phases}"
+        )
+        for name, info in sorted(
+            summary["topics"].items(), key=lambda item: -item[1]["total_seconds"]
+        ):
+            if not info["messages"]:
+                continue
+            print(
+                f"[INFO]   {name}: {info['messages']:,} msg, "
+                f"{info['total_seconds']:.2f}s ({info['messages_per_second'] or 0:,.0f} msg/s)"
+            )
+
+    def write_json(self, output_dir: Path) -> Path:
+        path = Path(output_dir) / PROFILE_NAME
+        with path.open("w") as f:
+            json.dump(self.summary(), f, indent=2, ensure_ascii=False)
+        return path
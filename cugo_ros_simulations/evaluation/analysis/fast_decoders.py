@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+주요 메시지 타입용 고정 컬럼 추출기
+
+message_to_ordereddict → flatten_dict 경로는 메시지마다 중첩 OrderedDict와
+'a.b.c' 키 문자열을 새로 만듭니다. 메시지 수가 많은 타입
+(nav_msgs/Odometry, sensor_msgs/Imu 등)은 여기 등록된 추출기가
+operator.attrgetter로 필드를 한 번에 읽어 고정 순서의 값 튜플을 만들고,
+미리 할당한 NumPy 구조화 배열에 바로 기록합니다.
+
+고정 길이 타입의 컬럼 이름과 순서는 flatten_dict 결과와 동일합니다.
+포즈 배열을 가진 타입(nav_msgs/Path, teb_msgs/TrajectoryMsg)은 헤더 행과
+포즈 단위 long 테이블로 나눠서 추출합니다.
+등록되지 않은 타입은 기존 flatten_dict 경로를 그대로 사용합니다.
+"""
+
+from operator import attrgetter
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+# 문자열 필드(frame_id 등)의 고정 폭
+STRING_DTYPE = "U128"
+
+
+def _header(prefix: str = "header") -> List[Tuple[str, str]]:
+    return [
+        (f"{prefix}.stamp.sec", "i4"),
+        (f"{prefix}.stamp.nanosec", "u4"),
+        (f"{prefix}.frame_id", STRING_DTYPE),
+    ]
+
+
+def _vector3(prefix: str) -> List[Tuple[str, str]]:
+    return [(f"{prefix}.{axis}", "f8") for axis in ("x", "y", "z")]
+
+
+def _quaternion(prefix: str) -> List[Tuple[str, str]]:
+    return [(f"{prefix}.{axis}", "f8") for axis in ("x", "y", "z", "w")]
+
+
+def _covariance(name: str, size: int) -> List[Tuple[str, Any]]:
+    return [(name, ("f8", (size,)))]
+
+
+class FieldExtractor:
+    """고정 길이 메시지 타입의 필드를 정해진 컬럼 순서로 추출.
+
+    fields는 (attribute 경로, dtype) 목록이며, dtype이 (기본형, (N,)) 형태면
+    고정 길이 배열 필드로 보고 'name[0]' ... 'name[N-1]' 컬럼으로 펼칩니다.
+    """
+
+    def __init__(self, fields: Sequence[Tuple[str, Any]]):
+        self.fields = list(fields)
+        self._getter = attrgetter(*(name for name, _ in self.fields))
+        self._is_array = [isinstance(dtype, tuple) for _, dtype in self.fields]
+        self.dtype = np.dtype(
+            [("timestamp", "i8")]
+            + [(name, dtype[0], dtype[1]) if isinstance(dtype, tuple) else (name, dtype)
+               for name, dtype in self.fields]
+        )
+
+        self.columns: List[str] = []
+        for name, dtype in self.fields:
+            if isinstance(dtype, tuple):
+                self.columns.extend(f"{name}[{i}]" for i in range(dtype[1][0]))
+            else:
+                self.columns.append(name)
+
+    def raw(self, msg: Any) -> Tuple[Any, ...]:
+        """필드 값 튜플 (배열 필드는 펼치지 않은 상태)."""
+        return self._getter(msg)
+
+    def values(self, msg: Any) -> List[Any]:
+        """columns 순서의 값 리스트 (배열 필드는 원소별로 펼침)."""
+        raw = self._getter(msg)
+        out: List[Any] = []
+        for value, is_array in zip(raw, self._is_array):
+            if is_array:
+                out.extend(np.asarray(value).tolist())
+            else:
+                out.append(value)
+        return out
+
+    def flat(self, msg: Any) -> Dict[str, Any]:
+        """flatten_dict(message_to_ordereddict(msg))와 같은 결과."""
+        return dict(zip(self.columns, self.values(msg)))
+
+
+class TypedTable:
+    """FieldExtractor 하나에 대응하는 미리 할당된 구조화 배열 버퍼."""
+
+    def __init__(self, extractor: FieldExtractor, capacity: int = 0):
+        self.extractor = extractor
+        self.data = np.empty(max(capacity, 16), dtype=extractor.dtype)
+        self.size = 0
+
+    def append(self, timestamp: int, msg: Any) -> None:
+        if self.size == len(self.data):
+            # metadata의 message_count보다 많으면 두 배로 확장
+            grown = np.empty(2 * len(self.data), dtype=self.data.dtype)
+            grown[: self.size] = self.data
+            self.data = grown
+        self.data[self.size] = (timestamp,) + self.extractor.raw(msg)
+        self.size += 1
+
+    def to_columns(self) -> Dict[str, np.ndarray]:
+        """컬럼 이름 → 배열 (배열 필드는 원소별 컬럼 뷰로 펼침)."""
+        data = self.data[: self.size]
+        columns: Dict[str, np.ndarray] = {"timestamp": data["timestamp"]}
+        for name, dtype in self.extractor.fields:
+            if isinstance(dtype, tuple):
+                block = data[name]
+                for i in range(dtype[1][0]):
+                    columns[f"{name}[{i}]"] = block[:, i]
+            else:
+                columns[name] = data[name]
+        return columns
+
+
+# std_msgs/Header, geometry_msgs/PoseStamped (nav_msgs/Path의 poses 원소)
+HEADER_FIELDS = _header()
+POSE_STAMPED_FIELDS = (
+    _header() + _vector3("pose.position") + _quaternion("pose.orientation")
+)
+
+# 포즈 long 테이블의 기본 컬럼 (쿼터니언 대신 yaw 한 컬럼)
+POSE_COLUMNS = ["x", "y", "z", "yaw"]
+_POSE_ATTRS = [name for name, _ in _vector3("pose.position") + _quaternion("pose.orientation")]
+
+
+def quaternion_to_yaw(qx: Any, qy: Any, qz: Any, qw: Any) -> Any:
+    """쿼터니언 → yaw (rad). 배열을 넣으면 원소별로 계산."""
+    return np.arctan2(2.0 * (qw * qz + qx * qy), 1.0 - 2.0 * (qy * qy + qz * qz))
+
+
+class PoseSequenceExtractor:
+    """포즈 배열을 가진 메시지(nav_msgs/Path, teb_msgs/TrajectoryMsg) 추출기.
+
+    포즈 수만큼 'poses[i]....' 컬럼을 늘리는 대신, 메시지 헤더는 한 행
+    (header_columns)으로, 포즈는 (timestamp, msg_index, pose_index, x, y, z, yaw, ...)
+    long 테이블 행으로 분리합니다.
+    """
+
+    def __init__(self, sequence_field: str, extra_fields: Sequence[Tuple[str, str]] = ()):
+        self.sequence_field = sequence_field
+        self.extra_fields = list(extra_fields)
+        self._header_names = [name for name, _ in HEADER_FIELDS]
+        self._header_getter = attrgetter(*self._header_names)
+        self._sequence_getter = attrgetter(sequence_field)
+        self._pose_getter = attrgetter(*(_POSE_ATTRS + [attr for _, attr in self.extra_fields]))
+        self.header_columns = self._header_names + ["num_poses"]
+        self.pose_columns = POSE_COLUMNS + [name for name, _ in self.extra_fields]
+
+    def flat(self, msg: Any) -> Dict[str, Any]:
+        """헤더 + 포즈 수 (포즈 값은 pose_array로 따로 추출)."""
+        flat = dict(zip(self._header_names, self._header_getter(msg)))
+        flat["num_poses"] = len(self._sequence_getter(msg))
+        return flat
+
+    def pose_array(self, msg: Any) -> np.ndarray:
+        """포즈별 원시 값 (N, 7 + extra) 배열: position xyz, orientation xyzw, extra."""
+        getter = self._pose_getter
+        poses = self._sequence_getter(msg)
+        width = len(_POSE_ATTRS) + len(self.extra_fields)
+        if not poses:
+            return np.empty((0, width))
+        return np.array([getter(p) for p in poses], dtype=np.float64)
+
+    def pose_columns_from_array(self, raw: np.ndarray) -> Dict[str, np.ndarray]:
+        """pose_array 결과 → long 테이블 컬럼 (yaw는 한 번에 벡터 계산)."""
+        columns = {
+            "x": raw[:, 0],
+            "y": raw[:, 1],
+            "z": raw[:, 2],
+            "yaw": quaternion_to_yaw(raw[:, 3], raw[:, 4], raw[:, 5], raw[:, 6]),
+        }
+        for i, (name, _) in enumerate(self.extra_fields):
+            columns[name] = raw[:, 7 + i]
+        return columns
+
+
+FAST_EXTRACTORS: Dict[str, Any] = {
+    "nav_msgs/msg/Odometry": FieldExtractor(
+        _header()
+        + [("child_frame_id", STRING_DTYPE)]
+        + _vector3("pose.pose.position")
+        + _quaternion("pose.pose.orientation")
+        + _covariance("pose.covariance", 36)
+        + _vector3("twist.twist.linear")
+        + _vector3("twist.twist.angular")
+        + _covariance("twist.covariance", 36)
+    ),
+    "geometry_msgs/msg/Twist": FieldExtractor(
+        _vector3("linear") + _vector3("angular")
+    ),
+    "sensor_msgs/msg/Imu": FieldExtractor(
+        _header()
+        + _quaternion("orientation")
+        + _covariance("orientation_covariance", 9)
+        + _vector3("angular_velocity")
+        + _covariance("angular_velocity_covariance", 9)
+        + _vector3("linear_acceleration")
+        + _covariance("linear_acceleration_covariance", 9)
+    ),
+    "geometry_msgs/msg/PoseWithCovarianceStamped": FieldExtractor(
+        _header()
+        + _vector3("pose.pose.position")
+        + _quaternion("pose.pose.orientation")
+        + _covariance("pose.covariance", 36)
+    ),
+    "nav_msgs/msg/Path": PoseSequenceExtractor("poses"),
+    "teb_msgs/msg/TrajectoryMsg": PoseSequenceExtractor(
+        "trajectory",
+        extra_fields=[
+            ("vx", "velocity.linear.x"),
+            ("vy", "velocity.linear.y"),
+            ("omega", "velocity.angular.z"),
+            ("time_from_start.sec", "time_from_start.sec"),
+            ("time_from_start.nanosec", "time_from_start.nanosec"),
+        ],
+    ),
+}
+
+
+def get_extractor(msg_type_str: str) -> Optional[Any]:
+    """타입 문자열(예: 'nav_msgs/msg/Odometry')에 등록된 추출기, 없으면 None."""
+    return FAST_EXTRACTORS.get(msg_type_str)
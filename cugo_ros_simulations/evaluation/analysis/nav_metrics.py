@@ -0,0 +1,462 @@
+#!/usr/bin/env python3
+"""
+주행 메트릭 계산 (NumPy 벡터 연산)
+
+bag_to_csv.py가 저장한 토픽 테이블(/odom, /cmd_vel, /amcl_pose, /plan)에서
+평가 메트릭을 계산합니다. 행 단위 루프 없이 배열 전체에 대한 유한 차분
+(np.gradient, np.diff)과 누적 합으로 계산하므로 ROS 2 없이 수천 개의
+trial도 몇 초 안에 처리할 수 있습니다.
+
+- 안정성: angular_vel_std, angular_accel_rms, cmd_angular_vel_std,
+  cmd_angular_change_rms, linear_accel_max, jerk_rms, jerk_max, harsh_accel_count
+- 효율성: total_time, total_distance, average_speed, curvature_mean, curvature_max
+- 정밀도: goal_error, goal_yaw_error, path_deviation_mean / rms / max
+
+거리, 속도, 곡률은 연속적인 /odom 값으로, 목표 오차와 경로 추종 오차는
+/amcl_pose 보정을 적용한 map 좌표로 계산합니다. 경로 추종 오차는
+tracking_error.py의 경로 버전별 선분 격자 인덱스로 조회합니다.
+
+사용 예:
+    python3 nav_metrics.py --table-dirs '../rosbags/*/*/csv' --output metrics.csv
+
+    from nav_metrics import compute_trial_metrics
+    metrics = compute_trial_metrics("../rosbags/teb/stage123_xxx/parquet")
+"""
+
+import argparse
+import csv
+import glob
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# table_io.py / fast_decoders.py를 같은 디렉토리에서 import하기 위한 경로 설정
+script_dir = os.path.dirname(os.path.abspath(__file__))
+if script_dir not in sys.path:
+    sys.path.insert(0, script_dir)
+
+from fast_decoders import quaternion_to_yaw
+from table_io import FORMATS, pose_table_name, read_topic_table
+from tracking_error import tracking_error
+
+
+ODOM_TOPIC = "/odom"
+CMD_VEL_TOPIC = "/cmd_vel"
+AMCL_TOPIC = "/amcl_pose"
+# 전역 경로 토픽 (MPPI bag은 /plan, TEB bag은 /global_plan)
+PLAN_TOPICS = ("/plan", "/global_plan")
+# bag 경로에서 플래너를 나타내는 디렉토리 이름 (evaluation/rosbags/<planner>/...)
+PLANNER_DIRS = ("teb", "mppi")
+
+_POSE_COLUMNS = [
+    "pose.pose.position.x",
+    "pose.pose.position.y",
+    "pose.pose.orientation.x",
+    "pose.pose.orientation.y",
+    "pose.pose.orientation.z",
+    "pose.pose.orientation.w",
+]
+ODOM_COLUMNS = ["timestamp"] + _POSE_COLUMNS + ["twist.twist.linear.x", "twist.twist.angular.z"]
+AMCL_COLUMNS = ["timestamp"] + _POSE_COLUMNS
+CMD_VEL_COLUMNS = ["timestamp", "linear.x", "angular.z"]
+PLAN_POSE_COLUMNS = ["timestamp", "msg_index", "x", "y", "yaw"]
+
+# 주행 중으로 보는 최소 속도 (m/s)
+MOVING_SPEED = 0.02
+# 곡률 |wz| / |v|를 계산하는 최소 속도 (m/s)
+# 저속 전진 중 제자리 회전(예: 2 cm/s, 0.5 rad/s → 25 1/m)은 곡률이 수백까지 튀어
+# curvature_max/mean을 지배하므로, 주행 판정(MOVING_SPEED)보다 높은 속도에서만 계산
+CURVATURE_SPEED = 0.1
+# 급가속/급제동 기준 (acc_lim_x = ax_max = 0.8 m/s²)
+HARSH_ACCEL = 0.8
+
+Table = Dict[str, np.ndarray]
+
+
+def to_seconds(timestamps: np.ndarray, origin: Optional[int] = None) -> np.ndarray:
+    """int64 ns timestamp → origin(기본: 첫 값) 기준 초 (float64)."""
+    timestamps = np.asarray(timestamps, dtype=np.int64)
+    if origin is None:
+        origin = int(timestamps[0]) if len(timestamps) else 0
+    return (timestamps - origin) * 1e-9
+
+
+def wrap_angle(angle: np.ndarray) -> np.ndarray:
+    """각도를 [-pi, pi) 범위로."""
+    return (angle + np.pi) % (2.0 * np.pi) - np.pi
+
+
+def derivative(values: np.ndarray, t: np.ndarray) -> np.ndarray:
+    """불균일 샘플 시각 t에 대한 중앙 차분 (같은 시각의 중복 샘플은 호출 전에 제거)."""
+    if len(values) < 2:
+        return np.zeros(len(values))
+    return np.gradient(values, t)
+
+
+def rms(values: np.ndarray) -> float:
+    return float(np.sqrt(np.mean(np.square(values)))) if len(values) else float("nan")
+
+
+def _std(values: np.ndarray) -> float:
+    return float(np.std(values)) if len(values) else float("nan")
+
+
+def _max_abs(values: np.ndarray) -> float:
+    return float(np.max(np.abs(values))) if len(values) else float("nan")
+
+
+def _unique_times(table: Table) -> Table:
+    """timestamp가 이전 행과 같은 행 제거 (차분 분모 0 방지)."""
+    t = table["timestamp"]
+    if len(t) < 2:
+        return table
+    keep = np.concatenate(([True], np.diff(t) > 0))
+    if keep.all():
+        return table
+    return {name: values[keep] for name, values in table.items()}
+
+
+def _yaw(table: Table) -> np.ndarray:
+    return quaternion_to_yaw(
+        table["pose.pose.orientation.x"],
+        table["pose.pose.orientation.y"],
+        table["pose.pose.orientation.z"],
+        table["pose.pose.orientation.w"],
+    )
+
+
+def count_events(mask: np.ndarray) -> int:
+    """연속된 True 구간의 개수 (예: 급가속 구간 수)."""
+    if not len(mask):
+        return 0
+    m = mask.astype(np.int8)
+    return int(m[0] + np.count_nonzero(np.diff(m) == 1))
+
+
+def smoothness_metrics(odom: Table, cmd_vel: Optional[Table]) -> Dict[str, float]:
+    """안정성 메트릭: 각속도/각가속도, 선가속도/저크, 명령 각속도 변화량."""
+    t = to_seconds(odom["timestamp"])
+    v = odom["twist.twist.linear.x"]
+    wz = odom["twist.twist.angular.z"]
+
+    accel = derivative(v, t)
+    jerk = derivative(accel, t)
+    angular_accel = derivative(wz, t)
+
+    metrics = {
+        "angular_vel_std": _std(wz),
+        "angular_accel_rms": rms(angular_accel),
+        "linear_accel_max": _max_abs(accel),
+        "jerk_rms": rms(jerk),
+        "jerk_max": _max_abs(jerk),
+        "harsh_accel_count": float(count_events(np.abs(accel) > HARSH_ACCEL)),
+        "cmd_angular_vel_std": float("nan"),
+        "cmd_angular_change_rms": float("nan"),
+    }
+    if cmd_vel is not None and len(cmd_vel["timestamp"]):
+        cmd_wz = cmd_vel["angular.z"]
+        metrics["cmd_angular_vel_std"] = _std(cmd_wz)
+        metrics["cmd_angular_change_rms"] = rms(np.diff(cmd_wz))
+    return metrics
+
+
+def efficiency_metrics(odom: Table) -> Dict[str, float]:
+    """효율성 메트릭: 주행 시간/거리/평균 속도와 주행 경로 곡률.
+
+    주행 시간은 처음과 마지막으로 |v| > MOVING_SPEED 였던 시각 사이의 간격,
+    곡률은 차동 구동 기구학 관계 |ω| / |v| (|v| > CURVATURE_SPEED인 샘플만) 입니다.
+    """
+    t = to_seconds(odom["timestamp"])
+    x = odom["pose.pose.position.x"]
+    y = odom["pose.pose.position.y"]
+    v = odom["twist.twist.linear.x"]
+    wz = odom["twist.twist.angular.z"]
+
+    step = np.hypot(np.diff(x), np.diff(y))
+    travelled = np.concatenate(([0.0], np.cumsum(step)))
+
+    moving = np.abs(v) > MOVING_SPEED
+    if not moving.any():
+        return {
+            "total_time": 0.0,
+            "total_distance": float(travelled[-1]) if len(travelled) else 0.0,
+            "average_speed": float("nan"),
+            "curvature_mean": float("nan"),
+            "curvature_max": float("nan"),
+        }
+
+    first, last = np.flatnonzero(moving)[[0, -1]]
+    total_time = float(t[last] - t[first])
+    total_distance = float(travelled[last] - travelled[first])
+    turning = np.abs(v) > CURVATURE_SPEED
+    curvature = np.abs(wz[turning]) / np.abs(v[turning])
+    return {
+        "total_time": total_time,
+        "total_distance": total_distance,
+        "average_speed": total_distance / total_time if total_time > 0 else float("nan"),
+        "curvature_mean": float(np.mean(curvature)) if len(curvature) else float("nan"),
+        "curvature_max": float(np.max(curvature)) if len(curvature) else float("nan"),
+    }
+
+
+def odom_in_map(odom: Table, amcl: Optional[Table]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """/odom 포즈를 /amcl_pose 보정(map ← odom)으로 map 좌표 (x, y, yaw)로 변환.
+
+    각 amcl 샘플 시각의 odom 포즈와 비교해 보정 변환을 구하고, 그 다음 amcl
+    샘플이 올 때까지 유지합니다 (첫 amcl 이전 구간은 첫 보정 사용).
+    """
+    x = odom["pose.pose.position.x"]
+    y = odom["pose.pose.position.y"]
+    yaw = _yaw(odom)
+    if amcl is None or not len(amcl["timestamp"]):
+        return x, y, yaw
+
+    odom_t = odom["timestamp"]
+    amcl_t = amcl["timestamp"]
+    i = np.clip(np.searchsorted(odom_t, amcl_t, side="right") - 1, 0, len(odom_t) - 1)
+
+    dyaw = wrap_angle(_yaw(amcl) - yaw[i])
+    c, s = np.cos(dyaw), np.sin(dyaw)
+    tx = amcl["pose.pose.position.x"] - (c * x[i] - s * y[i])
+    ty = amcl["pose.pose.position.y"] - (s * x[i] + c * y[i])
+
+    j = np.clip(np.searchsorted(amcl_t, odom_t, side="right") - 1, 0, len(amcl_t) - 1)
+    cj, sj = c[j], s[j]
+    return cj * x - sj * y + tx[j], sj * x + cj * y + ty[j], wrap_angle(yaw + dyaw[j])
+
+
+def precision_metrics(
+    odom: Table,
+    amcl: Optional[Table],
+    plan: Optional[Table],
+    goal: Optional[Sequence[float]] = None,
+) -> Dict[str, float]:
+    """정밀도 메트릭: 목표 위치/방향 오차와 경로 추종 오차.
+
+    goal (x, y[, yaw])을 주지 않으면 마지막으로 발행된 경로의 끝 포즈를 목표로 봅니다.
+    도착 포즈는 마지막 /amcl_pose (없으면 map 변환한 마지막 /odom) 입니다.
+    """
+    mx, my, myaw = odom_in_map(odom, amcl)
+    metrics = {
+        "goal_error": float("nan"),
+        "goal_yaw_error": float("nan"),
+        "path_deviation_mean": float("nan"),
+        "path_deviation_rms": float("nan"),
+        "path_deviation_max": float("nan"),
+    }
+
+    if goal is None and plan is not None and len(plan["timestamp"]):
+        goal = (plan["x"][-1], plan["y"][-1], plan["yaw"][-1])
+    if goal is not None:
+        if amcl is not None and len(amcl["timestamp"]):
+            final = (
+                amcl["pose.pose.position.x"][-1],
+                amcl["pose.pose.position.y"][-1],
+                _yaw(amcl)[-1],
+            )
+        else:
+            final = (mx[-1], my[-1], myaw[-1])
+        metrics["goal_error"] = float(np.hypot(final[0] - goal[0], final[1] - goal[1]))
+        if len(goal) > 2:
+            metrics["goal_yaw_error"] = float(abs(wrap_angle(final[2] - goal[2])))
+
+    if plan is not None:
+        error = tracking_error(odom["timestamp"], mx, my, plan)
+        error = error[~np.isnan(error)]
+        if len(error):
+            metrics["path_deviation_mean"] = float(np.mean(error))
+            metrics["path_deviation_rms"] = rms(error)
+            metrics["path_deviation_max"] = float(np.max(error))
+    return metrics
+
+
+def compute_metrics(
+    tables: Dict[str, Table],
+    goal: Optional[Sequence[float]] = None,
+) -> Dict[str, float]:
+    """토픽 이름 → 테이블 딕셔너리에서 전체 메트릭 계산 (/odom 필수).
+
+    tables의 경로 항목은 포즈 long 테이블 이름(예: '/plan/poses')을 키로 씁니다.
+    """
+    if ODOM_TOPIC not in tables or not len(tables[ODOM_TOPIC]["timestamp"]):
+        raise ValueError(f"{ODOM_TOPIC} 테이블이 없거나 비어 있습니다.")
+
+    odom = _unique_times(tables[ODOM_TOPIC])
+    cmd_vel = tables.get(CMD_VEL_TOPIC)
+    amcl = tables.get(AMCL_TOPIC)
+    plan = next(
+        (tables[pose_table_name(name)] for name in PLAN_TOPICS if pose_table_name(name) in tables),
+        None,
+    )
+
+    metrics: Dict[str, float] = {}
+    metrics.update(efficiency_metrics(odom))
+    metrics.update(smoothness_metrics(odom, cmd_vel))
+    metrics.update(precision_metrics(odom, amcl, plan, goal))
+    return metrics
+
+
+def load_trial_tables(table_dir: Path) -> Dict[str, Table]:
+    """bag_to_csv.py 출력 디렉토리에서 메트릭 계산에 필요한 컬럼만 로드."""
+    table_dir = Path(table_dir)
+    wanted = [
+        (ODOM_TOPIC, ODOM_COLUMNS),
+        (CMD_VEL_TOPIC, CMD_VEL_COLUMNS),
+        (AMCL_TOPIC, AMCL_COLUMNS),
+    ] + [(pose_table_name(name), PLAN_POSE_COLUMNS) for name in PLAN_TOPICS]
+
+    tables: Dict[str, Table] = {}
+    for name, columns in wanted:
+        try:
+            table = read_topic_table(table_dir, name, columns=columns)
+        except (FileNotFoundError, KeyError, ValueError):
+            # 토픽을 변환하지 않았거나 필요한 컬럼이 없는 테이블
+            continue
+        if all(c in table for c in columns):
+            tables[name] = table
+    return tables
+
+
+def _bag_dir(table_dir: Path) -> Path:
+    table_dir = Path(table_dir).resolve()
+    return table_dir.parent if table_dir.name in FORMATS else table_dir
+
+
+def planner_from_path(table_dir: Path) -> Optional[str]:
+    """경로를 거슬러 올라가며 찾은 플래너 디렉토리 이름 (teb / mppi), 없으면 None.
+
+    중첩 레이아웃(<planner>/<scenario>_parallel_<ts>/instance_k/<bag>)도 처리합니다.
+    """
+    for parent in _bag_dir(table_dir).parents:
+        if parent.name in PLANNER_DIRS:
+            return parent.name
+    return None
+
+
+def trial_label(table_dir: Path) -> str:
+    """출력 디렉토리 → trial 이름.
+
+    플래너 디렉토리부터의 상대 경로를 사용합니다 (예: '.../teb/stage123_x/csv' →
+    'teb/stage123_x', '.../teb/s_parallel_ts/instance_0/s_x/npz' →
+    'teb/s_parallel_ts/instance_0/s_x'). 플래너 디렉토리가 없으면 '<상위>/<bag>'.
+    """
+    bag_dir = _bag_dir(table_dir)
+    for parent in bag_dir.parents:
+        if parent.name in PLANNER_DIRS:
+            return str(bag_dir.relative_to(parent.parent))
+    return f"{bag_dir.parent.name}/{bag_dir.name}"
+
+
+def compute_trial_metrics(
+    table_dir: Path,
+    goal: Optional[Sequence[float]] = None,
+) -> Dict[str, float]:
+    return compute_metrics(load_trial_tables(Path(table_dir)), goal)
+
+
+def expand_dirs(patterns: Iterable[str]) -> List[Path]:
+    """디렉토리 또는 glob 패턴 목록 → 중복 없는 디렉토리 목록."""
+    dirs: Dict[Path, None] = {}
+    for pattern in patterns:
+        pattern = os.path.expanduser(pattern)
+        matches = [pattern] if Path(pattern).is_dir() else sorted(glob.glob(pattern))
+        for match in matches:
+            if Path(match).is_dir():
+                dirs.setdefault(Path(match).resolve(), None)
+    return list(dirs)
+
+
+def compute_metrics_for_dirs(
+    table_dirs: Iterable[Path],
+    goal: Optional[Sequence[float]] = None,
+) -> List[Dict[str, Any]]:
+    """여러 trial의 메트릭 행 목록 (실패한 trial은 error 항목만 채움)."""
+    rows: List[Dict[str, Any]] = []
+    for table_dir in table_dirs:
+        row: Dict[str, Any] = {"trial": trial_label(table_dir), "path": str(table_dir)}
+        try:
+            row.update(compute_trial_metrics(table_dir, goal))
+        except (ValueError, KeyError, OSError) as e:
+            row["error"] = f"{type(e).__name__}: {e}"
+        rows.append(row)
+    return rows
+
+
+def write_rows(rows: List[Dict[str, Any]], path: Path) -> None:
+    """메트릭 행을 .json 또는 .csv로 저장."""
+    if path.suffix == ".json":
+        with path.open("w") as f:
+            json.dump(rows, f, indent=2, ensure_ascii=False)
+        return
+
+    fieldnames: List[str] = []
+    for row in rows:
+        fieldnames.extend(k for k in row if k not in fieldnames)
+    with path.open("w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="bag_to_csv.py 출력 테이블에서 주행 메트릭 계산",
+    )
+    parser.add_argument(
+        "--table-dirs",
+        nargs="+",
+        required=True,
+        help="bag_to_csv.py 출력 디렉토리 또는 glob 패턴 (예: '../rosbags/*/*/csv')",
+    )
+    parser.add_argument(
+        "--goal",
+        nargs="+",
+        type=float,
+        default=None,
+        metavar="X Y [YAW]",
+        help="목표 포즈 (미지정 시 마지막 전역 경로의 끝 포즈)",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        help="결과 저장 경로 (.csv 또는 .json, 미지정 시 화면 출력만)",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    if args.goal is not None and len(args.goal) not in (2, 3):
+        raise ValueError("--goal은 X Y 또는 X Y YAW 형식이어야 합니다.")
+
+    table_dirs = expand_dirs(args.table_dirs)
+    if not table_dirs:
+        raise FileNotFoundError(f"테이블 디렉토리를 찾지 못했습니다: {args.table_dirs}")
+
+    rows = compute_metrics_for_dirs(table_dirs, args.goal)
+    for row in rows:
+        if "error" in row:
+            print(f"[ERROR] {row['trial']}: {row['error']}")
+            continue
+        print(
+            f"[INFO] {row['trial']}: time {row['total_time']:.1f}s, "
+            f"distance {row['total_distance']:.2f}m, "
+            f"angular_vel_std {row['angular_vel_std']:.3f}, jerk_rms {row['jerk_rms']:.3f}, "
+            f"goal_error {row['goal_error']:.3f}m, path_deviation {row['path_deviation_mean']:.3f}m"
+        )
+
+    if args.output:
+        output = Path(os.path.expanduser(args.output))
+        write_rows(rows, output)
+        print(f"[INFO] Metrics written to {output}")
+
+    return 1 if any("error" in row for row in rows) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
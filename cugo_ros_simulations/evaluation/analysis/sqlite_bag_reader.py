@@ -0,0 +1,591 @@
+#!/usr/bin/env python3
+"""
+ROS 2 없이 rosbag2(sqlite3) 파일을 직접 읽는 리더
+
+rosbag2_py.SequentialReader는 ROS 2 환경이 필요하고 메시지를 하나씩 읽습니다.
+이 모듈은 .db3의 messages 테이블을 topic_id와 timestamp 범위 조건으로
+한 번에 조회하고, 알려진 메시지 타입(fast_decoders.py에 등록된 타입)의
+CDR 페이로드를 numpy.frombuffer로 일괄 디코딩합니다.
+
+- 같은 길이/같은 frame_id 길이를 가진 메시지는 필드 오프셋이 같으므로
+  한 그룹으로 묶어 구조화 dtype 한 번으로 모든 필드를 읽습니다.
+- nav_msgs/Path는 메시지별 헤더 테이블(header, msg_index, num_poses)과
+  (timestamp, msg_index, pose_index, x, y, z, yaw) long 테이블 두 개로 반환합니다.
+- 컬럼 이름은 bag_to_csv.py(flatten_dict) 출력과 같습니다.
+
+사용 예:
+    python3 sqlite_bag_reader.py \\
+        --bag-path ../rosbags/teb/stage123_20251202_230735 \\
+        --output-dir ../rosbags/teb/stage123_20251202_230735/npz --format npz \\
+        --start 10 --end 25   # bag 시작 후 10~25초 구간만
+
+    from sqlite_bag_reader import SqliteBagReader
+    with SqliteBagReader(bag_dir) as bag:
+        odom = bag.read_topic("/odom", start_ns=t0, end_ns=t1)
+        plan, plan_poses = bag.read_path("/local_plan")
+"""
+
+import argparse
+import glob
+import os
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import yaml
+
+# fast_decoders.py / table_io.py를 같은 디렉토리에서 import하기 위한 경로 설정
+script_dir = os.path.dirname(os.path.abspath(__file__))
+if script_dir not in sys.path:
+    sys.path.insert(0, script_dir)
+
+from fast_decoders import (
+    FAST_EXTRACTORS, HEADER_FIELDS, POSE_STAMPED_FIELDS, STRING_DTYPE, FieldExtractor,
+    quaternion_to_yaw,
+)
+from table_io import FORMATS, pose_table_name, write_topic_table
+
+
+# CDR 캡슐레이션 헤더 (4바이트): 0x00 0x01 = CDR little endian
+CDR_HEADER_SIZE = 4
+CDR_LE = 0x01
+
+PATH_TYPE = "nav_msgs/msg/Path"
+
+# --start/--end: 이 값 이상이면 절대 시각(ns), 미만이면 bag 시작 기준 상대 초
+ABSOLUTE_NS_THRESHOLD = 10 ** 12
+
+
+def _align(pos: int, size: int) -> int:
+    """CDR 정렬: 캡슐레이션 헤더 뒤부터 size 배수 위치로 맞춤."""
+    rel = pos - CDR_HEADER_SIZE
+    return CDR_HEADER_SIZE + (rel + size - 1) // size * size
+
+
+def _read_u32(blob: bytes, pos: int) -> int:
+    return int.from_bytes(blob[pos:pos + 4], "little")
+
+
+def cdr_layout(
+    fields: Sequence[Tuple[str, Any]],
+    blob: bytes,
+    pos: int = CDR_HEADER_SIZE,
+) -> Tuple[List[Tuple[str, int, Any]], List[Tuple[str, int, int]], int]:
+    """샘플 메시지 하나를 따라가며 필드 오프셋을 계산.
+
+    Returns:
+        (숫자 필드 [(이름, 오프셋, dtype)], 문자열 필드 [(이름, 오프셋, 길이)], 끝 위치)
+    """
+    numeric: List[Tuple[str, int, Any]] = []
+    strings: List[Tuple[str, int, int]] = []
+    for name, dtype in fields:
+        if dtype == STRING_DTYPE:
+            pos = _align(pos, 4)
+            n = _read_u32(blob, pos)
+            # 길이에는 종료 NUL 문자가 포함됨
+            strings.append((name, pos + 4, max(n - 1, 0)))
+            pos += 4 + n
+        elif isinstance(dtype, tuple):
+            base = np.dtype(dtype[0]).newbyteorder("<")
+            pos = _align(pos, base.itemsize)
+            numeric.append((name, pos, (base, dtype[1])))
+            pos += base.itemsize * dtype[1][0]
+        else:
+            base = np.dtype(dtype).newbyteorder("<")
+            pos = _align(pos, base.itemsize)
+            numeric.append((name, pos, base))
+            pos += base.itemsize
+    return numeric, strings, pos
+
+
+def _first_string_offset(fields: Sequence[Tuple[str, Any]]) -> Optional[int]:
+    """첫 문자열 필드의 길이 prefix 위치 (그 앞은 모두 고정 길이라고 가정)."""
+    pos = CDR_HEADER_SIZE
+    for _, dtype in fields:
+        if dtype == STRING_DTYPE:
+            return _align(pos, 4)
+        if isinstance(dtype, tuple):
+            size = np.dtype(dtype[0]).itemsize
+            pos = _align(pos, size) + size * dtype[1][0]
+        else:
+            size = np.dtype(dtype).itemsize
+            pos = _align(pos, size) + size
+    return None
+
+
+def _record_dtype(numeric: List[Tuple[str, int, Any]], itemsize: int, base: int = 0) -> np.dtype:
+    return np.dtype({
+        "names": [name for name, _, _ in numeric],
+        "formats": [fmt for _, _, fmt in numeric],
+        "offsets": [offset - base for _, offset, _ in numeric],
+        "itemsize": itemsize,
+    })
+
+
+def _check_encoding(blob: bytes) -> None:
+    if len(blob) < CDR_HEADER_SIZE or blob[1] != CDR_LE:
+        raise RuntimeError("little endian CDR 페이로드만 지원합니다.")
+
+
+def decode_fixed(
+    extractor: FieldExtractor,
+    timestamps: np.ndarray,
+    blobs: Sequence[bytes],
+) -> Dict[str, np.ndarray]:
+    """고정 필드 타입 메시지들을 컬럼 배열로 일괄 디코딩.
+
+    (전체 길이, 첫 문자열 길이)가 같은 메시지는 숫자 필드 오프셋이 모두 같으므로
+    그룹마다 frombuffer 한 번으로 읽습니다. 두 번째 문자열(Odometry의
+    child_frame_id)의 길이가 달라도 뒤따르는 double 필드는 8바이트 정렬되고
+    전체 길이가 같으므로 오프셋이 같습니다.
+    """
+    fields = extractor.fields
+    n = len(blobs)
+    str_offset = _first_string_offset(fields)
+
+    groups: Dict[Tuple[int, bytes], List[int]] = {}
+    for i, blob in enumerate(blobs):
+        key = (len(blob), blob[str_offset:str_offset + 4] if str_offset is not None else b"")
+        groups.setdefault(key, []).append(i)
+
+    columns: Dict[str, np.ndarray] = {"timestamp": np.asarray(timestamps, dtype=np.int64)}
+    for name, dtype in fields:
+        if dtype == STRING_DTYPE:
+            columns[name] = np.empty(n, dtype=STRING_DTYPE)
+        elif isinstance(dtype, tuple):
+            columns[name] = np.empty((n,) + dtype[1], dtype=dtype[0])
+        else:
+            columns[name] = np.empty(n, dtype=dtype)
+
+    for (length, _), indices in groups.items():
+        idx = np.asarray(indices)
+        sample = blobs[indices[0]]
+        _check_encoding(sample)
+        numeric, strings, _ = cdr_layout(fields, sample)
+
+        buf = b"".join(blobs[i] for i in indices)
+        records = np.frombuffer(buf, dtype=_record_dtype(numeric, length))
+        for name, _, _ in numeric:
+            columns[name][idx] = records[name]
+
+        raw = np.frombuffer(buf, dtype=np.uint8).reshape(len(indices), length)
+        for name, offset, size in strings:
+            # 길이 prefix까지 포함해서 비교: 모두 같으면 한 번만 디코딩
+            region = raw[:, offset - 4:offset + size]
+            if (region == region[0]).all():
+                columns[name][idx] = sample[offset:offset + size].decode()
+            else:
+                for i in indices:
+                    _, per_msg, _ = cdr_layout(fields, blobs[i])
+                    for s_name, s_off, s_size in per_msg:
+                        if s_name == name:
+                            columns[name][i] = blobs[i][s_off:s_off + s_size].decode()
+
+    # 고정 길이 배열 필드는 'name[i]' 컬럼으로 펼침 (bag_to_csv 출력과 동일)
+    result: Dict[str, np.ndarray] = {"timestamp": columns["timestamp"]}
+    for name, dtype in fields:
+        if isinstance(dtype, tuple):
+            for i in range(dtype[1][0]):
+                result[f"{name}[{i}]"] = columns[name][:, i]
+        else:
+            result[name] = columns[name]
+    return result
+
+
+def decode_path(
+    timestamps: np.ndarray,
+    blobs: Sequence[bytes],
+) -> Tuple[Dict[str, np.ndarray], Dict[str, np.ndarray]]:
+    """nav_msgs/Path 메시지들을 (헤더 테이블, 포즈 long 테이블)로 디코딩.
+
+    한 메시지 안의 PoseStamped는 frame_id 길이가 같으면 간격(stride)이 일정하므로
+    frombuffer 한 번으로 모든 포즈를 읽고, 그렇지 않으면 포즈별로 따라갑니다.
+    두 테이블은 bag_to_csv.py 출력과 같습니다:
+    - '<topic>': timestamp, header.*, msg_index, num_poses (메시지당 한 행, 빈 경로 포함)
+    - '<topic>_poses': timestamp, msg_index, pose_index, x, y, z, yaw
+    """
+    header_fields = HEADER_FIELDS
+    pose_fields = [
+        (name, dtype) for name, dtype in POSE_STAMPED_FIELDS
+        if not name.startswith("header.")
+    ]
+    pose_names = [name for name, _ in pose_fields]
+
+    ts_parts: List[np.ndarray] = []
+    msg_parts: List[np.ndarray] = []
+    idx_parts: List[np.ndarray] = []
+    value_parts: Dict[str, List[np.ndarray]] = {name: [] for name in pose_names}
+
+    n = len(blobs)
+    header: Dict[str, np.ndarray] = {"timestamp": np.asarray(timestamps, dtype=np.int64)}
+    for name, dtype in header_fields:
+        header[name] = np.empty(n, dtype=dtype)
+    num_poses = np.zeros(n, dtype=np.int64)
+
+    for m, blob in enumerate(blobs):
+        _check_encoding(blob)
+        numeric, strings, pos = cdr_layout(header_fields, blob)
+        for name, offset, fmt in numeric:
+            header[name][m] = np.frombuffer(blob, dtype=fmt, count=1, offset=offset)[0]
+        for name, offset, size in strings:
+            header[name][m] = blob[offset:offset + size].decode()
+        pos = _align(pos, 4)
+        count = _read_u32(blob, pos)
+        num_poses[m] = count
+        pos += 4
+        if count == 0:
+            continue
+
+        numeric, _, end = cdr_layout(POSE_STAMPED_FIELDS, blob, pos)
+        stride = end - pos
+        numeric = [f for f in numeric if not f[0].startswith("header.")]
+
+        if stride % 8 == 0 and pos + count * stride == len(blob):
+            records = np.frombuffer(
+                blob, dtype=_record_dtype(numeric, stride, base=pos),
+                count=count, offset=pos,
+            )
+            for name in pose_names:
+                value_parts[name].append(records[name].astype(np.float64))
+        else:
+            values = {name: np.empty(count) for name in pose_names}
+            for k in range(count):
+                numeric_k, _, pos = cdr_layout(POSE_STAMPED_FIELDS, blob, pos)
+                for name, offset, fmt in numeric_k:
+                    if name in values:
+                        values[name][k] = np.frombuffer(blob, dtype=fmt, count=1, offset=offset)[0]
+            for name in pose_names:
+                value_parts[name].append(values[name])
+
+        ts_parts.append(np.full(count, timestamps[m], dtype=np.int64))
+        msg_parts.append(np.full(count, m, dtype=np.int64))
+        idx_parts.append(np.arange(count, dtype=np.int64))
+
+    def _cat(parts: List[np.ndarray], dtype: Any) -> np.ndarray:
+        return np.concatenate(parts) if parts else np.empty(0, dtype=dtype)
+
+    header["msg_index"] = np.arange(n, dtype=np.int64)
+    header["num_poses"] = num_poses
+
+    values = {name: _cat(value_parts[name], np.float64) for name in pose_names}
+    return header, {
+        "timestamp": _cat(ts_parts, np.int64),
+        "msg_index": _cat(msg_parts, np.int64),
+        "pose_index": _cat(idx_parts, np.int64),
+        "x": values["pose.position.x"],
+        "y": values["pose.position.y"],
+        "z": values["pose.position.z"],
+        "yaw": quaternion_to_yaw(
+            values["pose.orientation.x"], values["pose.orientation.y"],
+            values["pose.orientation.z"], values["pose.orientation.w"],
+        ),
+    }
+
+
+def discover_bags(root_or_glob: str) -> List[Path]:
+    """디렉토리(하위 전체) 또는 glob 패턴에서 metadata.yaml이 있는 bag 디렉토리를 찾음.
+
+    예: 'evaluation/rosbags', 'evaluation/rosbags/teb/*', 'rosbags/*/stage123_*'
+    """
+    pattern = os.path.expanduser(root_or_glob)
+    roots = [Path(pattern)] if Path(pattern).exists() else [
+        Path(p) for p in sorted(glob.glob(pattern, recursive=True))
+    ]
+
+    bags: Dict[Path, None] = {}
+    for root in roots:
+        if root.is_file():
+            root = root.parent
+        if (root / "metadata.yaml").exists():
+            bags.setdefault(root.resolve(), None)
+            continue
+        for meta in sorted(root.rglob("metadata.yaml")):
+            bags.setdefault(meta.parent.resolve(), None)
+    return list(bags)
+
+
+def bag_start_ns(bag_path: Path) -> Optional[int]:
+    """metadata.yaml의 bag 시작 시각 (ns), 없으면 None."""
+    bag_path = Path(os.path.expanduser(str(bag_path)))
+    meta_path = (bag_path if bag_path.is_dir() else bag_path.parent) / "metadata.yaml"
+    if not meta_path.exists():
+        return None
+    with meta_path.open("r") as f:
+        info = (yaml.safe_load(f) or {}).get("rosbag2_bagfile_information", {})
+    start = info.get("starting_time", {}).get("nanoseconds_since_epoch")
+    return int(start) if start is not None else None
+
+
+def bag_compression(bag_path: Path) -> str:
+    """metadata.yaml의 compression_format (압축하지 않은 bag이면 빈 문자열)."""
+    bag_path = Path(os.path.expanduser(str(bag_path)))
+    meta_path = (bag_path if bag_path.is_dir() else bag_path.parent) / "metadata.yaml"
+    if not meta_path.exists():
+        return ""
+    with meta_path.open("r") as f:
+        info = (yaml.safe_load(f) or {}).get("rosbag2_bagfile_information", {})
+    return info.get("compression_format") or ""
+
+
+def resolve_time_bound(value: Optional[str], start_ns: Optional[int]) -> Optional[int]:
+    """--start/--end 값 → 절대 시각 (ns).
+
+    ABSOLUTE_NS_THRESHOLD 이상의 정수는 절대 시각(ns)으로, 그 외 값은
+    bag 시작 시각 기준 상대 초로 해석합니다 (예: '12.5', '1764684455370781164').
+    """
+    if value is None:
+        return None
+    text = str(value).strip()
+    if text.lstrip("-").isdigit() and abs(int(text)) >= ABSOLUTE_NS_THRESHOLD:
+        return int(text)
+    try:
+        seconds = float(text)
+    except ValueError as e:
+        raise ValueError(f"시각은 상대 초 또는 절대 ns여야 합니다: {value}") from e
+    if start_ns is None:
+        raise ValueError("bag 시작 시각을 알 수 없어 상대 시각을 쓸 수 없습니다 (metadata.yaml 없음)")
+    return start_ns + int(round(seconds * 1e9))
+
+
+def resolve_time_window(
+    bag_path: Path,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+) -> Tuple[Optional[int], Optional[int]]:
+    """(start, end) 값을 bag 기준 절대 구간 [start_ns, end_ns) 로 변환."""
+    if start is None and end is None:
+        return None, None
+    origin = bag_start_ns(bag_path)
+    start_ns = resolve_time_bound(start, origin)
+    end_ns = resolve_time_bound(end, origin)
+    if start_ns is not None and end_ns is not None and end_ns <= start_ns:
+        raise ValueError(f"--end가 --start보다 앞섭니다: start={start}, end={end}")
+    return start_ns, end_ns
+
+
+class SqliteBagReader:
+    """rosbag2 sqlite3 bag 디렉토리(또는 .db3 파일)를 ROS 없이 읽는 리더."""
+
+    def __init__(self, bag_path: Path):
+        bag_path = Path(os.path.expanduser(str(bag_path))).resolve()
+        self.bag_dir = bag_path if bag_path.is_dir() else bag_path.parent
+        self.metadata = self._load_metadata()
+
+        compression = self.metadata.get("compression_format", "")
+        if compression:
+            raise RuntimeError(
+                f"압축된 bag은 지원하지 않습니다: {compression} (bag_to_csv.py를 사용하세요)"
+            )
+
+        if bag_path.is_file():
+            db_files = [bag_path]
+        elif self.metadata.get("relative_file_paths"):
+            db_files = [self.bag_dir / p for p in self.metadata["relative_file_paths"]]
+        else:
+            db_files = sorted(self.bag_dir.glob("*.db3"))
+        if not db_files:
+            raise FileNotFoundError(f".db3 파일이 없습니다: {self.bag_dir}")
+
+        self._connections = [
+            sqlite3.connect(f"file:{p}?mode=ro", uri=True) for p in db_files
+        ]
+
+        # 파일마다 topic id가 다를 수 있으므로 (연결, id) 목록으로 관리
+        self.topics: Dict[str, str] = {}
+        self._topic_ids: Dict[str, List[Tuple[sqlite3.Connection, int]]] = {}
+        for conn in self._connections:
+            for topic_id, name, msg_type in conn.execute("SELECT id, name, type FROM topics"):
+                self.topics[name] = msg_type
+                self._topic_ids.setdefault(name, []).append((conn, topic_id))
+
+    def _load_metadata(self) -> Dict[str, Any]:
+        path = self.bag_dir / "metadata.yaml"
+        if not path.exists():
+            return {}
+        with path.open("r") as f:
+            data = yaml.safe_load(f) or {}
+        return data.get("rosbag2_bagfile_information", {})
+
+    def close(self) -> None:
+        for conn in self._connections:
+            conn.close()
+        self._connections = []
+
+    def __enter__(self) -> "SqliteBagReader":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def read_raw(
+        self,
+        topic_name: str,
+        start_ns: Optional[int] = None,
+        end_ns: Optional[int] = None,
+    ) -> Tuple[np.ndarray, List[bytes]]:
+        """토픽의 (timestamp 배열, CDR 페이로드 리스트)를 시간순으로 반환.
+
+        start_ns 이상, end_ns 미만 범위만 SQL에서 걸러서 읽습니다.
+        """
+        if topic_name not in self._topic_ids:
+            raise KeyError(
+                f"bag에 '{topic_name}' 토픽이 없습니다. 사용 가능한 토픽: {list(self.topics)}"
+            )
+
+        query = "SELECT timestamp, data FROM messages WHERE topic_id = ?"
+        if start_ns is not None:
+            query += " AND timestamp >= ?"
+        if end_ns is not None:
+            query += " AND timestamp < ?"
+        query += " ORDER BY timestamp"
+
+        timestamps: List[int] = []
+        blobs: List[bytes] = []
+        for conn, topic_id in self._topic_ids[topic_name]:
+            params = [topic_id]
+            if start_ns is not None:
+                params.append(int(start_ns))
+            if end_ns is not None:
+                params.append(int(end_ns))
+            for t, data in conn.execute(query, params):
+                timestamps.append(t)
+                blobs.append(data)
+
+        ts = np.asarray(timestamps, dtype=np.int64)
+        if len(self._topic_ids[topic_name]) > 1:
+            order = np.argsort(ts, kind="stable")
+            ts = ts[order]
+            blobs = [blobs[i] for i in order]
+        return ts, blobs
+
+    def read_topic(
+        self,
+        topic_name: str,
+        start_ns: Optional[int] = None,
+        end_ns: Optional[int] = None,
+    ) -> Dict[str, np.ndarray]:
+        """알려진 타입의 토픽을 컬럼 이름 → 배열 딕셔너리로 디코딩.
+
+        nav_msgs/Path 토픽은 '<topic>' 헤더 테이블을 반환합니다 (포즈는 read_path).
+        """
+        msg_type = self.topics.get(topic_name)
+        if msg_type == PATH_TYPE:
+            return self.read_path(topic_name, start_ns, end_ns)[0]
+        extractor = FAST_EXTRACTORS.get(msg_type)
+        if not isinstance(extractor, FieldExtractor):
+            raise NotImplementedError(
+                f"'{topic_name}' ({msg_type}) 타입의 CDR 디코더가 없습니다. "
+                "bag_to_csv.py(ROS 2 환경)를 사용하세요."
+            )
+
+        timestamps, blobs = self.read_raw(topic_name, start_ns, end_ns)
+        return decode_fixed(extractor, timestamps, blobs)
+
+    def read_path(
+        self,
+        topic_name: str,
+        start_ns: Optional[int] = None,
+        end_ns: Optional[int] = None,
+    ) -> Tuple[Dict[str, np.ndarray], Dict[str, np.ndarray]]:
+        """nav_msgs/Path 토픽 → (헤더 테이블, 포즈 long 테이블)."""
+        msg_type = self.topics.get(topic_name)
+        if msg_type != PATH_TYPE:
+            raise ValueError(f"'{topic_name}'은 {PATH_TYPE}가 아닙니다 ({msg_type})")
+        timestamps, blobs = self.read_raw(topic_name, start_ns, end_ns)
+        return decode_path(timestamps, blobs)
+
+
+def export_tables(
+    bag_path: Path,
+    output_dir: Path,
+    topics: Iterable[str] = (),
+    fmt: str = "npz",
+    start_ns: Optional[int] = None,
+    end_ns: Optional[int] = None,
+) -> List[Path]:
+    """bag의 토픽들을 bag_to_csv.py와 같은 이름의 토픽별 테이블로 저장.
+
+    topics를 지정하지 않으면 디코더가 있는 모든 토픽을 저장합니다.
+    nav_msgs/Path 토픽은 bag_to_csv.py처럼 '<topic>' 헤더 테이블과
+    '<topic>_poses' 포즈 테이블 두 개를 저장합니다.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    paths: List[Path] = []
+    with SqliteBagReader(Path(bag_path)) as bag:
+        topics = list(topics) or [
+            name for name, msg_type in bag.topics.items()
+            if isinstance(FAST_EXTRACTORS.get(msg_type), FieldExtractor) or msg_type == PATH_TYPE
+        ]
+        for topic_name in topics:
+            if bag.topics.get(topic_name) == PATH_TYPE:
+                header, poses = bag.read_path(topic_name, start_ns, end_ns)
+                tables = {topic_name: header, pose_table_name(topic_name): poses}
+            else:
+                tables = {topic_name: bag.read_topic(topic_name, start_ns, end_ns)}
+            for table_name, columns in tables.items():
+                path = write_topic_table(columns, output_dir, table_name, fmt)
+                print(f"[INFO] Writing topic '{topic_name}' to {path}")
+                paths.append(path)
+    return paths
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="ROS 2 없이 rosbag2 (.db3) → 토픽별 테이블 변환",
+    )
+    parser.add_argument(
+        "--bag-path",
+        required=True,
+        type=str,
+        help="rosbag2 디렉토리 또는 .db3 파일 경로",
+    )
+    parser.add_argument(
+        "--output-dir",
+        required=True,
+        type=str,
+        help="테이블을 저장할 디렉토리",
+    )
+    parser.add_argument(
+        "--topics",
+        nargs="*",
+        default=[],
+        help="변환할 토픽 리스트 (미지정 시 디코더가 있는 모든 토픽)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=FORMATS,
+        default="npz",
+        help="출력 형식 (기본: npz)",
+    )
+    parser.add_argument(
+        "--start",
+        type=str,
+        default=None,
+        help="시작 시각 (포함). bag 시작 기준 상대 초 또는 절대 ns",
+    )
+    parser.add_argument(
+        "--end",
+        type=str,
+        default=None,
+        help="종료 시각 (미포함). bag 시작 기준 상대 초 또는 절대 ns",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    output_dir = Path(os.path.expanduser(args.output_dir)).resolve()
+
+    start_ns, end_ns = resolve_time_window(Path(args.bag_path), args.start, args.end)
+    export_tables(Path(args.bag_path), output_dir, args.topics, args.format, start_ns, end_ns)
+
+    print("[INFO] 완료: 변환이 끝났습니다.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+토픽별 테이블 입출력 유틸리티
+
+bag_to_csv.py가 만든 토픽별 테이블(csv / parquet / feather / npz)을
+컬럼 이름 → NumPy 배열 딕셔너리로 쓰고 읽습니다. ROS 2 환경 없이도
+import 할 수 있으므로 분석 스크립트와 노트북에서 그대로 사용합니다.
+
+- timestamp 컬럼은 항상 int64(ns)로 저장합니다.
+- parquet/feather는 pyarrow가 필요하며, 토픽 이름과 문자열 컬럼은
+  dictionary 인코딩으로 저장합니다.
+- feather는 무압축으로 저장하므로 memory-map으로 읽을 수 있습니다.
+
+사용 예:
+    from table_io import read_topic_table
+    odom = read_topic_table("rosbags/teb/stage123_xxx/parquet", "/odom",
+                            columns=["timestamp", "pose.pose.position.x"])
+"""
+
+import csv
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+
+FORMATS = ("csv", "parquet", "feather", "npz")
+
+FORMAT_SUFFIX = {
+    "csv": ".csv",
+    "parquet": ".parquet",
+    "feather": ".feather",
+    "npz": ".npz",
+}
+
+# npz에는 dictionary 타입이 없으므로 토픽 이름을 별도 키로 저장
+NPZ_TOPIC_KEY = "__topic__"
+
+
+def topic_file_stem(topic_name: str) -> str:
+    """토픽 이름 → 파일 이름 (예: '/imu/data_raw' → 'imu_data_raw')."""
+    return topic_name.strip("/").replace("/", "_")
+
+
+def pose_table_name(topic_name: str) -> str:
+    """포즈 long 테이블 이름 (예: '/local_plan' → '/local_plan/poses' → local_plan_poses.*)."""
+    return f"{topic_name.rstrip('/')}/poses"
+
+
+def topic_table_path(output_dir: Path, topic_name: str, fmt: str) -> Path:
+    return Path(output_dir) / f"{topic_file_stem(topic_name)}{FORMAT_SUFFIX[fmt]}"
+
+
+def column_array(values: Sequence[Any]) -> np.ndarray:
+    """파이썬 값 리스트 → 타입이 지정된 NumPy 배열.
+
+    정수/실수/불리언은 숫자 배열로, 그 외는 문자열 배열로 변환합니다.
+    빈 값(None)이 섞인 숫자 컬럼은 float64(NaN)로 저장합니다.
+    """
+    kinds = {type(v) for v in values if v is not None}
+    has_missing = len(kinds) == 0 or any(v is None for v in values)
+
+    if not kinds:
+        return np.full(len(values), np.nan)
+    if kinds <= {bool} and not has_missing:
+        return np.asarray(values, dtype=bool)
+    if kinds <= {int} and not has_missing:
+        return np.asarray(values, dtype=np.int64)
+    if kinds <= {int, float, bool}:
+        return np.asarray(
+            [np.nan if v is None else v for v in values], dtype=np.float64
+        )
+    return np.asarray(["" if v is None else str(v) for v in values], dtype=str)
+
+
+def columns_to_arrays(columns: Dict[str, List[Any]]) -> Dict[str, np.ndarray]:
+    """컬럼 리스트 딕셔너리 → 배열 딕셔너리 (timestamp는 int64 고정)."""
+    arrays: Dict[str, np.ndarray] = {}
+    for name, values in columns.items():
+        if name == "timestamp":
+            arrays[name] = np.asarray(values, dtype=np.int64)
+        else:
+            arrays[name] = column_array(values)
+    return arrays
+
+
+def _require_pyarrow() -> Any:
+    try:
+        import pyarrow  # noqa: F401
+        import pyarrow.feather  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError as exc:
+        raise RuntimeError(
+            "parquet/feather 형식에는 pyarrow가 필요합니다: pip install pyarrow"
+        ) from exc
+    return pyarrow
+
+
+def _to_arrow_table(arrays: Dict[str, np.ndarray], topic_name: str) -> Any:
+    pa = _require_pyarrow()
+    n = len(arrays["timestamp"]) if "timestamp" in arrays else 0
+
+    names = ["topic"]
+    cols = [
+        pa.DictionaryArray.from_arrays(
+            pa.array(np.zeros(n, dtype=np.int32)), pa.array([topic_name])
+        )
+    ]
+    for name, arr in arrays.items():
+        names.append(name)
+        if arr.dtype.kind == "U":
+            cols.append(pa.array(arr).dictionary_encode())
+        else:
+            cols.append(pa.array(arr))
+    return pa.Table.from_arrays(cols, names=names)
+
+
+def write_topic_table(
+    arrays: Dict[str, np.ndarray],
+    output_dir: Path,
+    topic_name: str,
+    fmt: str,
+) -> Path:
+    """토픽 하나의 컬럼 배열을 지정한 형식으로 저장하고 파일 경로를 반환."""
+    if fmt not in FORMATS:
+        raise ValueError(f"지원하지 않는 형식입니다: {fmt} (가능: {', '.join(FORMATS)})")
+
+    path = topic_table_path(output_dir, topic_name, fmt)
+
+    if fmt == "csv":
+        names = list(arrays.keys())
+        with path.open("w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(names)
+            writer.writerows(zip(*(arrays[n].tolist() for n in names)))
+    elif fmt == "npz":
+        np.savez(path, **{NPZ_TOPIC_KEY: np.asarray(topic_name)}, **arrays)
+    else:
+        pa = _require_pyarrow()
+        table = _to_arrow_table(arrays, topic_name)
+        if fmt == "parquet":
+            pa.parquet.write_table(table, str(path))
+        else:
+            # 무압축 feather(Arrow IPC)는 memory-map으로 zero-copy 로드 가능
+            pa.feather.write_feather(table, str(path), compression="uncompressed")
+
+    return path
+
+
+def _parse_csv_value(text: str) -> Any:
+    if text == "":
+        return None
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        return float(text)
+    except ValueError:
+        pass
+    if text in ("True", "False"):
+        return text == "True"
+    return text
+
+
+def read_topic_table(
+    output_dir: Path,
+    topic_name: str,
+    columns: Optional[Iterable[str]] = None,
+    fmt: Optional[str] = None,
+) -> Dict[str, np.ndarray]:
+    """bag_to_csv.py가 저장한 토픽 테이블을 배열 딕셔너리로 로드.
+
+    fmt를 지정하지 않으면 output_dir에 있는 파일 확장자로 형식을 찾습니다.
+    columns를 지정하면 해당 컬럼만 읽습니다 (parquet/feather/npz는 선택 로드).
+    """
+    output_dir = Path(output_dir)
+    if fmt is None:
+        for candidate in ("feather", "parquet", "npz", "csv"):
+            if topic_table_path(output_dir, topic_name, candidate).exists():
+                fmt = candidate
+                break
+        else:
+            raise FileNotFoundError(
+                f"'{topic_name}' 토픽 테이블이 없습니다: {output_dir}"
+            )
+
+    path = topic_table_path(output_dir, topic_name, fmt)
+    wanted = list(columns) if columns is not None else None
+
+    if fmt == "npz":
+        with np.load(path) as data:
+            keys = wanted if wanted is not None else [
+                k for k in data.files if k != NPZ_TOPIC_KEY
+            ]
+            return {k: data[k] for k in keys}
+
+    if fmt in ("parquet", "feather"):
+        pa = _require_pyarrow()
+        if fmt == "parquet":
+            table = pa.parquet.read_table(str(path), columns=wanted, memory_map=True)
+        else:
+            table = pa.feather.read_table(str(path), columns=wanted, memory_map=True)
+        result: Dict[str, np.ndarray] = {}
+        for name in table.column_names:
+            if name == "topic" and wanted is None:
+                continue
+            col = table.column(name)
+            if pa.types.is_dictionary(col.type):
+                col = col.cast(col.type.value_type)
+            result[name] = col.to_numpy()
+        return result
+
+    with path.open("r", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        indices = [
+            i for i, name in enumerate(header) if wanted is None or name in wanted
+        ]
+        values: Dict[str, List[Any]] = {header[i]: [] for i in indices}
+        for row in reader:
+            for i in indices:
+                values[header[i]].append(
+                    _parse_csv_value(row[i]) if i < len(row) else None
+                )
+    return columns_to_arrays(values)
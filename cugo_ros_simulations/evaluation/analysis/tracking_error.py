@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+경로 추종 오차 (점 → 경로 폴리라인 최단 거리) 계산
+
+전역 경로(/plan, /global_plan)는 주행 중 여러 번 다시 발행되므로 각 /odom
+샘플은 그 시각에 유효한 경로 버전과 비교해야 합니다. 모든 (샘플, 선분) 쌍을
+계산하면 O(N·M)이므로, 경로 버전마다 선분을 균일 격자(segment grid)에
+등록해 두고 샘플이 속한 칸의 후보 선분만 계산합니다.
+
+- 각 선분은 bounding box를 margin만큼 넓힌 영역이 걸치는 모든 칸에 등록됩니다.
+  따라서 margin 이내에 있는 선분은 반드시 후보에 포함되고, 후보 중 최단
+  거리가 margin 이하이면 그 값이 전체 최단 거리입니다 (근사 없음).
+- margin보다 멀리 벗어난 샘플(또는 격자 밖 샘플)만 전체 선분과 비교합니다.
+- 격자는 경로 발행 시각(timestamp)을 키로 캐시하므로 같은 경로 버전을
+  여러 메트릭에서 다시 조회해도 한 번만 만듭니다.
+- 적용 구간의 샘플이 적은 경로 버전은 격자를 만들지 않고 전수 비교합니다.
+
+scipy 없이 NumPy만 사용합니다.
+"""
+
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+
+# 격자 칸 크기와 후보 등록 여유 거리 (m). 일반적인 추종 오차보다 넉넉하게
+DEFAULT_MARGIN = 0.5
+# 전체 선분과 비교할 때 한 번에 만드는 (점, 선분) 쌍의 최대 개수
+MAX_PAIRS = 1 << 22
+# 경로 버전 하나에 대해 (샘플 수 × 선분 수)가 이보다 작으면 격자를 만들지 않고
+# 바로 전수 비교 (격자 생성 비용이 더 큼, 예: 매 주기 다시 발행되는 경로)
+GRID_MIN_PAIRS = 1 << 16
+
+Table = Dict[str, np.ndarray]
+
+
+def _segment_distance(
+    px: np.ndarray,
+    py: np.ndarray,
+    ax: np.ndarray,
+    ay: np.ndarray,
+    dx: np.ndarray,
+    dy: np.ndarray,
+    inv_length2: np.ndarray,
+) -> np.ndarray:
+    """점 (px, py)와 선분 (a, a + d) 사이 거리 (원소별, 브로드캐스트 가능)."""
+    u = np.clip(((px - ax) * dx + (py - ay) * dy) * inv_length2, 0.0, 1.0)
+    return np.hypot(ax + u * dx - px, ay + u * dy - py)
+
+
+def _expand_ranges(starts: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """[starts[i], starts[i] + counts[i]) 구간들을 이어 붙인 인덱스 배열."""
+    first = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    return np.repeat(starts - first, counts) + np.arange(int(np.sum(counts)))
+
+
+def _nearest_candidate(
+    px: np.ndarray,
+    py: np.ndarray,
+    counts: np.ndarray,
+    cand: np.ndarray,
+    segments: Tuple[np.ndarray, ...],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """점 i의 후보 선분 cand[first[i]:first[i] + counts[i]] 중 가장 가까운 것.
+
+    counts는 모두 1 이상이어야 합니다. Returns: (최단 거리, 선분 번호)
+    """
+    ax, ay, dx, dy, inv_length2 = segments
+    point_of_pair = np.repeat(np.arange(len(px)), counts)
+    first = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    d = _segment_distance(
+        px[point_of_pair], py[point_of_pair],
+        ax[cand], ay[cand], dx[cand], dy[cand], inv_length2[cand],
+    )
+    best = np.minimum.reduceat(d, first)
+    # 최솟값과 같은 첫 후보 = 가장 가까운 선분
+    best_pair = np.flatnonzero(d == np.repeat(best, counts))
+    first_best = best_pair[np.unique(point_of_pair[best_pair], return_index=True)[1]]
+    return best, cand[first_best]
+
+
+def _segment_arrays(ax: np.ndarray, ay: np.ndarray, bx: np.ndarray, by: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """선분 (a → b) 목록 → (ax, ay, dx, dy, 1/길이²) (길이 0인 선분은 1/길이² = 0)."""
+    dx, dy = bx - ax, by - ay
+    length2 = dx * dx + dy * dy
+    inv_length2 = np.where(length2 > 0, 1.0 / np.where(length2 > 0, length2, 1.0), 0.0)
+    return ax, ay, dx, dy, inv_length2
+
+
+def point_to_polyline_distance(
+    px: np.ndarray,
+    py: np.ndarray,
+    vx: np.ndarray,
+    vy: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """점들에서 꼭짓점 (vx, vy) 폴리라인까지의 최단 거리와 가장 가까운 선분 번호 (전수 비교).
+
+    (점, 선분) 쌍을 MAX_PAIRS 단위로 나눠서 한 번에 계산합니다.
+    """
+    if len(vx) == 1:
+        return np.hypot(px - vx[0], py - vy[0]), np.zeros(len(px), dtype=np.int64)
+
+    ax, ay, dx, dy, inv_length2 = _segment_arrays(vx[:-1], vy[:-1], vx[1:], vy[1:])
+
+    distance = np.empty(len(px))
+    segment = np.empty(len(px), dtype=np.int64)
+    chunk = max(1, MAX_PAIRS // len(ax))
+    for start in range(0, len(px), chunk):
+        d = _segment_distance(
+            px[start:start + chunk, None], py[start:start + chunk, None],
+            ax, ay, dx, dy, inv_length2,
+        )
+        segment[start:start + chunk] = np.argmin(d, axis=1)
+        distance[start:start + chunk] = d[np.arange(len(d)), segment[start:start + chunk]]
+    return distance, segment
+
+
+class SegmentGrid:
+    """폴리라인 하나의 선분을 균일 격자에 등록한 공간 인덱스."""
+
+    def __init__(self, vx: np.ndarray, vy: np.ndarray, margin: float = DEFAULT_MARGIN):
+        self.vx = np.asarray(vx, dtype=np.float64)
+        self.vy = np.asarray(vy, dtype=np.float64)
+        self.margin = float(margin)
+
+        if len(self.vx) < 2:
+            # 포즈가 하나뿐인 경로는 점까지의 거리만 계산
+            self.cell_start = None
+            return
+
+        ax, ay = self.vx[:-1], self.vy[:-1]
+        bx, by = self.vx[1:], self.vy[1:]
+        self.segments = _segment_arrays(ax, ay, bx, by)
+
+        cell = self.margin
+        self.origin_x = self.vx.min() - cell
+        self.origin_y = self.vy.min() - cell
+        self.nx = int((self.vx.max() + cell - self.origin_x) // cell) + 1
+        self.ny = int((self.vy.max() + cell - self.origin_y) // cell) + 1
+
+        # 선분별로 (bbox + margin)이 걸치는 칸 범위
+        x0 = ((np.minimum(ax, bx) - cell - self.origin_x) // cell).astype(np.int64)
+        x1 = ((np.maximum(ax, bx) + cell - self.origin_x) // cell).astype(np.int64)
+        y0 = ((np.minimum(ay, by) - cell - self.origin_y) // cell).astype(np.int64)
+        y1 = ((np.maximum(ay, by) + cell - self.origin_y) // cell).astype(np.int64)
+        x0, y0 = np.maximum(x0, 0), np.maximum(y0, 0)
+        x1, y1 = np.minimum(x1, self.nx - 1), np.minimum(y1, self.ny - 1)
+        wx, wy = x1 - x0 + 1, y1 - y0 + 1
+        per_segment = wx * wy
+
+        # (칸, 선분) 쌍을 한 번에 펼침: 선분 s의 k번째 칸 = (x0 + k % wx, y0 + k // wx)
+        seg = np.repeat(np.arange(len(ax)), per_segment)
+        offsets = np.concatenate(([0], np.cumsum(per_segment)[:-1]))
+        k = np.arange(len(seg)) - np.repeat(offsets, per_segment)
+        cx = x0[seg] + k % wx[seg]
+        cy = y0[seg] + k // wx[seg]
+        cell_id = cy * self.nx + cx
+
+        # CSR: 칸 번호 순으로 정렬한 선분 목록과 칸별 시작 위치
+        order = np.argsort(cell_id, kind="stable")
+        self.cell_segments = seg[order]
+        self.cell_start = np.searchsorted(
+            cell_id[order], np.arange(self.nx * self.ny + 1)
+        )
+
+    def query(self, px: np.ndarray, py: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """점들의 (최단 거리, 가장 가까운 선분 번호) 일괄 조회."""
+        px = np.asarray(px, dtype=np.float64)
+        py = np.asarray(py, dtype=np.float64)
+        if self.cell_start is None:
+            return point_to_polyline_distance(px, py, self.vx, self.vy)
+
+        n = len(px)
+        distance = np.full(n, np.inf)
+        segment = np.full(n, -1, dtype=np.int64)
+
+        cx = np.floor((px - self.origin_x) / self.margin).astype(np.int64)
+        cy = np.floor((py - self.origin_y) / self.margin).astype(np.int64)
+        inside = (cx >= 0) & (cx < self.nx) & (cy >= 0) & (cy < self.ny)
+        points = np.flatnonzero(inside)
+        cells = cy[points] * self.nx + cx[points]
+        starts = self.cell_start[cells]
+        counts = self.cell_start[cells + 1] - starts
+
+        has_candidates = counts > 0
+        points, starts, counts = points[has_candidates], starts[has_candidates], counts[has_candidates]
+        if len(points):
+            cand = self.cell_segments[_expand_ranges(starts, counts)]
+            distance[points], segment[points] = _nearest_candidate(
+                px[points], py[points], counts, cand, self.segments
+            )
+
+        # margin보다 멀거나 격자 밖인 점은 전체 선분과 비교
+        far = ~(distance <= self.margin)
+        if far.any():
+            distance[far], segment[far] = point_to_polyline_distance(
+                px[far], py[far], self.vx, self.vy
+            )
+        return distance, segment
+
+
+def plan_versions(plan: Table) -> Tuple[np.ndarray, np.ndarray]:
+    """포즈 long 테이블의 경로 버전별 (발행 시각, 시작 행) - msg_index 순."""
+    _, first = np.unique(plan["msg_index"], return_index=True)
+    return plan["timestamp"][first], first
+
+
+class PlanIndex:
+    """여러 번 발행된 경로(포즈 long 테이블)의 버전별 SegmentGrid 캐시.
+
+    적용 구간의 샘플이 적은 버전들은 격자 없이, 샘플마다 자기 버전의 선분
+    전체를 후보로 펼쳐 한 번에 계산합니다.
+    """
+
+    def __init__(self, plan: Table, margin: float = DEFAULT_MARGIN):
+        self.plan = plan
+        self.margin = margin
+        self.version_t, self.starts = plan_versions(plan)
+        self.ends = np.append(self.starts[1:], len(plan["timestamp"]))
+        # 발행 시각 → 격자
+        self._grids: Dict[int, SegmentGrid] = {}
+
+        # 포즈 i → 같은 버전의 다음 포즈로 가는 선분 (버전의 마지막 포즈는 길이 0)
+        x = np.asarray(plan["x"], dtype=np.float64)
+        y = np.asarray(plan["y"], dtype=np.float64)
+        last = np.repeat(self.ends - 1, self.ends - self.starts)
+        nxt = np.minimum(np.arange(len(x)) + 1, last)
+        self._segments = _segment_arrays(x, y, x[nxt], y[nxt])
+
+    def __len__(self) -> int:
+        return len(self.version_t)
+
+    def grid(self, version: int) -> SegmentGrid:
+        key = int(self.version_t[version])
+        grid = self._grids.get(key)
+        if grid is None:
+            lo, hi = self.starts[version], self.ends[version]
+            grid = SegmentGrid(self.plan["x"][lo:hi], self.plan["y"][lo:hi], self.margin)
+            self._grids[key] = grid
+        return grid
+
+    def version_bounds(self, timestamps: np.ndarray) -> np.ndarray:
+        """버전 k가 적용되는 샘플 구간 [bounds[k], bounds[k+1])."""
+        bounds = np.searchsorted(timestamps, self.version_t, side="left")
+        return np.append(bounds, len(timestamps))
+
+    def query(
+        self,
+        timestamps: np.ndarray,
+        x: np.ndarray,
+        y: np.ndarray,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """각 샘플의 (추종 오차, 가장 가까운 선분 번호, 적용된 경로 버전).
+
+        샘플마다 그 시각 직전에 발행된 경로 버전을 사용하며, 첫 경로 발행 전
+        샘플은 (NaN, -1, -1) 입니다.
+        """
+        n = len(timestamps)
+        error = np.full(n, np.nan)
+        segment = np.full(n, -1, dtype=np.int64)
+        version_of = np.full(n, -1, dtype=np.int64)
+        if not len(self):
+            return error, segment, version_of
+
+        bounds = self.version_bounds(timestamps)
+        n_poses = self.ends - self.starts
+        version_of[bounds[0]:] = np.repeat(np.arange(len(self)), np.diff(bounds))
+
+        # 샘플이 많은 버전(또는 이미 격자가 있는 버전)은 격자로 조회
+        n_samples = np.diff(bounds)
+        use_grid = n_samples * n_poses >= GRID_MIN_PAIRS
+        if self._grids:
+            use_grid |= np.isin(self.version_t, list(self._grids))
+        use_grid &= n_samples > 0
+        for k in np.flatnonzero(use_grid):
+            lo, hi = bounds[k], bounds[k + 1]
+            error[lo:hi], segment[lo:hi] = self.grid(k).query(x[lo:hi], y[lo:hi])
+
+        # 나머지 버전의 샘플은 자기 버전의 선분 전체와 한 번에 전수 비교
+        samples = np.flatnonzero((version_of >= 0) & ~use_grid[np.maximum(version_of, 0)])
+        if len(samples):
+            versions = version_of[samples]
+            counts = n_poses[versions]
+            # (샘플, 선분) 쌍이 MAX_PAIRS를 넘지 않도록 샘플을 나눠서 계산
+            group = np.cumsum(counts) // MAX_PAIRS
+            cuts = np.flatnonzero(np.diff(group)) + 1
+            for part in np.split(np.arange(len(samples)), cuts):
+                idx = samples[part]
+                cand = _expand_ranges(self.starts[versions[part]], counts[part])
+                error[idx], seg = _nearest_candidate(
+                    x[idx], y[idx], counts[part], cand, self._segments
+                )
+                # 버전 안의 선분 번호 (마지막 길이 0 선분은 바로 앞 선분과 같은 거리)
+                local = seg - self.starts[versions[part]]
+                segment[idx] = np.minimum(local, np.maximum(counts[part] - 2, 0))
+        return error, segment, version_of
+
+
+def tracking_error(
+    timestamps: np.ndarray,
+    x: np.ndarray,
+    y: np.ndarray,
+    plan: Table,
+    index: Optional[PlanIndex] = None,
+) -> np.ndarray:
+    """각 샘플에서 그 시각에 유효한(가장 최근 발행된) 경로까지의 거리.
+
+    같은 경로 테이블로 여러 번 계산하면 index(PlanIndex)를 넘겨 격자를 재사용합니다.
+    첫 경로가 발행되기 전 샘플은 NaN.
+    """
+    if index is None:
+        index = PlanIndex(plan)
+    return index.query(timestamps, x, y)[0]
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+프로세스 내장 rosbag2 기록기
+waypoint_navigator.py에서 trial 구간을 정확히 잘라 기록하기 위해 사용
+
+`ros2 bag record` 서브프로세스는 시작 시점을 알 수 없어 고정 대기(sleep)가 필요하고,
+종료도 SIGTERM에 의존해 양 끝에서 메시지가 빠질 수 있습니다. BagRecorder는 같은
+프로세스 안에서 구독을 만들고 rosbag2_py.SequentialWriter로 직접 씁니다.
+
+- 시작: writer를 연 뒤 준비 토픽(기본 /odom)의 첫 메시지가 기록되면 start()가 반환
+- 종료: stop()이 반환된 이후에는 어떤 메시지도 기록되지 않음
+- 선택: zstd 압축 (파일 단위), writer 캐시 크기
+- 구독 QoS는 ros2 bag record처럼 발행자 QoS에 맞춤
+
+구독 콜백은 전용 노드 + executor 스레드에서 처리합니다. BasicNavigator 노드는
+네비게이션 루프에서 동기적으로 spin되므로, 같은 노드에 구독을 두면 고주파 토픽
+(IMU, TF)의 콜백이 밀립니다.
+
+압축된 bag은 sqlite_bag_reader.py(고속 경로)로 읽을 수 없습니다.
+"""
+import threading
+import time
+
+import rclpy
+import rosbag2_py
+from rclpy.executors import SingleThreadedExecutor
+from rclpy.qos import DurabilityPolicy, HistoryPolicy, QoSProfile, ReliabilityPolicy
+from rosidl_runtime_py.utilities import get_message
+
+# 실험에서 기록하는 토픽의 메시지 타입 (발행자가 뜨기 전에도 구독할 수 있도록)
+TOPIC_TYPES = {
+    "/imu/data_raw": "sensor_msgs/msg/Imu",
+    "/odom": "nav_msgs/msg/Odometry",
+    "/cmd_vel": "geometry_msgs/msg/Twist",
+    "/amcl_pose": "geometry_msgs/msg/PoseWithCovarianceStamped",
+    "/tf": "tf2_msgs/msg/TFMessage",
+    "/tf_static": "tf2_msgs/msg/TFMessage",
+    "/local_plan": "nav_msgs/msg/Path",
+    "/global_plan": "nav_msgs/msg/Path",
+    "/plan": "nav_msgs/msg/Path",
+    "/transformed_global_plan": "nav_msgs/msg/Path",
+}
+LATCHED_TOPICS = {"/tf_static"}              # transient_local로 발행되는 토픽
+READY_TOPICS = ("/odom",)                    # 이 토픽들의 첫 메시지가 기록되면 준비 완료
+READY_TIMEOUT = 10.0                         # 준비 대기 최대 시간 (s)
+DEFAULT_CACHE_SIZE = 100 * 1024 * 1024       # ros2 bag record 기본값과 동일 (bytes)
+QUEUE_DEPTH = 100
+COMPRESSION_FORMATS = ("zstd",)
+
+
+def adapted_qos(node, topic):
+    """발행자 QoS에 맞춘 구독 QoS (ros2 bag record의 QoS 적응 규칙과 동일)"""
+    infos = node.get_publishers_info_by_topic(topic)
+    qos = QoSProfile(history=HistoryPolicy.KEEP_LAST, depth=QUEUE_DEPTH)
+
+    # 발행자가 하나라도 best effort면 reliable 구독은 연결되지 않음
+    if infos and any(i.qos_profile.reliability != ReliabilityPolicy.RELIABLE for i in infos):
+        qos.reliability = ReliabilityPolicy.BEST_EFFORT
+    else:
+        qos.reliability = ReliabilityPolicy.RELIABLE
+
+    latched = topic in LATCHED_TOPICS or (
+        infos and all(i.qos_profile.durability == DurabilityPolicy.TRANSIENT_LOCAL for i in infos)
+    )
+    qos.durability = DurabilityPolicy.TRANSIENT_LOCAL if latched else DurabilityPolicy.VOLATILE
+    return qos
+
+
+def resolve_topic_type(node, topic):
+    """토픽의 메시지 타입 문자열 (알려진 토픽이 아니면 ROS 그래프에서 조회, 없으면 None)"""
+    if topic in TOPIC_TYPES:
+        return TOPIC_TYPES[topic]
+    for name, types in node.get_topic_names_and_types():
+        if name == topic and types:
+            return types[0]
+    return None
+
+
+class BagRecorder:
+    """rosbag2_py.SequentialWriter 기반 trial 기록기"""
+
+    def __init__(self, bag_path, topics, compression=None, cache_size=DEFAULT_CACHE_SIZE,
+                 ready_topics=READY_TOPICS, node_name="waypoint_bag_recorder"):
+        if compression and compression not in COMPRESSION_FORMATS:
+            raise ValueError(f"Unsupported compression '{compression}' "
+                             f"(available: {', '.join(COMPRESSION_FORMATS)})")
+        self.bag_path = bag_path
+        self.topics = list(topics)
+        self.compression = compression
+        self.cache_size = cache_size
+        self.ready_topics = [t for t in ready_topics if t in self.topics]
+        self.node_name = node_name
+
+        self.node = None
+        self.writer = None
+        self.executor = None
+        self.spin_thread = None
+        self.lock = threading.Lock()
+        self.recording = False
+        self.message_counts = {}
+        self.ready_events = {}
+        self.start_ns = None
+        self.stop_ns = None
+
+    def _open_writer(self):
+        storage_options = rosbag2_py.StorageOptions(
+            uri=str(self.bag_path),
+            storage_id="sqlite3",
+            max_cache_size=self.cache_size,
+        )
+        converter_options = rosbag2_py.ConverterOptions(
+            input_serialization_format="cdr",
+            output_serialization_format="cdr",
+        )
+        if self.compression:
+            writer = rosbag2_py.SequentialCompressionWriter(rosbag2_py.CompressionOptions(
+                compression_format=self.compression,
+                compression_mode=rosbag2_py.CompressionMode.FILE,
+            ))
+        else:
+            writer = rosbag2_py.SequentialWriter()
+        writer.open(storage_options, converter_options)
+        return writer
+
+    def _make_callback(self, topic):
+        def callback(data):
+            # ros2 bag record와 같이 수신 시각(시스템 시계)으로 기록
+            stamp = time.time_ns()
+            with self.lock:
+                if not self.recording:
+                    return
+                self.writer.write(topic, data, stamp)
+                self.message_counts[topic] += 1
+            event = self.ready_events.get(topic)
+            if event is not None:
+                event.set()
+        return callback
+
+    def start(self, timeout=READY_TIMEOUT):
+        """
+        기록 시작, 준비 토픽의 첫 메시지가 bag에 들어간 뒤 반환
+
+        timeout 안에 준비되지 않으면 기록을 정리하고 RuntimeError를 냅니다.
+        """
+        self.writer = self._open_writer()
+        self.node = rclpy.create_node(self.node_name)
+
+        subscribed = []
+        for topic in self.topics:
+            type_name = resolve_topic_type(self.node, topic)
+            if type_name is None:
+                print(f"⚠️  Skipping {topic}: message type unknown and no publisher found")
+                continue
+            self.writer.create_topic(rosbag2_py.TopicMetadata(
+                name=topic,
+                type=type_name,
+                serialization_format="cdr",
+            ))
+            self.message_counts[topic] = 0
+            if topic in self.ready_topics:
+                self.ready_events[topic] = threading.Event()
+            self.node.create_subscription(
+                get_message(type_name),
+                topic,
+                self._make_callback(topic),
+                adapted_qos(self.node, topic),
+                raw=True,  # 역직렬화 없이 CDR 바이트 그대로 기록
+            )
+            subscribed.append(topic)
+
+        with self.lock:
+            self.recording = True
+        self.executor = SingleThreadedExecutor()
+        self.executor.add_node(self.node)
+        self.spin_thread = threading.Thread(target=self.executor.spin, daemon=True)
+        self.spin_thread.start()
+
+        deadline = time.monotonic() + timeout
+        for topic, event in self.ready_events.items():
+            if not event.wait(max(0.0, deadline - time.monotonic())):
+                waiting = [t for t, e in self.ready_events.items() if not e.is_set()]
+                self.stop()
+                raise RuntimeError(
+                    f"Recorder not ready after {timeout:.1f}s: no messages on {', '.join(waiting)}"
+                )
+        self.start_ns = time.time_ns()
+        return subscribed
+
+    def stop(self):
+        """기록 종료 (반환 이후에는 메시지가 기록되지 않음), 토픽별 메시지 수 반환"""
+        with self.lock:
+            if not self.recording and self.writer is None:
+                return dict(self.message_counts)
+            self.recording = False
+            self.stop_ns = time.time_ns()
+
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.spin_thread.join()
+            self.executor = None
+            self.spin_thread = None
+        if self.node is not None:
+            self.node.destroy_node()
+            self.node = None
+
+        # writer를 닫아야 캐시가 flush되고 metadata.yaml이 쓰임
+        # (Humble의 SequentialWriter에는 close()가 없어 객체 해제로 닫힘)
+        with self.lock:
+            writer, self.writer = self.writer, None
+        close = getattr(writer, "close", None)
+        if close is not None:
+            close()
+        del writer
+        return dict(self.message_counts)
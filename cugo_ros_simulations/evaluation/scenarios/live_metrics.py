@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+주행 중 실시간 메트릭
+waypoint_navigator.py가 trial 동안 /odom, /cmd_vel, 로컬 경로를 구독하며 계산
+
+bag 변환 후 nav_metrics.py로 계산하던 핵심 메트릭을 샘플마다 O(1) 누적 통계
+(Welford 평균/분산, 제곱합, 최댓값)로 갱신하고, 1 Hz로 /diagnostics에 발행하며,
+trial 종료 시 요약을 반환합니다. 로봇이 오래 멈춰 있으면 on_abort를 호출해
+캠페인이 명백히 실패한 trial을 일찍 끝낼 수 있게 합니다.
+
+- 안정성: angular_vel_std, angular_accel_rms, linear_accel_max, jerk_rms, jerk_max,
+  harsh_accel_count, cmd_angular_vel_std, cmd_angular_change_rms
+- 효율성: total_time, total_distance, average_speed
+- 추종: local_deviation_mean / rms / max (로봇 위치 ↔ 최신 로컬 경로 폴리라인)
+
+미분은 직전 샘플과의 후진 차분이므로 중앙 차분을 쓰는 nav_metrics.py 값과
+약간 다를 수 있습니다 (최종 비교 수치는 nav_metrics.py 기준).
+"""
+import math
+
+import numpy as np
+from diagnostic_msgs.msg import DiagnosticArray, DiagnosticStatus, KeyValue
+from geometry_msgs.msg import Twist
+from nav_msgs.msg import Odometry, Path as PathMsg
+from rclpy.qos import qos_profile_sensor_data
+
+MOVING_SPEED = 0.02      # 주행 중으로 보는 최소 속도 (m/s), nav_metrics.py와 동일
+HARSH_ACCEL = 0.8        # 급가속/급제동 기준 (m/s²), nav_metrics.py와 동일
+STALL_TIMEOUT = 30.0     # 이 시간(sim, s) 동안 움직이지 않으면 trial 중단 (0이면 사용 안 함)
+PUBLISH_PERIOD = 1.0     # /diagnostics 발행 주기 (s)
+DIAGNOSTICS_TOPIC = "/diagnostics"
+STATUS_NAME = "waypoint_navigator: live metrics"
+
+# 플래너별 로컬 경로 토픽 (waypoint_navigator.py의 기록 토픽과 동일)
+LOCAL_PLAN_TOPICS = {
+    "teb": "/local_plan",
+    "mppi": "/transformed_global_plan",
+}
+
+
+class RunningStats:
+    """O(1) 누적 통계 (Welford 평균/분산 + 제곱합 + 절댓값 최대)"""
+
+    __slots__ = ("count", "mean", "m2", "sum_sq", "max_abs")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.sum_sq = 0.0
+        self.max_abs = 0.0
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.sum_sq += value * value
+        self.max_abs = max(self.max_abs, abs(value))
+
+    @property
+    def std(self):
+        # nav_metrics.py의 np.std와 같은 모집단 표준편차
+        return math.sqrt(self.m2 / self.count) if self.count else float("nan")
+
+    @property
+    def rms(self):
+        return math.sqrt(self.sum_sq / self.count) if self.count else float("nan")
+
+    @property
+    def max(self):
+        return self.max_abs if self.count else float("nan")
+
+
+class OnlineMetrics:
+    """ROS와 무관한 메트릭 누적기 (시각은 초 단위 float)"""
+
+    def __init__(self):
+        self.angular_vel = RunningStats()
+        self.angular_accel = RunningStats()
+        self.linear_accel = RunningStats()
+        self.jerk = RunningStats()
+        self.cmd_angular_vel = RunningStats()
+        self.cmd_angular_change = RunningStats()
+        self.local_deviation = RunningStats()
+        self.harsh_accel_count = 0
+        self.total_distance = 0.0
+
+        self._last_odom = None      # (t, x, y, v, wz)
+        self._last_accel = None
+        self._harsh = False
+        self._last_cmd_wz = None
+        self._first_moving = None
+        self._last_moving = None
+        self._first_odom_t = None
+        self._plan = None           # (frame_id, ax, ay, dx, dy, len_sq)
+
+    def update_odom(self, t, x, y, v, wz, frame_id=""):
+        if self._first_odom_t is None:
+            self._first_odom_t = t
+        self.angular_vel.add(wz)
+
+        last = self._last_odom
+        if last is not None and t > last[0]:
+            dt = t - last[0]
+            self.total_distance += math.hypot(x - last[1], y - last[2])
+            accel = (v - last[3]) / dt
+            self.linear_accel.add(accel)
+            self.angular_accel.add((wz - last[4]) / dt)
+            if self._last_accel is not None:
+                self.jerk.add((accel - self._last_accel[1]) / (t - self._last_accel[0]))
+            self._last_accel = (t, accel)
+
+            harsh = abs(accel) > HARSH_ACCEL
+            if harsh and not self._harsh:
+                self.harsh_accel_count += 1
+            self._harsh = harsh
+        if last is None or t > last[0]:
+            self._last_odom = (t, x, y, v, wz)
+
+        # 주행 시간/거리는 nav_metrics.py처럼 처음~마지막 주행 샘플 구간만
+        if abs(v) > MOVING_SPEED:
+            if self._first_moving is None:
+                self._first_moving = (t, self.total_distance)
+            self._last_moving = (t, self.total_distance)
+
+        deviation = self.plan_distance(x, y, frame_id)
+        if deviation is not None:
+            self.local_deviation.add(deviation)
+
+    def update_cmd_vel(self, wz):
+        self.cmd_angular_vel.add(wz)
+        if self._last_cmd_wz is not None:
+            self.cmd_angular_change.add(wz - self._last_cmd_wz)
+        self._last_cmd_wz = wz
+
+    def update_plan(self, frame_id, xs, ys):
+        """로컬 경로 갱신 (선분 배열을 미리 만들어 두고 샘플마다 재사용)"""
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        if len(xs) == 0:
+            self._plan = None
+            return
+        if len(xs) == 1:
+            xs = np.append(xs, xs)
+            ys = np.append(ys, ys)
+        ax, ay = xs[:-1], ys[:-1]
+        dx, dy = np.diff(xs), np.diff(ys)
+        self._plan = (frame_id, ax, ay, dx, dy, dx * dx + dy * dy)
+
+    def plan_distance(self, x, y, frame_id=""):
+        """최신 로컬 경로까지의 거리 (경로가 없거나 좌표계가 다르면 None)"""
+        if self._plan is None:
+            return None
+        plan_frame, ax, ay, dx, dy, len_sq = self._plan
+        if frame_id and plan_frame and frame_id != plan_frame:
+            return None
+        safe = np.where(len_sq > 0.0, len_sq, 1.0)
+        u = np.clip(((x - ax) * dx + (y - ay) * dy) / safe, 0.0, 1.0)
+        u = np.where(len_sq > 0.0, u, 0.0)
+        return float(np.min(np.hypot(ax + u * dx - x, ay + u * dy - y)))
+
+    def stalled_for(self):
+        """최신 /odom 기준, 마지막으로 움직인 뒤(한 번도 안 움직였으면 첫 /odom 이후) 지난 시간 (s)"""
+        if self._last_odom is None:
+            return 0.0
+        since = self._last_moving[0] if self._last_moving is not None else self._first_odom_t
+        return max(0.0, self._last_odom[0] - since)
+
+    def summary(self):
+        if self._first_moving is not None:
+            total_time = self._last_moving[0] - self._first_moving[0]
+            total_distance = self._last_moving[1] - self._first_moving[1]
+        else:
+            total_time, total_distance = 0.0, self.total_distance
+        return {
+            "angular_vel_std": self.angular_vel.std,
+            "angular_accel_rms": self.angular_accel.rms,
+            "linear_accel_max": self.linear_accel.max,
+            "jerk_rms": self.jerk.rms,
+            "jerk_max": self.jerk.max,
+            "harsh_accel_count": float(self.harsh_accel_count),
+            "cmd_angular_vel_std": self.cmd_angular_vel.std,
+            "cmd_angular_change_rms": self.cmd_angular_change.rms,
+            "total_time": total_time,
+            "total_distance": total_distance,
+            "average_speed": total_distance / total_time if total_time > 0 else float("nan"),
+            "local_deviation_mean": (
+                self.local_deviation.mean if self.local_deviation.count else float("nan")
+            ),
+            "local_deviation_rms": self.local_deviation.rms,
+            "local_deviation_max": self.local_deviation.max,
+            "odom_samples": float(self.angular_vel.count),
+        }
+
+
+class LiveMetricsMonitor:
+    """
+    노드에 /odom, /cmd_vel, 로컬 경로 구독과 /diagnostics 발행 타이머를 붙임
+
+    콜백은 노드를 spin하는 executor(네비게이션 루프)에서 실행되므로 on_abort에서
+    액션 goal을 바로 취소할 수 있습니다. trial이 끝나면 destroy()로 떼어냅니다.
+    """
+
+    def __init__(self, node, plan_topic, on_abort=None, stall_timeout=STALL_TIMEOUT,
+                 diagnostics_topic=DIAGNOSTICS_TOPIC):
+        self.node = node
+        self.plan_topic = plan_topic
+        self.on_abort = on_abort
+        self.stall_timeout = stall_timeout
+        self.metrics = OnlineMetrics()
+        self.abort_reason = None
+
+        self.subscriptions = [
+            node.create_subscription(Odometry, "/odom", self._on_odom, qos_profile_sensor_data),
+            node.create_subscription(Twist, "/cmd_vel", self._on_cmd_vel, 10),
+            node.create_subscription(PathMsg, plan_topic, self._on_plan, 10),
+        ]
+        self.publisher = node.create_publisher(DiagnosticArray, diagnostics_topic, 10)
+        self.timer = node.create_timer(PUBLISH_PERIOD, self._on_timer)
+
+    def _on_odom(self, msg):
+        stamp = msg.header.stamp
+        self.metrics.update_odom(
+            stamp.sec + stamp.nanosec * 1e-9,
+            msg.pose.pose.position.x,
+            msg.pose.pose.position.y,
+            msg.twist.twist.linear.x,
+            msg.twist.twist.angular.z,
+            msg.header.frame_id,
+        )
+
+    def _on_cmd_vel(self, msg):
+        self.metrics.update_cmd_vel(msg.angular.z)
+
+    def _on_plan(self, msg):
+        self.metrics.update_plan(
+            msg.header.frame_id,
+            [p.pose.position.x for p in msg.poses],
+            [p.pose.position.y for p in msg.poses],
+        )
+
+    def _on_timer(self):
+        summary = self.metrics.summary()
+        stalled = self.metrics.stalled_for()
+
+        status = DiagnosticStatus()
+        status.name = STATUS_NAME
+        status.hardware_id = self.node.get_name()
+        if self.abort_reason:
+            status.level = DiagnosticStatus.ERROR
+            status.message = self.abort_reason
+        elif self.stall_timeout > 0 and stalled > self.stall_timeout / 2:
+            status.level = DiagnosticStatus.WARN
+            status.message = f"robot stationary for {stalled:.1f}s"
+        else:
+            status.level = DiagnosticStatus.OK
+            status.message = "navigating"
+        status.values = [KeyValue(key=k, value=f"{v:.4f}") for k, v in summary.items()]
+        status.values.append(KeyValue(key="stalled_for", value=f"{stalled:.1f}"))
+
+        array = DiagnosticArray()
+        array.header.stamp = self.node.get_clock().now().to_msg()
+        array.status = [status]
+        self.publisher.publish(array)
+
+        if self.abort_reason is None and self.stall_timeout > 0 and stalled > self.stall_timeout:
+            self.abort_reason = f"robot stationary for {stalled:.1f}s (> {self.stall_timeout:.1f}s)"
+            if self.on_abort is not None:
+                self.on_abort(self.abort_reason)
+
+    def summary(self):
+        return self.metrics.summary()
+
+    def destroy(self):
+        self.node.destroy_timer(self.timer)
+        for subscription in self.subscriptions:
+            self.node.destroy_subscription(subscription)
+        self.node.destroy_publisher(self.publisher)
@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+"""
+병렬 실험 캠페인 런처
+TEB/MPPI 비교 실험을 여러 시뮬레이션 인스턴스에서 동시에 실행
+
+sim_world.launch.py와 simulation_nav2.launch.py는 같은 토픽 이름과 기본 도메인을
+쓰기 때문에 한 번에 하나만 띄울 수 있습니다. 이 런처는 headless 인스턴스 K개를
+각각 별도의 ROS_DOMAIN_ID, Gazebo 파티션(IGN_PARTITION), 출력 디렉토리로 띄우고
+캠페인의 trial들을 비어 있는 인스턴스에 하나씩 나눠 줍니다.
+
+- trial 하나 = waypoint_navigator.py --trials 1 --first-trial <N> (pose 리셋 포함)
+- trial 번호는 캠페인 전체에서 유일하므로 bag 이름이 인스턴스 간에 겹치지 않음
+- 출력: <output-dir>/instance_<k>/ (bag, sim/nav2/trial 로그, trial별 manifest)
+        <output-dir>/manifest.json (전체 trial 결과, 인스턴스 정보)
+- compare_report.py는 rosbags/<planner>/ 하위를 재귀적으로 찾으므로 그대로 집계됨
+
+사용법:
+    ros2 run cugo_ros2_control parallel_campaign.py \\
+        --scenario stage123 --planner teb --trials 20 --instances 4 --record-bag
+"""
+import argparse
+import json
+import os
+import queue
+import signal
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+# 같은 디렉토리의 모듈을 import하기 위한 경로 설정
+script_dir = os.path.dirname(os.path.abspath(__file__))
+if script_dir not in sys.path:
+    sys.path.insert(0, script_dir)
+
+from bag_recorder import COMPRESSION_FORMATS
+from waypoint_definitions import SCENARIOS, load_scenario_file
+from waypoint_navigator import DEFAULT_ENTITY, NAV_TIMEOUT, default_bag_dir
+
+PACKAGE = "cugo_ros2_control"
+NAVIGATOR = Path(script_dir) / "waypoint_navigator.py"
+
+# sim_world.launch.py의 world 인자 → SDF <world name> (set_pose 서비스 경로용)
+SDF_WORLD_NAMES = {
+    "cugo_v3_world": "cugo_world",
+    "rubicon": "rubicon",
+    "tugbot_depot": "world_demo",
+}
+
+DEFAULT_DOMAIN_BASE = 30   # 기본 도메인(0)에서 돌고 있는 스택과 겹치지 않도록
+MAX_DOMAIN_ID = 101        # Linux에서 포트 충돌 없이 쓸 수 있는 최대 도메인
+CORES_PER_INSTANCE = 4     # --instances 기본값 계산용 (Gazebo + Nav2 한 벌)
+STARTUP_STAGGER = 15.0     # 인스턴스 기동 간격 (s), 동시에 띄우면 월드 로딩이 몰림
+STARTUP_TIMEOUT = 300.0    # 첫 trial의 Nav2 활성화 대기 여유 (s)
+STOP_TIMEOUT = 15.0        # launch 종료 대기 (s), 넘기면 kill
+
+
+def planner_params_file(planner):
+    """설치된 evaluation/configs/cugo_v3_<planner>.yaml 경로"""
+    from ament_index_python.packages import get_package_share_directory
+    share_dir = Path(get_package_share_directory(PACKAGE))
+    return share_dir / "evaluation" / "configs" / f"cugo_v3_{planner}.yaml"
+
+
+def stop_process_group(proc, timeout=STOP_TIMEOUT):
+    """SIGINT로 프로세스 그룹 종료 (launch가 자식 노드를 정리할 시간을 줌), 안 되면 kill"""
+    if proc.poll() is not None:
+        return
+    try:
+        os.killpg(proc.pid, signal.SIGINT)
+        proc.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        os.killpg(proc.pid, signal.SIGKILL)
+        proc.wait()
+    except ProcessLookupError:
+        pass
+
+
+class SimInstance:
+    """격리된 headless 시뮬레이션 인스턴스 하나 (Gazebo + Nav2)"""
+
+    def __init__(self, index, domain_id, output_dir, world, params_file, world_file=None):
+        self.index = index
+        self.domain_id = domain_id
+        self.partition = f"cugo_sim_{domain_id}"
+        self.output_dir = output_dir
+        self.world = world
+        self.world_file = world_file
+        self.params_file = params_file
+        self.processes = []
+        self.trial_process = None
+        self.env = dict(
+            os.environ,
+            ROS_DOMAIN_ID=str(domain_id),
+            IGN_PARTITION=self.partition,
+            GZ_PARTITION=self.partition,
+        )
+
+    def log(self, message):
+        print(f"[sim{self.index}] {message}", flush=True)
+
+    def _launch(self, name, cmd):
+        log_file = open(self.output_dir / f"{name}.log", "w")
+        proc = subprocess.Popen(
+            cmd,
+            env=self.env,
+            stdout=log_file,
+            stderr=subprocess.STDOUT,
+            start_new_session=True,  # 종료 시 launch 자식까지 한 번에 정리
+        )
+        self.processes.append((name, proc, log_file))
+
+    def start(self):
+        """Gazebo(headless)와 Nav2(RViz 없이) 실행"""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.log(f"🚀 Starting (ROS_DOMAIN_ID={self.domain_id}, partition={self.partition})")
+        sim_cmd = [
+            "ros2", "launch", PACKAGE, "sim_world.launch.py",
+            "headless:=true", f"world:={self.world}",
+        ]
+        if self.world_file:
+            sim_cmd.append(f"world_file:={self.world_file}")
+        self._launch("sim", sim_cmd)
+        self._launch("nav2", [
+            "ros2", "launch", PACKAGE, "simulation_nav2.launch.py",
+            f"params_file:={self.params_file}", "use_rviz:=false",
+            "use_composition:=False",   # 서버별 프로세스 유지 (proc_sampler.py)
+        ])
+
+    def is_alive(self):
+        return bool(self.processes) and all(proc.poll() is None for _, proc, _ in self.processes)
+
+    def stop(self):
+        for _, proc, log_file in reversed(self.processes):
+            stop_process_group(proc)
+            log_file.close()
+        self.processes = []
+        self.log("🛑 Stopped")
+
+    def abort_trial(self):
+        """진행 중인 trial 중단 (navigator가 bag을 닫고 종료)"""
+        proc = self.trial_process
+        if proc is not None:
+            stop_process_group(proc)
+
+    def run_trial(self, trial, args):
+        """waypoint_navigator로 trial 하나 실행 후 manifest 항목 반환"""
+        manifest_path = self.output_dir / f"trial{trial}.json"
+        if args.scenario_file:
+            scenario_args = ["--scenario-file", args.scenario_file]
+        else:
+            scenario_args = ["--scenario", args.scenario]
+        cmd = [
+            sys.executable, str(NAVIGATOR),
+            *scenario_args,
+            "--planner", args.planner,
+            "--trials", "1",
+            "--first-trial", str(trial),
+            "--world", args.sdf_world,
+            "--entity", args.entity,
+            "--manifest", str(manifest_path),
+            "--bag-dir", str(self.output_dir),
+        ]
+        if args.record_bag:
+            cmd += ["--record-bag", "--bag-compression", args.bag_compression]
+
+        self.log(f"🏁 Trial {trial} started")
+        start_time = time.time()
+        with open(self.output_dir / f"trial{trial}.log", "w") as log_file:
+            proc = subprocess.Popen(
+                cmd,
+                env=self.env,
+                stdout=log_file,
+                stderr=subprocess.STDOUT,
+                start_new_session=True,  # 타임아웃 시 SIGINT로 기록기까지 정상 종료
+            )
+            self.trial_process = proc
+            try:
+                proc.wait(timeout=NAV_TIMEOUT + STARTUP_TIMEOUT)
+                error = None
+            except subprocess.TimeoutExpired:
+                stop_process_group(proc)
+                error = "navigator timed out"
+            finally:
+                self.trial_process = None
+
+        entry = None
+        if manifest_path.exists():
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                trials = json.load(f).get("trials", [])
+            entry = trials[0] if trials else None
+        if entry is None:
+            entry = {
+                "trial": trial,
+                "result": "ERROR",
+                "success": False,
+                "duration_sec": None,
+                "bag_path": None,
+                "error": error or f"navigator exited with code {proc.returncode} (see trial{trial}.log)",
+            }
+        entry["instance"] = self.index
+        entry["wall_time_sec"] = round(time.time() - start_time, 3)
+        self.log(f"{'✅' if entry['success'] else '❌'} Trial {trial}: {entry['result']}")
+        return entry
+
+
+class ParallelCampaign:
+    """trial 큐를 인스턴스들이 나눠 가져가는 병렬 캠페인"""
+
+    def __init__(self, args, output_dir, params_file):
+        self.args = args
+        self.output_dir = output_dir
+        self.manifest_path = output_dir / "manifest.json"
+        self.instances = [
+            SimInstance(k, args.domain_base + k, output_dir / f"instance_{k}", args.world,
+                        params_file, args.world_file)
+            for k in range(args.instances)
+        ]
+        self.pending = queue.Queue()
+        for trial in range(1, args.trials + 1):
+            self.pending.put(trial)
+        self.stop_event = threading.Event()
+        self.lock = threading.Lock()
+        self.manifest = {
+            "scenario": args.scenario,
+            "planner": args.planner,
+            "world": args.world_file or args.world,
+            "scenario_file": args.scenario_file,
+            "num_trials": args.trials,
+            "params_file": str(params_file),
+            "instances": [
+                {
+                    "index": inst.index,
+                    "domain_id": inst.domain_id,
+                    "partition": inst.partition,
+                    "output_dir": str(inst.output_dir),
+                }
+                for inst in self.instances
+            ],
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "finished_at": None,
+            "trials": [],
+        }
+
+    def save_manifest(self):
+        with self.lock:
+            self.manifest["trials"].sort(key=lambda t: t["trial"])
+            with open(self.manifest_path, "w", encoding="utf-8") as f:
+                json.dump(self.manifest, f, indent=2, ensure_ascii=False)
+
+    def worker(self, instance):
+        """인스턴스 하나를 띄우고 큐가 빌 때까지 trial 실행"""
+        # 모든 월드가 동시에 로딩되지 않도록 기동 시점을 분산
+        if self.stop_event.wait(instance.index * self.args.stagger) or self.pending.empty():
+            return
+        instance.start()
+        try:
+            while not self.stop_event.is_set():
+                try:
+                    trial = self.pending.get_nowait()
+                except queue.Empty:
+                    break
+                if not instance.is_alive():
+                    # 시뮬레이터가 죽은 인스턴스의 trial은 다른 인스턴스에 넘김
+                    self.pending.put(trial)
+                    instance.log("⚠️  Simulation exited, leaving remaining trials to other instances")
+                    break
+                entry = instance.run_trial(trial, self.args)
+                with self.lock:
+                    self.manifest["trials"].append(entry)
+                self.save_manifest()
+        finally:
+            instance.stop()
+
+    def run(self):
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.save_manifest()
+
+        threads = [
+            threading.Thread(target=self.worker, args=(inst,), daemon=True)
+            for inst in self.instances
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            # join(timeout)으로 돌려야 Ctrl+C가 메인 스레드에 전달됨
+            while any(thread.is_alive() for thread in threads):
+                for thread in threads:
+                    thread.join(timeout=1.0)
+        except KeyboardInterrupt:
+            print("\n\n⚠️  Interrupted by user. Stopping instances...")
+            self.stop_event.set()
+            for inst in self.instances:
+                inst.abort_trial()
+            for thread in threads:
+                thread.join()
+
+        # 실행되지 못한 trial도 manifest에 남김
+        while not self.pending.empty():
+            trial = self.pending.get_nowait()
+            self.manifest["trials"].append({
+                "trial": trial,
+                "result": "NOT_RUN",
+                "success": False,
+                "duration_sec": None,
+                "bag_path": None,
+            })
+        self.manifest["finished_at"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+        self.save_manifest()
+
+        trials = self.manifest["trials"]
+        succeeded = sum(1 for t in trials if t["success"])
+        print(f"\n{'='*60}")
+        print(f"📊 Parallel campaign finished: {succeeded}/{len(trials)} trials succeeded "
+              f"on {len(self.instances)} instances")
+        for t in trials:
+            duration = t["duration_sec"]
+            duration_text = f"{duration:.1f}s" if duration is not None else "-"
+            instance = t.get("instance")
+            instance_text = f"sim{instance}" if instance is not None else "-"
+            print(f"  Trial {t['trial']:>3} [{instance_text:>5}]: {t['result']:<12} {duration_text}")
+        print(f"📋 Manifest: {self.manifest_path}")
+        print(f"{'='*60}\n")
+        return self.manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Run a TEB/MPPI experiment campaign on parallel headless simulation instances',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  ros2 run cugo_ros2_control parallel_campaign.py --scenario stage123 --planner teb \\
+      --trials 20 --instances 4 --record-bag
+  ros2 run cugo_ros2_control parallel_campaign.py --planner teb --trials 20 \\
+      --scenario-file evaluation/scenarios/generated/obstacle_course_s0.json
+
+Each instance gets ROS_DOMAIN_ID=<domain-base>+k and IGN_PARTITION=cugo_sim_<domain id>.
+Available scenarios: {scenarios}
+        """.format(scenarios=', '.join(SCENARIOS.keys()))
+    )
+    parser.add_argument(
+        '--scenario',
+        choices=list(SCENARIOS.keys()),
+        help='Experiment scenario to run'
+    )
+    parser.add_argument(
+        '--scenario-file',
+        type=str,
+        default=None,
+        help='Generated scenario JSON from scenario_generator.py; its world file is launched in every instance'
+    )
+    parser.add_argument(
+        '--planner',
+        required=True,
+        choices=['teb', 'mppi'],
+        help='Planner type (selects evaluation/configs/cugo_v3_<planner>.yaml)'
+    )
+    parser.add_argument(
+        '--trials',
+        type=int,
+        required=True,
+        help='Total number of trials in the campaign'
+    )
+    parser.add_argument(
+        '--instances',
+        type=int,
+        default=max(1, (os.cpu_count() or 1) // CORES_PER_INSTANCE),
+        help=f'Number of parallel simulation instances (default: CPU cores / {CORES_PER_INSTANCE})'
+    )
+    parser.add_argument(
+        '--record-bag',
+        action='store_true',
+        help='Enable rosbag recording for every trial'
+    )
+    parser.add_argument(
+        '--bag-compression',
+        type=str,
+        choices=['none', *COMPRESSION_FORMATS],
+        default='none',
+        help='Bag compression format passed to waypoint_navigator (default: none)'
+    )
+    parser.add_argument(
+        '--output-dir',
+        type=str,
+        default=None,
+        help='Campaign output directory (default: evaluation/rosbags/<planner>/<scenario>_parallel_<timestamp>/)'
+    )
+    parser.add_argument(
+        '--world',
+        type=str,
+        default='cugo_v3_world',
+        help='World argument for sim_world.launch.py (default: cugo_v3_world)'
+    )
+    parser.add_argument(
+        '--entity',
+        type=str,
+        default=DEFAULT_ENTITY,
+        help=f'Gazebo model name of the robot (default: {DEFAULT_ENTITY})'
+    )
+    parser.add_argument(
+        '--params-file',
+        type=str,
+        default=None,
+        help='Nav2 params file (default: installed evaluation/configs/cugo_v3_<planner>.yaml)'
+    )
+    parser.add_argument(
+        '--domain-base',
+        type=int,
+        default=DEFAULT_DOMAIN_BASE,
+        help=f'ROS_DOMAIN_ID of the first instance (default: {DEFAULT_DOMAIN_BASE})'
+    )
+    parser.add_argument(
+        '--stagger',
+        type=float,
+        default=STARTUP_STAGGER,
+        help=f'Delay between instance startups in seconds (default: {STARTUP_STAGGER:g})'
+    )
+    args = parser.parse_args()
+    if args.trials < 1:
+        parser.error('--trials must be >= 1')
+    if args.instances < 1:
+        parser.error('--instances must be >= 1')
+    if (args.scenario is None) == (args.scenario_file is None):
+        parser.error('exactly one of --scenario and --scenario-file is required')
+    args.world_file = None
+    args.sdf_world = SDF_WORLD_NAMES.get(args.world, args.world)
+    if args.scenario_file is not None:
+        args.scenario_file = str(Path(args.scenario_file).expanduser().resolve())
+        try:
+            scenario = load_scenario_file(args.scenario_file)
+        except (OSError, ValueError, KeyError) as e:
+            parser.error(f'cannot load scenario file {args.scenario_file}: {e}')
+        if not scenario.get('world_file'):
+            parser.error(f'{args.scenario_file} has no world file (generated with --snippet?)')
+        args.scenario = scenario['name']
+        args.world_file = scenario['world_file']
+        args.sdf_world = scenario.get('world_name') or args.sdf_world
+    # trial보다 인스턴스가 많으면 놀고 있는 시뮬레이터만 늘어남
+    args.instances = min(args.instances, args.trials)
+    if args.domain_base < 0 or args.domain_base + args.instances - 1 > MAX_DOMAIN_ID:
+        parser.error(f'ROS_DOMAIN_ID range {args.domain_base}..{args.domain_base + args.instances - 1} '
+                     f'must stay within 0..{MAX_DOMAIN_ID}')
+
+    params_file = Path(args.params_file).expanduser().resolve() if args.params_file \
+        else planner_params_file(args.planner)
+    if not params_file.exists():
+        print(f"❌ Params file not found: {params_file}")
+        sys.exit(1)
+
+    if args.output_dir:
+        output_dir = Path(args.output_dir).expanduser().resolve()
+    else:
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        output_dir = default_bag_dir(args.planner) / f"{args.scenario}_parallel_{timestamp}"
+
+    print(f"\n{'='*60}")
+    print(f"🚀 Parallel Campaign - {args.scenario.upper()} / {args.planner.upper()}")
+    print(f"{'='*60}")
+    print(f"   Trials: {args.trials}, Instances: {args.instances}")
+    print(f"   Params: {params_file}")
+    print(f"   Output: {output_dir}\n")
+
+    manifest = ParallelCampaign(args, output_dir, params_file).run()
+    trials = manifest["trials"]
+    sys.exit(0 if trials and all(t["success"] for t in trials) else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+프로세스별 CPU/메모리 샘플러
+waypoint_navigator.py가 trial 동안 Nav2/Gazebo 프로세스의 계산 비용을 기록
+
+/proc/<pid>/stat(utime + stime, 스레드 수)과 /proc/<pid>/status(VmRSS)를 고정
+주기로 읽어 bag 디렉토리에 proc_stats.npz로 저장합니다. 형식은 table_io.py의
+npz 토픽 테이블과 같아서 read_topic_table(bag_dir, "/proc_stats")로 읽을 수 있고,
+timestamp는 bag 기록 시각과 같은 시스템 시계(ns)이므로 플래닝 이벤트와 같은
+타임라인에 맞춰 볼 수 있습니다.
+
+컬럼: timestamp(int64 ns), pid(int32), process(str), cpu_ticks(uint64, 누적),
+      cpu_percent(float32, 직전 샘플 대비, 100% = 코어 1개), rss_kb(uint32), threads(uint16)
+
+대상 프로세스는 명령줄로 찾고, 병렬 캠페인(parallel_campaign.py)에서 다른 인스턴스의
+프로세스가 섞이지 않도록 ROS_DOMAIN_ID가 같은 프로세스만 샘플링합니다.
+"""
+import os
+import threading
+import time
+
+import numpy as np
+
+PROC_STATS_FILE = "proc_stats.npz"
+PROC_STATS_TOPIC = "/proc_stats"   # table_io.py의 npz 테이블 이름 (__topic__)
+DEFAULT_RATE = 10.0                # 샘플링 주기 (Hz)
+RESCAN_PERIOD = 5.0                # 대상 프로세스 재탐색 주기 (s), 재시작된 노드 반영
+
+# 라벨 → 명령줄 앞부분 패턴 (앞에서부터 먼저 맞는 라벨 하나만 사용)
+# 패턴의 첫 단어는 실행 파일 이름(basename)과, 나머지는 바로 뒤 인자와 비교하므로
+# `bash -c "... ign gazebo ..."` 같은 래퍼나 `ros2 launch` 부모 프로세스는 잡지 않습니다.
+# nav2_bringup의 use_composition:=True(Humble 기본값)면 controller/planner/costmap이 모두
+# component_container_isolated 하나에서 돌아 서버별로 나눌 수 없으므로, 평가용
+# simulation_nav2.launch.py는 use_composition:=False가 기본이고 컨테이너는 따로 표시합니다.
+DEFAULT_TARGETS = (
+    ("controller_server", (("controller_server",),)),
+    ("planner_server", (("planner_server",),)),
+    ("costmap", (("nav2_costmap_2d",),)),
+    ("nav2_container", (("component_container_isolated",), ("component_container",),
+                        ("component_container_mt",))),
+    ("gazebo", (("ign", "gazebo"), ("gz", "sim"))),
+)
+
+# 스크립트를 실행하는 인터프리터 (ign은 ruby 스크립트) → argv[1]을 실행 파일로 봄
+INTERPRETERS = ("python", "ruby")
+
+_CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+
+
+def _read_argv(pid):
+    with open(f"/proc/{pid}/cmdline", "rb") as f:
+        return f.read().decode(errors="replace").split("\0")[:-1]
+
+
+def match_target(argv, targets=DEFAULT_TARGETS):
+    """argv가 맞는 라벨 (없으면 None), 실행 파일은 basename으로 비교"""
+    if argv and os.path.basename(argv[0]).startswith(INTERPRETERS):
+        argv = argv[1:]
+    if not argv:
+        return None
+    words = [os.path.basename(argv[0]), *argv[1:]]
+    for name, patterns in targets:
+        if any(tuple(words[:len(p)]) == p for p in patterns):
+            return name
+    return None
+
+
+def _read_domain_id(pid):
+    """프로세스 환경의 ROS_DOMAIN_ID (없으면 None)"""
+    with open(f"/proc/{pid}/environ", "rb") as f:
+        for item in f.read().split(b"\0"):
+            if item.startswith(b"ROS_DOMAIN_ID="):
+                return item.split(b"=", 1)[1].decode()
+    return None
+
+
+def find_processes(targets=DEFAULT_TARGETS, domain_id=None):
+    """실행 파일/인자가 targets에 맞고 ROS_DOMAIN_ID가 domain_id인 프로세스 {pid: 라벨}"""
+    own_pid = os.getpid()
+    found = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit() or int(entry) == own_pid:
+            continue
+        pid = int(entry)
+        try:
+            label = match_target(_read_argv(pid), targets)   # 커널 스레드는 argv가 비어 있음
+            if label is None or _read_domain_id(pid) != domain_id:
+                continue
+        except (FileNotFoundError, ProcessLookupError, PermissionError):
+            continue
+        found[pid] = label
+    return found
+
+
+def read_proc_sample(pid):
+    """(utime + stime 틱, 스레드 수, VmRSS kB), 프로세스가 사라졌으면 None"""
+    try:
+        with open(f"/proc/{pid}/stat", "r") as f:
+            stat = f.read()
+        with open(f"/proc/{pid}/status", "r") as f:
+            status = f.read()
+    except (FileNotFoundError, ProcessLookupError):
+        return None
+
+    # comm(2번째 필드)에 공백/괄호가 있을 수 있으므로 마지막 ')' 뒤부터 분리
+    fields = stat[stat.rindex(")") + 2:].split()
+    cpu_ticks = int(fields[11]) + int(fields[12])   # utime(14), stime(15)
+    threads = int(fields[17])                       # num_threads(20)
+
+    rss_kb = 0
+    for line in status.splitlines():
+        if line.startswith("VmRSS:"):
+            rss_kb = int(line.split()[1])
+            break
+    return cpu_ticks, threads, rss_kb
+
+
+class ProcSampler:
+    """대상 프로세스를 고정 주기로 샘플링하는 백그라운드 스레드"""
+
+    def __init__(self, rate=DEFAULT_RATE, targets=DEFAULT_TARGETS, domain_id=None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.period = 1.0 / rate
+        self.targets = targets
+        # 기본값: 이 프로세스와 같은 도메인 (병렬 캠페인 인스턴스별 분리)
+        self.domain_id = domain_id if domain_id is not None else os.environ.get("ROS_DOMAIN_ID")
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.rows = []
+        self.processes = {}
+        self._last = {}   # pid → (timestamp ns, cpu_ticks)
+
+    def _sample(self, now_ns):
+        for pid, label in list(self.processes.items()):
+            sample = read_proc_sample(pid)
+            if sample is None:
+                del self.processes[pid]
+                self._last.pop(pid, None)
+                continue
+            cpu_ticks, threads, rss_kb = sample
+            last = self._last.get(pid)
+            if last is not None and now_ns > last[0]:
+                cpu_percent = 100.0 * (cpu_ticks - last[1]) / _CLOCK_TICKS / ((now_ns - last[0]) * 1e-9)
+            else:
+                cpu_percent = float("nan")
+            self._last[pid] = (now_ns, cpu_ticks)
+            self.rows.append((now_ns, pid, label, cpu_ticks, cpu_percent, rss_kb, threads))
+
+    def _run(self):
+        next_scan = 0.0
+        next_tick = time.monotonic()
+        while not self.stop_event.is_set():
+            now = time.monotonic()
+            if now >= next_scan:
+                self.processes.update(find_processes(self.targets, self.domain_id))
+                next_scan = now + RESCAN_PERIOD
+            self._sample(time.time_ns())
+            # 절대 시각 기준으로 다음 샘플 예약 (읽기 시간만큼 주기가 밀리지 않도록)
+            next_tick += self.period
+            if next_tick < time.monotonic():
+                next_tick = time.monotonic()
+            self.stop_event.wait(max(0.0, next_tick - time.monotonic()))
+
+    def start(self):
+        """샘플링 시작, 찾은 대상 프로세스 {pid: 라벨} 반환"""
+        self.processes = find_processes(self.targets, self.domain_id)
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        return dict(self.processes)
+
+    def stop(self):
+        if self.thread is not None:
+            self.stop_event.set()
+            self.thread.join()
+            self.thread = None
+
+    def table(self):
+        """샘플을 컬럼 배열 딕셔너리로 (table_io.py 테이블 형식)"""
+        rows = self.rows
+        return {
+            "timestamp": np.array([r[0] for r in rows], dtype=np.int64),
+            "pid": np.array([r[1] for r in rows], dtype=np.int32),
+            "process": np.array([r[2] for r in rows], dtype=np.str_),
+            "cpu_ticks": np.array([r[3] for r in rows], dtype=np.uint64),
+            "cpu_percent": np.array([r[4] for r in rows], dtype=np.float32),
+            "rss_kb": np.array([r[5] for r in rows], dtype=np.uint32),
+            "threads": np.array([r[6] for r in rows], dtype=np.uint16),
+        }
+
+    def save(self, output_dir):
+        """output_dir/proc_stats.npz로 저장 (라벨 문자열이 반복되므로 압축 저장)"""
+        path = os.path.join(str(output_dir), PROC_STATS_FILE)
+        np.savez_compressed(path, __topic__=np.asarray(PROC_STATS_TOPIC), **self.table())
+        return path
+
+    def summary(self):
+        """라벨별 CPU 평균/최대(%)와 최대 RSS(MB), 같은 라벨의 프로세스는 시각별로 합산"""
+        table = self.table()
+        result = {}
+        for label in sorted(set(table["process"].tolist())):
+            mask = table["process"] == label
+            t = table["timestamp"][mask]
+            cpu = np.nan_to_num(table["cpu_percent"][mask].astype(np.float64))
+            rss = table["rss_kb"][mask].astype(np.float64)
+            stamps, inverse = np.unique(t, return_inverse=True)
+            cpu_total = np.bincount(inverse, weights=cpu, minlength=len(stamps))
+            rss_total = np.bincount(inverse, weights=rss, minlength=len(stamps))
+            # 첫 샘플은 직전 값이 없어 CPU%가 없으므로 제외 (샘플이 하나뿐이면 None)
+            cpu_total = cpu_total[1:]
+            result[label] = {
+                "cpu_mean": round(float(np.mean(cpu_total)), 2) if len(cpu_total) else None,
+                "cpu_max": round(float(np.max(cpu_total)), 2) if len(cpu_total) else None,
+                "rss_max_mb": round(float(np.max(rss_total)) / 1024.0, 1),
+                "samples": int(len(stamps)),
+            }
+        return result
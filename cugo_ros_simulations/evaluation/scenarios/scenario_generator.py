@@ -0,0 +1,466 @@
+#!/usr/bin/env python3
+"""
+절차적 시나리오 생성기
+TEB/MPPI 비교 실험용 Open Space / Obstacle Course / Narrow Corridor 시나리오
+
+시드를 고정한 난수로 묘목(원기둥) 배치, 통로 벽, 웨이포인트를 만들고
+Gazebo 월드(SDF)와 시나리오 JSON(웨이포인트 + 장애물 목록)으로 저장합니다.
+같은 종류/시드/파라미터면 항상 같은 시나리오가 나오므로, 시드 범위를 바꿔 가며
+캠페인을 돌리면 재현 가능한 시나리오 분포 위에서 플래너를 비교할 수 있습니다.
+
+- open_space: 장애물 없이 무작위 웨이포인트 (최소 간격 보장)
+- obstacle_course: 직선 구간에 불규칙한 묘목 필드, 왕복 웨이포인트
+- narrow_corridor: 꺾이는 통로(벽) + 벽 쪽에 불규칙하게 심은 묘목, 통로 중앙 lane은 비움
+
+장애물 간격 검사는 균일 격자 해시(SpatialHash)로 주변 셀만 확인하므로 후보 수천 개도
+바로 검증됩니다. obstacle_course에서는 묘목 사이 간격이 min_gap(로봇 폭 + 여유) 이상이라
+어느 두 묘목 사이로도 로봇이 지나갈 수 있습니다.
+
+모든 시나리오는 원점 (0, 0, 0°)에서 시작하므로 sim_world.launch.py의 기본 spawn
+위치와 맞습니다. 생성된 월드는 기본 월드(cugo_v3_world.sdf)의 <world name>을
+유지하므로 bridge와 set_pose 서비스 경로가 그대로 동작합니다.
+
+사용법:
+    python3 scenario_generator.py --kind obstacle_course --seed 0 --count 20
+    ros2 launch cugo_ros2_control sim_world.launch.py \\
+        world_file:=<output-dir>/obstacle_course_s0.sdf
+    ros2 run cugo_ros2_control waypoint_navigator.py \\
+        --scenario-file <output-dir>/obstacle_course_s0.json --trials 5
+"""
+import argparse
+import json
+import math
+import random
+import sys
+import time
+import xml.etree.ElementTree as ET
+from collections import defaultdict
+from pathlib import Path
+
+SCENARIO_KINDS = ("open_space", "obstacle_course", "narrow_corridor")
+
+# cugo_v3 footprint: 0.7 x 0.5 m (evaluation/configs/cugo_v3_*.yaml)
+DEFAULT_MIN_GAP = 0.8            # obstacle_course 묘목 사이 최소 간격 (로봇 폭 0.5 m + 여유)
+WAYPOINT_CLEARANCE = 1.0         # 웨이포인트 주변에 장애물을 두지 않는 반경 (m)
+SEEDLING_RADIUS = (0.05, 0.15)   # 묘목(원기둥) 반경 범위 (m)
+SEEDLING_HEIGHT = (0.3, 0.8)     # 묘목 높이 범위 (m)
+SEEDLING_SPACING = 0.2           # narrow_corridor 묘목 사이 최소 간격 (m)
+WALL_THICKNESS = 0.1
+WALL_HEIGHT = 0.5
+MAX_ATTEMPTS = 50                # 장애물 하나당 후보 위치 시도 횟수
+
+# 생성 월드에서 제거할 기본 월드 모델 (cugo_v3_world.sdf의 램프는 x=2~6 구간을 막음)
+DEFAULT_DROP_MODELS = ("trapezoidal_ramp",)
+SEEDLING_COLOR = "0.2 0.7 0.2 1"   # worlds/ground/model_naegi.sdf와 같은 녹색
+WALL_COLOR = "0.7 0.6 0.5 1"
+
+
+class SpatialHash:
+    """원형 장애물용 균일 격자 해시 (간격 검사 시 겹칠 수 있는 셀만 확인)"""
+
+    def __init__(self, cell_size):
+        if cell_size <= 0:
+            raise ValueError("cell_size must be positive")
+        self.cell_size = cell_size
+        self.cells = defaultdict(list)
+        self.max_radius = 0.0
+
+    def _cell(self, x, y):
+        return math.floor(x / self.cell_size), math.floor(y / self.cell_size)
+
+    def insert(self, x, y, radius):
+        self.cells[self._cell(x, y)].append((x, y, radius))
+        self.max_radius = max(self.max_radius, radius)
+
+    def is_clear(self, x, y, radius, gap):
+        """(x, y, radius) 원이 모든 기존 원과 gap 이상 떨어져 있으면 True"""
+        reach = radius + self.max_radius + gap
+        cx0, cy0 = self._cell(x - reach, y - reach)
+        cx1, cy1 = self._cell(x + reach, y + reach)
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                for ox, oy, oradius in self.cells.get((cx, cy), ()):
+                    if math.hypot(x - ox, y - oy) < radius + oradius + gap:
+                        return False
+        return True
+
+    def __len__(self):
+        return sum(len(items) for items in self.cells.values())
+
+
+def _segment_distance(px, py, ax, ay, bx, by):
+    dx, dy = bx - ax, by - ay
+    len_sq = dx * dx + dy * dy
+    u = 0.0 if len_sq == 0.0 else min(1.0, max(0.0, ((px - ax) * dx + (py - ay) * dy) / len_sq))
+    return math.hypot(ax + u * dx - px, ay + u * dy - py)
+
+
+def _polyline_distance(px, py, points):
+    return min(
+        _segment_distance(px, py, *points[i], *points[i + 1])
+        for i in range(len(points) - 1)
+    )
+
+
+def _heading_deg(a, b):
+    return math.degrees(math.atan2(b[1] - a[1], b[0] - a[0]))
+
+
+def _round_waypoints(waypoints):
+    return [[round(x, 3), round(y, 3), round(yaw, 1)] for x, y, yaw in waypoints]
+
+
+def _seedling(rng, x, y, radius):
+    return {
+        "type": "cylinder",
+        "x": round(x, 3),
+        "y": round(y, 3),
+        "radius": round(radius, 3),
+        "height": round(rng.uniform(*SEEDLING_HEIGHT), 3),
+    }
+
+
+def _scatter_seedlings(rng, count, sample, accept, spatial_hash, gap, stats):
+    """sample()로 후보를 뽑아 accept()와 간격 검사를 통과한 묘목을 최대 count개 배치"""
+    obstacles = []
+    for _ in range(count):
+        for _ in range(MAX_ATTEMPTS):
+            stats["candidates"] += 1
+            radius = rng.uniform(*SEEDLING_RADIUS)
+            x, y = sample()
+            if not accept(x, y, radius) or not spatial_hash.is_clear(x, y, radius, gap):
+                continue
+            spatial_hash.insert(x, y, radius)
+            obstacles.append(_seedling(rng, x, y, radius))
+            break
+    return obstacles
+
+
+def generate_open_space(rng, stats, length=12.0, width=8.0, num_waypoints=5, min_spacing=2.0):
+    """장애물 없는 평지, 원점에서 시작해 무작위 목표점을 순서대로 방문"""
+    points = [(0.0, 0.0)]
+    attempts = 0
+    while len(points) < num_waypoints:
+        attempts += 1
+        if attempts > num_waypoints * MAX_ATTEMPTS:
+            raise RuntimeError(
+                f"Could not place {num_waypoints} waypoints {min_spacing} m apart "
+                f"in a {length} x {width} m area"
+            )
+        stats["candidates"] += 1
+        p = (rng.uniform(0.0, length), rng.uniform(-width / 2, width / 2))
+        if all(math.hypot(p[0] - q[0], p[1] - q[1]) >= min_spacing for q in points):
+            points.append(p)
+
+    # 각 웨이포인트는 다음 목표를 향하도록 (마지막은 직전 구간 방향 유지)
+    yaws = [0.0] + [_heading_deg(points[i - 1], points[i]) for i in range(1, len(points))]
+    waypoints = [(x, y, yaw) for (x, y), yaw in zip(points, yaws)]
+    params = {"length": length, "width": width, "num_waypoints": num_waypoints,
+              "min_spacing": min_spacing}
+    return waypoints, [], params
+
+
+def generate_obstacle_course(rng, stats, length=14.0, width=6.0, num_obstacles=40,
+                             min_gap=DEFAULT_MIN_GAP):
+    """직선 구간 [0, length] x [-width/2, width/2]에 묘목 필드, 끝까지 갔다가 복귀"""
+    waypoints = [(0.0, 0.0, 0.0), (length, 0.0, 0.0), (0.0, 0.0, 180.0)]
+    spatial_hash = SpatialHash(2 * SEEDLING_RADIUS[1] + min_gap)
+
+    def sample():
+        return rng.uniform(0.0, length), rng.uniform(-width / 2, width / 2)
+
+    def accept(x, y, radius):
+        return all(math.hypot(x - wx, y - wy) >= WAYPOINT_CLEARANCE + radius
+                   for wx, wy, _ in waypoints)
+
+    obstacles = _scatter_seedlings(rng, num_obstacles, sample, accept, spatial_hash, min_gap, stats)
+    params = {"length": length, "width": width, "num_obstacles": num_obstacles, "min_gap": min_gap}
+    return waypoints, obstacles, params
+
+
+def _corridor_walls(points, width):
+    """중심선 polyline 양쪽 벽 (마이터 결합으로 안쪽 모서리가 통로를 침범하지 않음)"""
+    headings = [math.atan2(b[1] - a[1], b[0] - a[0]) for a, b in zip(points, points[1:])]
+    walls = []
+    for side in (1.0, -1.0):
+        offset = side * (width / 2 + WALL_THICKNESS / 2)
+        vertices = []
+        for i, (px, py) in enumerate(points):
+            before = headings[max(i - 1, 0)]
+            after = headings[min(i, len(headings) - 1)]
+            bisector = math.atan2(math.sin(before) + math.sin(after),
+                                  math.cos(before) + math.cos(after))
+            scale = offset / math.cos((after - before) / 2)
+            vertices.append((px - math.sin(bisector) * scale, py + math.cos(bisector) * scale))
+        for (ax, ay), (bx, by) in zip(vertices, vertices[1:]):
+            walls.append({
+                "type": "box",
+                "x": round((ax + bx) / 2, 3),
+                "y": round((ay + by) / 2, 3),
+                "yaw": round(math.atan2(by - ay, bx - ax), 4),
+                "length": round(math.hypot(bx - ax, by - ay), 3),
+                "width": WALL_THICKNESS,
+                "height": WALL_HEIGHT,
+            })
+    return walls
+
+
+def generate_narrow_corridor(rng, stats, length=14.0, width=1.6, lane_width=0.9,
+                             num_segments=3, max_turn=40.0, num_obstacles=20):
+    """꺾이는 통로, 벽과 중앙 lane 사이 띠에 묘목을 불규칙하게 배치"""
+    if lane_width >= width:
+        raise ValueError("lane_width must be smaller than the corridor width")
+    points = [(0.0, 0.0)]
+    heading = 0.0
+    segment_length = length / num_segments
+    for i in range(num_segments):
+        if i > 0:
+            heading += math.radians(rng.uniform(-max_turn, max_turn))
+        x, y = points[-1]
+        points.append((x + segment_length * math.cos(heading),
+                       y + segment_length * math.sin(heading)))
+
+    yaws = [0.0] + [_heading_deg(a, b) for a, b in zip(points, points[1:])]
+    waypoints = [(x, y, yaw) for (x, y), yaw in zip(points, yaws)]
+    walls = _corridor_walls(points, width)
+
+    spatial_hash = SpatialHash(2 * SEEDLING_RADIUS[1] + SEEDLING_SPACING)
+    cumulative = [0.0]
+    for a, b in zip(points, points[1:]):
+        cumulative.append(cumulative[-1] + math.hypot(b[0] - a[0], b[1] - a[1]))
+
+    def sample():
+        # 중심선을 따라 균일하게 고른 뒤 좌우로 띠 안쪽 오프셋
+        s = rng.uniform(0.0, cumulative[-1])
+        i = min(next(k for k in range(1, len(cumulative)) if cumulative[k] >= s), len(points) - 1)
+        (ax, ay), (bx, by) = points[i - 1], points[i]
+        u = (s - cumulative[i - 1]) / (cumulative[i] - cumulative[i - 1])
+        normal = math.atan2(by - ay, bx - ax) + math.pi / 2
+        d = rng.choice((-1.0, 1.0)) * rng.uniform(lane_width / 2, width / 2)
+        return ax + u * (bx - ax) + d * math.cos(normal), ay + u * (by - ay) + d * math.sin(normal)
+
+    def accept(x, y, radius):
+        d = _polyline_distance(x, y, points)
+        if d < lane_width / 2 + radius or d > width / 2 - radius:
+            return False
+        return all(math.hypot(x - wx, y - wy) >= WAYPOINT_CLEARANCE / 2 + radius
+                   for wx, wy in (points[0], points[-1]))
+
+    seedlings = _scatter_seedlings(rng, num_obstacles, sample, accept, spatial_hash,
+                                   SEEDLING_SPACING, stats)
+    params = {"length": length, "width": width, "lane_width": lane_width,
+              "num_segments": num_segments, "max_turn": max_turn, "num_obstacles": num_obstacles}
+    return waypoints, walls + seedlings, params
+
+
+GENERATORS = {
+    "open_space": generate_open_space,
+    "obstacle_course": generate_obstacle_course,
+    "narrow_corridor": generate_narrow_corridor,
+}
+
+
+def generate_scenario(kind, seed, **params):
+    """
+    시나리오 하나 생성
+
+    Args:
+        kind (str): SCENARIO_KINDS 중 하나
+        seed (int): 난수 시드 (같은 kind/seed/params면 같은 결과)
+        **params: 종류별 생성 파라미터 (generate_<kind>의 키워드 인자)
+
+    Returns:
+        dict: name, kind, seed, params, waypoints [[x, y, yaw_deg]], obstacles, stats
+    """
+    if kind not in GENERATORS:
+        raise ValueError(f"Unknown scenario kind '{kind}' (available: {', '.join(SCENARIO_KINDS)})")
+    rng = random.Random(f"{kind}:{seed}")
+    stats = {"candidates": 0}
+    waypoints, obstacles, used_params = GENERATORS[kind](rng, stats, **params)
+    stats["obstacles"] = len(obstacles)
+    return {
+        "name": f"{kind}_s{seed}",
+        "kind": kind,
+        "seed": seed,
+        "params": used_params,
+        "waypoints": _round_waypoints(waypoints),
+        "obstacles": obstacles,
+        "stats": stats,
+    }
+
+
+def obstacle_models(scenario):
+    """장애물 목록 → SDF <model> 요소 리스트 (정적 모델)"""
+    models = []
+    for i, obstacle in enumerate(scenario["obstacles"]):
+        if obstacle["type"] == "cylinder":
+            name = f"seedling_{i:03d}"
+            geometry = (f"<cylinder><radius>{obstacle['radius']}</radius>"
+                        f"<length>{obstacle['height']}</length></cylinder>")
+            yaw, color = 0.0, SEEDLING_COLOR
+        else:
+            name = f"wall_{i:03d}"
+            geometry = (f"<box><size>{obstacle['length']} {obstacle['width']} "
+                        f"{obstacle['height']}</size></box>")
+            yaw, color = obstacle["yaw"], WALL_COLOR
+        models.append(ET.fromstring(
+            f'<model name="{scenario["name"]}_{name}">'
+            f"<static>true</static>"
+            f"<pose>{obstacle['x']} {obstacle['y']} {obstacle['height'] / 2} 0 0 {yaw}</pose>"
+            f'<link name="link">'
+            f'<collision name="collision"><geometry>{geometry}</geometry></collision>'
+            f'<visual name="visual"><geometry>{geometry}</geometry>'
+            f"<material><ambient>{color}</ambient><diffuse>{color}</diffuse></material>"
+            f"</visual></link></model>"
+        ))
+    return models
+
+
+def obstacles_sdf(scenario):
+    """장애물 <model> 요소들의 SDF 조각 문자열 (다른 월드에 붙여 넣거나 spawn할 때)"""
+    models = obstacle_models(scenario)
+    for model in models:
+        ET.indent(model, space="  ", level=2)
+    return "\n".join("    " + ET.tostring(model, encoding="unicode") for model in models) + "\n"
+
+
+def write_world(scenario, base_world, output_path, drop_models=DEFAULT_DROP_MODELS):
+    """기본 월드에서 drop_models를 빼고 장애물 모델을 더한 SDF 월드 파일 저장, <world name> 반환"""
+    parser = ET.XMLParser(target=ET.TreeBuilder(insert_comments=True))
+    tree = ET.parse(base_world, parser=parser)
+    world = tree.getroot().find("world")
+    if world is None:
+        raise ValueError(f"No <world> element in {base_world}")
+    children = list(world)
+    for i, child in enumerate(children):
+        if child.tag == "model" and child.get("name") in drop_models:
+            world.remove(child)
+            # 모델 바로 위의 섹션 주석도 함께 제거
+            if i > 0 and children[i - 1].tag is ET.Comment:
+                world.remove(children[i - 1])
+    world.append(ET.Comment(f" ========== Generated: {scenario['name']} "
+                            f"(scenario_generator.py) ========== "))
+    world.extend(obstacle_models(scenario))
+    ET.indent(tree, space="  ")
+    tree.write(output_path, encoding="unicode", xml_declaration=True)
+    return world.get("name")
+
+
+def default_output_dir():
+    """기본 출력 디렉토리: evaluation/scenarios/generated/ (install에서 실행해도 소스 트리)"""
+    script_path = Path(__file__).resolve()
+    if 'install' in script_path.parts:
+        install_idx = script_path.parts.index('install')
+        workspace_root = Path(*script_path.parts[:install_idx])
+        return (workspace_root / "src" / "rtc-teb_local_planner" / "cugo_ros_simulations"
+                / "evaluation" / "scenarios" / "generated")
+    return script_path.parent / "generated"
+
+
+def default_base_world():
+    """기본 월드: worlds/sim_worlds/cugo_v3_world.sdf (소스 트리)"""
+    return default_output_dir().parents[2] / "worlds" / "sim_worlds" / "cugo_v3_world.sdf"
+
+
+def save_scenario(scenario, output_dir, base_world=None, snippet_only=False,
+                  drop_models=DEFAULT_DROP_MODELS):
+    """
+    <name>.sdf (월드 또는 장애물 조각)와 <name>.json (웨이포인트/장애물) 저장
+
+    JSON의 world_file은 생성된 월드의 절대 경로, world_name은 그 <world name>
+    (set_pose 서비스 경로용)이며, 조각만 저장하면 둘 다 None입니다.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    sdf_path = output_dir / f"{scenario['name']}.sdf"
+    if snippet_only:
+        sdf_path.write_text(obstacles_sdf(scenario), encoding="utf-8")
+        world_file = world_name = None
+    else:
+        world_name = write_world(scenario, base_world or default_base_world(), sdf_path, drop_models)
+        world_file = str(sdf_path.resolve())
+
+    json_path = output_dir / f"{scenario['name']}.json"
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump({**scenario, "world_file": world_file, "world_name": world_name}, f, indent=2)
+    return sdf_path, json_path
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Procedural scenario generator for TEB/MPPI comparison experiments',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python3 scenario_generator.py --kind obstacle_course --seed 0 --count 20
+  python3 scenario_generator.py --kind narrow_corridor --seed 7 --width 1.4
+  python3 scenario_generator.py --kind obstacle_course --seed 3 --snippet
+        """
+    )
+    parser.add_argument('--kind', required=True, choices=SCENARIO_KINDS,
+                        help='Scenario type (required)')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='Random seed of the first scenario (default: 0)')
+    parser.add_argument('--count', type=int, default=1,
+                        help='Number of scenarios to generate with consecutive seeds (default: 1)')
+    parser.add_argument('--length', type=float, default=None,
+                        help='Course length in meters (default: per kind)')
+    parser.add_argument('--width', type=float, default=None,
+                        help='Area width (open_space, obstacle_course) or corridor width (narrow_corridor) in meters')
+    parser.add_argument('--obstacles', type=int, default=None,
+                        help='Number of seedlings to place (obstacle_course, narrow_corridor)')
+    parser.add_argument('--min-gap', type=float, default=None,
+                        help=f'obstacle_course: minimum gap between seedlings (default: {DEFAULT_MIN_GAP})')
+    parser.add_argument('--output-dir', type=str, default=None,
+                        help='Output directory (default: evaluation/scenarios/generated/)')
+    parser.add_argument('--base-world', type=str, default=None,
+                        help='World SDF to add the obstacles to (default: worlds/sim_worlds/cugo_v3_world.sdf)')
+    parser.add_argument('--keep-model', action='append', default=[],
+                        help=f'Keep a base world model that is removed by default ({", ".join(DEFAULT_DROP_MODELS)})')
+    parser.add_argument('--snippet', action='store_true',
+                        help='Write only the obstacle <model> snippet instead of a full world')
+    args = parser.parse_args()
+    if args.count < 1:
+        parser.error('--count must be >= 1')
+
+    params = {}
+    if args.length is not None:
+        params["length"] = args.length
+    if args.width is not None:
+        params["width"] = args.width
+    if args.obstacles is not None:
+        if args.kind == "open_space":
+            parser.error('--obstacles is not used by open_space')
+        params["num_obstacles"] = args.obstacles
+    if args.min_gap is not None:
+        if args.kind != "obstacle_course":
+            parser.error('--min-gap is only used by obstacle_course')
+        params["min_gap"] = args.min_gap
+
+    output_dir = Path(args.output_dir) if args.output_dir else default_output_dir()
+    drop_models = tuple(m for m in DEFAULT_DROP_MODELS if m not in args.keep_model)
+
+    print(f"\n🌱 Generating {args.count} {args.kind} scenario(s) "
+          f"(seeds {args.seed}..{args.seed + args.count - 1})")
+    start = time.perf_counter()
+    candidates = 0
+    try:
+        for seed in range(args.seed, args.seed + args.count):
+            scenario = generate_scenario(args.kind, seed, **params)
+            sdf_path, json_path = save_scenario(
+                scenario, output_dir, args.base_world, args.snippet, drop_models
+            )
+            candidates += scenario["stats"]["candidates"]
+            print(f"  {scenario['name']}: {len(scenario['waypoints'])} waypoints, "
+                  f"{scenario['stats']['obstacles']} obstacles → {json_path.name}, {sdf_path.name}")
+    except (RuntimeError, ValueError, OSError, ET.ParseError) as e:
+        print(f"\n❌ Error: {e}")
+        sys.exit(1)
+
+    elapsed = time.perf_counter() - start
+    print(f"\n✅ {candidates} candidate placements checked in {elapsed:.2f}s")
+    print(f"📁 Output: {output_dir}\n")
+
+
+if __name__ == '__main__':
+    main()
@@ -8,7 +8,10 @@
 사용법:
     from waypoint_definitions import SCENARIOS
     waypoints = SCENARIOS['open_space']
+
+scenario_generator.py로 만든 시나리오(JSON)는 load_scenario_file()로 등록합니다.
 """
+import json
 
 # 단일 시나리오: 3-Stage 비교 실험 (사용자 정의)
 # 목적: 동일한 선형 구간을 여러 번 왕복하며 TEB/MPPI의 성능 비교
@@ -73,6 +76,28 @@ def get_scenario_description(scenario_name='stage123'):
     )
 
 
+def load_scenario_file(path):
+    """
+    scenario_generator.py가 저장한 시나리오 JSON을 SCENARIOS에 등록
+    
+    Args:
+        path (str): 시나리오 JSON 경로
+        
+    Returns:
+        dict: 시나리오 JSON 내용 (name이 SCENARIOS 키, 예: obstacle_course_s3)
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        scenario = json.load(f)
+    
+    name = scenario['name']
+    SCENARIOS[name] = [tuple(wp) for wp in scenario['waypoints']]
+    SCENARIO_DESCRIPTIONS[name] = (
+        f"Generated {scenario['kind']} (seed {scenario['seed']}, "
+        f"{len(scenario['obstacles'])} obstacles)"
+    )
+    return scenario
+
+
 def list_scenarios():
     """사용 가능한 시나리오 목록 출력"""
     print("\n📋 Available Scenarios:")
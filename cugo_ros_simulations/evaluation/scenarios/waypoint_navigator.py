@@ -7,13 +7,26 @@ TEB/MPPI 플래너 비교 실험용
     ros2 run cugo_ros2_control waypoint_navigator.py --scenario <scenario_name>
     
     사용 가능한 시나리오는 waypoint_definitions.py에서 확인할 수 있습니다.
+    scenario_generator.py로 만든 시나리오는 --scenario-file <json>으로 실행합니다
+    (해당 월드는 sim_world.launch.py world_file:=<sdf>로 띄움).
+
+캠페인 모드 (--trials N):
+    실행 중인 Nav2 스택 하나로 N회 trial을 연속 실행합니다. 각 trial 전에
+    Gazebo set_pose 서비스로 로봇을 시나리오 시작점으로 옮기고 AMCL 초기 위치와
+    costmap을 재설정하므로 시뮬레이터를 다시 띄울 필요가 없습니다.
+    trial별 결과/소요 시간/bag 경로는 manifest(JSON)에 기록됩니다.
 """
 import rclpy
-from nav2_simple_commander.robot_navigator import BasicNavigator, TaskResult
+from rclpy.executors import SingleThreadedExecutor
+from rclpy.parameter import Parameter
+from nav2_simple_commander.robot_navigator import BasicNavigator
+from nav2_msgs.action import FollowWaypoints
+from action_msgs.msg import GoalStatus
 from geometry_msgs.msg import PoseStamped
 import math
 import time
 import argparse
+import json
 import sys
 import os
 import subprocess
@@ -24,18 +37,71 @@ script_dir = os.path.dirname(os.path.abspath(__file__))
 if script_dir not in sys.path:
     sys.path.insert(0, script_dir)
 
-from waypoint_definitions import get_waypoint_list, SCENARIOS
+from waypoint_definitions import get_waypoint_list, load_scenario_file, SCENARIOS
+from bag_recorder import BagRecorder, COMPRESSION_FORMATS, DEFAULT_CACHE_SIZE
+from live_metrics import LOCAL_PLAN_TOPICS, STALL_TIMEOUT, LiveMetricsMonitor
+from proc_sampler import DEFAULT_RATE as PROC_SAMPLE_RATE, ProcSampler
+
+# Gazebo (Ignition) 월드/로봇 이름 (sim_world.launch.py, worlds/sim_worlds/*.sdf 기준)
+DEFAULT_WORLD = "cugo_world"
+DEFAULT_ENTITY = "cugo_v3"
+SPAWN_Z = 0.2            # sim_world.launch.py의 spawn 높이 (m)
+NAV_TIMEOUT = 600.0      # trial 하나의 최대 주행 시간 (s)
+RESET_SETTLE_TIME = 3.0  # pose 리셋 후 AMCL/costmap 안정화 대기 (s)
+CLOCK_TIMEOUT = 10.0     # 첫 /clock 수신 대기 (s)
+ACTION_SERVER_TIMEOUT = 10.0
+LIVE_METRICS_FILE = "live_metrics.json"  # bag 디렉토리에 쓰는 실시간 메트릭 요약
+
+# FollowWaypoints 결과 상태 → manifest에 기록하는 이름
+RESULT_NAMES = {
+    GoalStatus.STATUS_SUCCEEDED: "SUCCEEDED",
+    GoalStatus.STATUS_CANCELED: "CANCELED",
+    GoalStatus.STATUS_ABORTED: "FAILED",
+}
+
+
+def default_bag_dir(planner_type=None):
+    """기본 bag 디렉토리: evaluation/rosbags/<planner_type>/"""
+    # 소스 디렉토리 찾기 (install 디렉토리에서 실행될 수도 있음)
+    script_path = Path(__file__).resolve()
+    
+    # install 디렉토리인 경우 소스 디렉토리로 변환
+    if 'install' in script_path.parts:
+        # install/cugo_ros2_control/lib/cugo_ros2_control/evaluation/scenarios/waypoint_navigator.py
+        # -> src/rtc-teb_local_planner/cugo_ros_simulations/evaluation/rosbags/
+        install_idx = script_path.parts.index('install')
+        workspace_root = Path(*script_path.parts[:install_idx])
+        eval_dir = workspace_root / "src" / "rtc-teb_local_planner" / "cugo_ros_simulations" / "evaluation"
+    else:
+        # 소스 디렉토리에서 직접 실행
+        script_dir = script_path.parent  # evaluation/scenarios/
+        eval_dir = script_dir.parent     # evaluation/
+    
+    planner = planner_type or "default"
+    return eval_dir / "rosbags" / planner
 
 
 class WaypointNavigator:
-    def __init__(self, scenario_name, record_bag=False, bag_output_dir=None, planner_type=None):
+    def __init__(self, scenario_name, record_bag=False, bag_output_dir=None, planner_type=None,
+                 world_name=DEFAULT_WORLD, entity_name=DEFAULT_ENTITY,
+                 bag_compression=None, bag_cache_size=DEFAULT_CACHE_SIZE, use_sim_time=True,
+                 stall_timeout=STALL_TIMEOUT, proc_sample_rate=PROC_SAMPLE_RATE):
         rclpy.init()
         self.nav = BasicNavigator()
+        # 웨이포인트 도착 시각을 Gazebo 시간(/clock)으로 기록
+        self.use_sim_time = use_sim_time
+        self.nav.set_parameters([Parameter('use_sim_time', Parameter.Type.BOOL, use_sim_time)])
         self.scenario_name = scenario_name
         self.record_bag = record_bag
         self.bag_output_dir = bag_output_dir
         self.planner_type = planner_type
-        self.bag_process = None
+        self.world_name = world_name
+        self.entity_name = entity_name
+        self.bag_compression = bag_compression
+        self.bag_cache_size = bag_cache_size
+        self.stall_timeout = stall_timeout
+        self.proc_sample_rate = proc_sample_rate
+        self.recorder = None
         
         print(f"\n{'='*60}")
         print(f"🚀 Waypoint Navigator - {scenario_name.upper()} Scenario")
@@ -44,13 +110,15 @@ class WaypointNavigator:
         
         self.nav.waitUntilNav2Active()
         print("✅ Nav2 is ready!\n")
-        
-        # rosbag 기록 시작
-        if self.record_bag:
-            self.start_rosbag_recording()
     
-    def start_rosbag_recording(self):
-        """ros2 bag record 서브프로세스 시작"""
+    def resolve_bag_dir(self):
+        """bag (및 캠페인 manifest) 저장 디렉토리"""
+        if self.bag_output_dir:
+            return Path(self.bag_output_dir).expanduser().resolve()
+        return default_bag_dir(self.planner_type)
+    
+    def start_rosbag_recording(self, bag_name=None):
+        """프로세스 내장 기록기로 bag 기록 시작 (bag 경로 반환)"""
         # 기본 토픽 세트
         topics = [
             "/imu/data_raw",
@@ -71,73 +139,46 @@ class WaypointNavigator:
             # 플래너 미지정 시 모든 plan 토픽 시도
             topics.extend(["/local_plan", "/global_plan", "/plan", "/transformed_global_plan"])
         
-        # bag 출력 디렉토리 설정
-        if self.bag_output_dir:
-            bag_dir = Path(self.bag_output_dir).expanduser().resolve()
-        else:
-            # 기본값: evaluation/rosbags/<planner_type>/
-            # 소스 디렉토리 찾기 (install 디렉토리에서 실행될 수도 있음)
-            script_path = Path(__file__).resolve()
-            
-            # install 디렉토리인 경우 소스 디렉토리로 변환
-            if 'install' in script_path.parts:
-                # install/cugo_ros2_control/lib/cugo_ros2_control/evaluation/scenarios/waypoint_navigator.py
-                # -> src/rtc-teb_local_planner/cugo_ros_simulations/evaluation/rosbags/
-                install_idx = script_path.parts.index('install')
-                workspace_root = Path(*script_path.parts[:install_idx])
-                eval_dir = workspace_root / "src" / "rtc-teb_local_planner" / "cugo_ros_simulations" / "evaluation"
-            else:
-                # 소스 디렉토리에서 직접 실행
-                script_dir = script_path.parent  # evaluation/scenarios/
-                eval_dir = script_dir.parent     # evaluation/
-            
-            planner = self.planner_type or "default"
-            bag_dir = eval_dir / "rosbags" / planner
-        
+        bag_dir = self.resolve_bag_dir()
         bag_dir.mkdir(parents=True, exist_ok=True)
         
-        # bag 파일 이름: <scenario>_<timestamp>
-        timestamp = time.strftime("%Y%m%d_%H%M%S")
-        bag_name = f"{self.scenario_name}_{timestamp}"
+        # bag 파일 이름: <scenario>_<timestamp> (캠페인: <scenario>_trial<N>_<timestamp>)
+        if bag_name is None:
+            timestamp = time.strftime("%Y%m%d_%H%M%S")
+            bag_name = f"{self.scenario_name}_{timestamp}"
         
-        cmd = ["ros2", "bag", "record"] + topics + ["-o", bag_name]
+        bag_path = bag_dir / bag_name
         
         print(f"🎥 Starting rosbag recording...")
         print(f"   Directory: {bag_dir}")
         print(f"   Bag name: {bag_name}")
-        print(f"   Topics: {', '.join(topics)}\n")
+        print(f"   Topics: {', '.join(topics)}")
+        if self.bag_compression:
+            print(f"   Compression: {self.bag_compression}")
         
-        self.bag_process = subprocess.Popen(
-            cmd,
-            cwd=str(bag_dir),
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
+        # 같은 프로세스에서 구독/기록 → /odom 첫 메시지가 기록된 뒤 반환 (고정 대기 없음)
+        self.recorder = BagRecorder(
+            bag_path,
+            topics,
+            compression=self.bag_compression,
+            cache_size=self.bag_cache_size,
         )
-        
-        # rosbag이 시작될 시간을 주기 위해 짧은 대기
-        time.sleep(2)
+        self.recorder.start()
+        print("✅ Recorder ready.\n")
+        return bag_path
     
     def stop_rosbag_recording(self):
-        """ros2 bag record 서브프로세스 종료"""
-        if self.bag_process is None:
-            return
-        
-        if self.bag_process.poll() is not None:
-            # 이미 종료됨
+        """bag 기록 종료 (반환 이후의 메시지는 기록되지 않음)"""
+        if self.recorder is None:
             return
         
         print("\n🛑 Stopping rosbag recording...")
-        self.bag_process.terminate()
-        
-        try:
-            self.bag_process.wait(timeout=10.0)
-            print("✅ Rosbag recording stopped successfully.\n")
-        except subprocess.TimeoutExpired:
-            print("⚠️  Rosbag process did not exit in time. Forcing kill...")
-            self.bag_process.kill()
-            self.bag_process.wait()
-        
-        self.bag_process = None
+        counts = self.recorder.stop()
+        self.recorder = None
+        print(f"✅ Rosbag recording stopped ({sum(counts.values())} messages).")
+        for topic, count in counts.items():
+            print(f"   {topic}: {count}")
+        print()
         
     def create_pose(self, x, y, yaw_deg):
         """PoseStamped 메시지 생성 (각도는 degree)"""
@@ -173,10 +214,191 @@ class WaypointNavigator:
         coords = get_waypoint_list(scenario)
         return [self.create_pose(x, y, yaw) for x, y, yaw in coords]
     
-    def run_experiment(self):
-        """실험 실행 및 결과 반환"""
+    def reset_robot_pose(self, x, y, yaw_deg):
+        """
+        로봇을 (x, y, yaw)로 되돌림 (시뮬레이터 재시작 없이 trial 초기화)
+        
+        Gazebo(Ignition)의 /world/<world>/set_pose 서비스로 모델을 순간이동시킨 뒤
+        AMCL 초기 위치(/initialpose)를 다시 설정하고 costmap을 비웁니다.
+        """
+        yaw_rad = math.radians(yaw_deg)
+        request = (
+            f'name: "{self.entity_name}", '
+            f'position: {{x: {x}, y: {y}, z: {SPAWN_Z}}}, '
+            f'orientation: {{x: 0, y: 0, z: {math.sin(yaw_rad / 2.0)}, w: {math.cos(yaw_rad / 2.0)}}}'
+        )
+        cmd = [
+            "ign", "service",
+            "-s", f"/world/{self.world_name}/set_pose",
+            "--reqtype", "ignition.msgs.Pose",
+            "--reptype", "ignition.msgs.Boolean",
+            "--timeout", "3000",
+            "--req", request,
+        ]
+        
+        print(f"🔄 Resetting robot pose: x={x:.2f}, y={y:.2f}, yaw={yaw_deg:.1f}°")
+        try:
+            proc = subprocess.run(cmd, capture_output=True, text=True, timeout=10.0)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            raise RuntimeError(f"Gazebo set_pose call failed: {e}") from e
+        if proc.returncode != 0 or "data: true" not in proc.stdout:
+            raise RuntimeError(
+                f"Gazebo set_pose rejected for '{self.entity_name}' in world "
+                f"'{self.world_name}': {(proc.stdout + proc.stderr).strip() or 'no response'}"
+            )
+        
+        # 위치가 바뀌었으므로 AMCL 초기 위치와 costmap(이전 trial 흔적)도 재설정
+        self.nav.setInitialPose(self.create_pose(x, y, yaw_deg))
+        self.nav.clearAllCostmaps()
+        time.sleep(RESET_SETTLE_TIME)
+        print("✅ Robot pose reset.\n")
+    
+    def sim_now_ns(self):
+        """노드 시계 기준 현재 시각 (use_sim_time이면 /clock의 sim time, ns)"""
+        return self.nav.get_clock().now().nanoseconds
+    
+    def wait_for_clock(self, executor, timeout=CLOCK_TIMEOUT):
+        """첫 /clock 수신까지 대기 (sim time이 0이면 도착 시각을 기록할 수 없음)"""
+        deadline = time.monotonic() + timeout
+        while self.sim_now_ns() == 0:
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"No /clock message within {timeout:.1f}s (is the simulator running?)")
+            executor.spin_once(timeout_sec=0.1)
+    
+    def follow_waypoints(self, waypoints, timeout=NAV_TIMEOUT):
+        """
+        FollowWaypoints 액션을 feedback/result 콜백으로 실행
+        
+        노드를 executor에서 돌리며 feedback의 current_waypoint가 넘어가는 순간을
+        해당 웨이포인트 도착 시각으로, 결과 수신 시각을 마지막 웨이포인트 도착으로
+        기록합니다 (폴링 주기와 무관한 sim time). 같은 executor에서 실시간 메트릭
+        (live_metrics.py)을 누적하며, 로봇이 stall_timeout 동안 멈춰 있으면 goal을
+        취소해 trial을 일찍 끝냅니다.
+        
+        반환값: {"result", "waypoints", "start_ns", "end_ns", "live_metrics", "abort_reason"}
+        """
+        executor = SingleThreadedExecutor()
+        executor.add_node(self.nav)
+        monitor = None
+        try:
+            if self.use_sim_time:
+                self.wait_for_clock(executor)
+            
+            client = self.nav.follow_waypoints_client
+            if not client.wait_for_server(timeout_sec=ACTION_SERVER_TIMEOUT):
+                raise RuntimeError("FollowWaypoints action server is not available")
+            
+            goal = FollowWaypoints.Goal()
+            goal.poses = waypoints
+            arrivals = []
+            reached = [0]  # 도착 처리된 웨이포인트 수 (콜백에서 갱신)
+            goal_handles = []
+            start_ns = self.sim_now_ns()
+            wall_start = time.time()
+            
+            def mark_arrivals(upto, stamp_ns):
+                while reached[0] < upto:
+                    arrivals.append({
+                        "waypoint": reached[0] + 1,
+                        "sim_time_ns": stamp_ns,
+                        "elapsed_sec": round((stamp_ns - start_ns) * 1e-9, 6),
+                        "missed": False,
+                    })
+                    reached[0] += 1
+            
+            def on_feedback(msg):
+                stamp_ns = self.sim_now_ns()
+                current = msg.feedback.current_waypoint
+                if current > reached[0]:
+                    mark_arrivals(current, stamp_ns)
+                    print(f"⏱️  Progress: {current + 1}/{len(waypoints)} waypoints "
+                          f"(Elapsed: {(stamp_ns - start_ns) * 1e-9:.3f}s sim, "
+                          f"{time.time() - wall_start:.1f}s wall)")
+            
+            def on_abort(reason):
+                print(f"\n⚠️  Aborting trial early: {reason}")
+                for handle in goal_handles:
+                    handle.cancel_goal_async()
+            
+            monitor = LiveMetricsMonitor(
+                self.nav,
+                LOCAL_PLAN_TOPICS.get(self.planner_type, "/local_plan"),
+                on_abort=on_abort,
+                stall_timeout=self.stall_timeout,
+            )
+            
+            def finish(status, end_ns):
+                return {
+                    "result": status,
+                    "waypoints": arrivals,
+                    "start_ns": start_ns,
+                    "end_ns": end_ns,
+                    "live_metrics": monitor.summary(),
+                    "abort_reason": monitor.abort_reason,
+                }
+            
+            send_future = client.send_goal_async(goal, feedback_callback=on_feedback)
+            executor.spin_until_future_complete(send_future, timeout_sec=ACTION_SERVER_TIMEOUT)
+            goal_handle = send_future.result()
+            if goal_handle is None or not goal_handle.accepted:
+                print("❌ FollowWaypoints goal was rejected")
+                return finish("REJECTED", self.sim_now_ns())
+            goal_handles.append(goal_handle)
+            
+            result_future = goal_handle.get_result_async()
+            executor.spin_until_future_complete(result_future, timeout_sec=timeout)
+            if not result_future.done():
+                print("\n⚠️  Timeout! Canceling navigation...")
+                cancel_future = goal_handle.cancel_goal_async()
+                executor.spin_until_future_complete(cancel_future, timeout_sec=ACTION_SERVER_TIMEOUT)
+                executor.spin_until_future_complete(result_future, timeout_sec=ACTION_SERVER_TIMEOUT)
+            end_ns = self.sim_now_ns()
+            
+            response = result_future.result()
+            if response is None:
+                return finish("CANCELED", end_ns)
+            
+            status = RESULT_NAMES.get(response.status, "UNKNOWN")
+            if status == "SUCCEEDED":
+                mark_arrivals(len(waypoints), end_ns)
+            missed = {i + 1 for i in response.result.missed_waypoints}
+            for arrival in arrivals:
+                arrival["missed"] = arrival["waypoint"] in missed
+            return finish(status, end_ns)
+        finally:
+            if monitor is not None:
+                monitor.destroy()
+            executor.remove_node(self.nav)
+            executor.shutdown()
+    
+    def run_experiment(self, bag_name=None):
+        """
+        실험 1회 실행 및 결과 반환
+        
+        반환값: {"result", "success", "duration_sec", "sim_duration_sec",
+                 "bag_path", "waypoints", "abort_reason", "live_metrics", "process_stats",
+                 "proc_stats_path"}
+        """
         waypoints = self.get_waypoints(self.scenario_name)
         
+        # bag 디렉토리 이름: <scenario>_<timestamp> (캠페인: <scenario>_trial<N>_<timestamp>)
+        if bag_name is None:
+            bag_name = f"{self.scenario_name}_{time.strftime('%Y%m%d_%H%M%S')}"
+        
+        # rosbag 기록 시작 (+ 프로세스 CPU/메모리 샘플링, bag이 없어도 같은 이름의 디렉토리에 저장)
+        bag_path = None
+        sampler = None
+        if self.record_bag:
+            bag_path = self.start_rosbag_recording(bag_name)
+        if self.proc_sample_rate > 0:
+            sampler = ProcSampler(rate=self.proc_sample_rate)
+            targets = sampler.start()
+            print(f"📊 Sampling CPU/memory at {self.proc_sample_rate:g} Hz: "
+                  f"{', '.join(sorted(set(targets.values()))) or 'no target processes found yet'}\n")
+            if "nav2_container" in targets.values():
+                print("⚠️  Nav2 runs in a component container: controller/planner/costmap CPU is "
+                      "reported together as nav2_container (launch with use_composition:=False)\n")
+        
         print(f"📍 Waypoints: {len(waypoints)} points")
         for i, wp in enumerate(waypoints, 1):
             x = wp.pose.position.x
@@ -192,58 +414,157 @@ class WaypointNavigator:
         print("🏁 Starting navigation...")
         print(f"{'='*60}\n")
         
-        self.nav.followWaypoints(waypoints)
-        
-        # 피드백 출력
         start_time = time.time()
-        last_waypoint = -1
-        
-        while not self.nav.isTaskComplete():
-            feedback = self.nav.getFeedback()
-            if feedback:
-                current = feedback.current_waypoint + 1
-                total = len(waypoints)
-                elapsed = time.time() - start_time
-                
-                # 새로운 웨이포인트로 이동했을 때만 출력
-                if current != last_waypoint:
-                    print(f"⏱️  Progress: {current}/{total} waypoints "
-                          f"(Elapsed: {elapsed:.1f}s)")
-                    last_waypoint = current
+        try:
+            outcome = self.follow_waypoints(waypoints)
+        finally:
+            # rosbag 정리 (예외가 나도 bag은 닫음)
+            total_time = time.time() - start_time
+            if sampler is not None:
+                sampler.stop()
+            if self.record_bag:
+                self.stop_rosbag_recording()
+        result = outcome["result"]
+        arrivals = outcome["waypoints"]
+        sim_time = (outcome["end_ns"] - outcome["start_ns"]) * 1e-9
+        live_metrics = {
+            key: (None if math.isnan(value) else round(value, 6))
+            for key, value in outcome["live_metrics"].items()
+        }
+        
+        # 실시간 메트릭 요약은 bag 옆에도 남김 (bag 변환 없이 헤드라인 수치 확인용)
+        if bag_path is not None:
+            with open(bag_path / LIVE_METRICS_FILE, "w", encoding="utf-8") as f:
+                json.dump(live_metrics, f, indent=2)
+        process_stats = None
+        proc_stats_path = None
+        if sampler is not None:
+            stats_dir = bag_path if bag_path is not None else self.resolve_bag_dir() / bag_name
+            stats_dir.mkdir(parents=True, exist_ok=True)
+            proc_stats_path = sampler.save(stats_dir)
+            process_stats = sampler.summary()
+        
+        print(f"\n{'='*60}")
+        if result == "SUCCEEDED":
+            print(f"✅ SUCCESS! Completed in {sim_time:.3f}s sim ({total_time:.1f}s wall)")
+        elif result == "CANCELED":
+            print(f"⚠️  CANCELED after {sim_time:.3f}s sim ({total_time:.1f}s wall)")
+        elif result == "FAILED":
+            print(f"❌ FAILED after {sim_time:.3f}s sim ({total_time:.1f}s wall)")
+        else:
+            print(f"❓ Unknown result: {result}")
+        if outcome["abort_reason"]:
+            print(f"   Aborted early: {outcome['abort_reason']}")
+        for arrival in arrivals:
+            mark = "⚠️  missed" if arrival["missed"] else f"{arrival['elapsed_sec']:.3f}s"
+            print(f"  Waypoint {arrival['waypoint']}: {mark}")
+        for label, stats in (process_stats or {}).items():
+            if stats["cpu_mean"] is None:
+                cpu = "CPU n/a"
+            else:
+                cpu = f"CPU mean {stats['cpu_mean']:.1f}% / max {stats['cpu_max']:.1f}%"
+            print(f"🖥️  {label}: {cpu}, RSS max {stats['rss_max_mb']:.1f} MB")
+        print(f"📈 Live metrics: distance {outcome['live_metrics']['total_distance']:.2f}m, "
+              f"jerk_rms {outcome['live_metrics']['jerk_rms']:.3f}, "
+              f"local_deviation_mean {outcome['live_metrics']['local_deviation_mean']:.3f}m")
+        print(f"{'='*60}\n")
+        
+        return {
+            "result": result,
+            "success": result == "SUCCEEDED",
+            "duration_sec": round(total_time, 3),
+            "sim_duration_sec": round(sim_time, 6),
+            "sim_start_ns": outcome["start_ns"],
+            "bag_path": str(bag_path) if bag_path else None,
+            "waypoints": arrivals,
+            "abort_reason": outcome["abort_reason"],
+            "live_metrics": live_metrics,
+            "process_stats": process_stats,
+            "proc_stats_path": proc_stats_path,
+        }
+    
+    def run_campaign(self, num_trials, manifest_path=None, reset_pose=True, first_trial=1):
+        """
+        같은 Nav2 스택에서 trial N회 연속 실행
+        
+        trial 번호는 first_trial부터 매겨집니다 (병렬 캠페인에서 인스턴스 간 bag 이름
+        충돌 방지). 각 trial 전에 로봇을 시나리오 시작점으로 리셋하고, trial이 끝날 때마다
+        manifest(JSON)를 다시 써서 중간에 중단되어도 완료된 trial 기록은 남깁니다.
+        pose 리셋이 실패하면 이후 trial의 시작 조건을 보장할 수 없으므로 중단합니다.
+        """
+        start_x, start_y, start_yaw = get_waypoint_list(self.scenario_name)[0]
+        campaign_stamp = time.strftime("%Y%m%d_%H%M%S")
+        if manifest_path is None:
+            manifest_path = self.resolve_bag_dir() / f"{self.scenario_name}_campaign_{campaign_stamp}.json"
+        manifest_path = Path(manifest_path).expanduser().resolve()
+        manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        manifest = {
+            "scenario": self.scenario_name,
+            "planner": self.planner_type,
+            "world": self.world_name,
+            "entity": self.entity_name,
+            "start_pose": [start_x, start_y, start_yaw],
+            "num_trials": num_trials,
+            "first_trial": first_trial,
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "finished_at": None,
+            "trials": [],
+        }
+        
+        def save_manifest():
+            with open(manifest_path, "w", encoding="utf-8") as f:
+                json.dump(manifest, f, indent=2, ensure_ascii=False)
+        
+        print(f"📋 Campaign: {num_trials} trials → {manifest_path}\n")
+        
+        for i, trial in enumerate(range(first_trial, first_trial + num_trials), 1):
+            print(f"\n{'#'*60}")
+            print(f"🔁 Trial {trial} ({i}/{num_trials})")
+            print(f"{'#'*60}\n")
             
-            rclpy.spin_once(self.nav, timeout_sec=1.0)
+            entry = {"trial": trial, "started_at": time.strftime("%Y-%m-%dT%H:%M:%S")}
+            try:
+                if reset_pose:
+                    self.reset_robot_pose(start_x, start_y, start_yaw)
+            except RuntimeError as e:
+                print(f"❌ {e}")
+                entry.update(result="RESET_FAILED", success=False, duration_sec=None,
+                             bag_path=None, error=str(e))
+                manifest["trials"].append(entry)
+                save_manifest()
+                print("⚠️  Aborting campaign: robot could not be returned to the start pose.")
+                break
             
-            # 타임아웃 (10분)
-            if time.time() - start_time > 600:
-                print("\n⚠️  Timeout! Canceling navigation...")
-                self.nav.cancelTask()
+            bag_name = f"{self.scenario_name}_trial{trial}_{time.strftime('%Y%m%d_%H%M%S')}"
+            try:
+                entry.update(self.run_experiment(bag_name))
+            except RuntimeError as e:
+                # 기록기 미준비(/odom 없음), /clock 없음, 액션 서버 없음 = 시뮬레이터/Nav2 이상
+                print(f"❌ {e}")
+                entry.update(result="ERROR", success=False, duration_sec=None,
+                             bag_path=None, error=str(e))
+                manifest["trials"].append(entry)
+                save_manifest()
+                print("⚠️  Aborting campaign: trial could not start.")
                 break
+            manifest["trials"].append(entry)
+            save_manifest()
         
-        # 결과 확인
-        result = self.nav.getResult()
-        total_time = time.time() - start_time
-        
-        # rosbag 정리
-        if self.record_bag:
-            self.stop_rosbag_recording()
+        manifest["finished_at"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+        save_manifest()
         
+        trials = manifest["trials"]
+        succeeded = sum(1 for t in trials if t["success"])
         print(f"\n{'='*60}")
-        if result == TaskResult.SUCCEEDED:
-            print(f"✅ SUCCESS! Completed in {total_time:.1f}s")
-            print(f"{'='*60}\n")
-            return True
-        elif result == TaskResult.CANCELED:
-            print(f"⚠️  CANCELED after {total_time:.1f}s")
-            print(f"{'='*60}\n")
-            return False
-        elif result == TaskResult.FAILED:
-            print(f"❌ FAILED after {total_time:.1f}s")
-            print(f"{'='*60}\n")
-            return False
-        else:
-            print(f"❓ Unknown result: {result}")
-            print(f"{'='*60}\n")
-            return False
+        print(f"📊 Campaign finished: {succeeded}/{num_trials} trials succeeded")
+        for t in trials:
+            duration = t.get("sim_duration_sec", t["duration_sec"])
+            duration_text = f"{duration:.3f}s" if duration is not None else "-"
+            print(f"  Trial {t['trial']}: {t['result']:<12} {duration_text}")
+        print(f"📋 Manifest: {manifest_path}")
+        print(f"{'='*60}\n")
+        return manifest
     
     def shutdown(self):
         """노드 종료 (Nav2는 계속 실행 상태 유지)"""
@@ -263,15 +584,24 @@ def main():
         epilog="""
 Examples:
   ros2 run cugo_ros2_control waypoint_navigator.py --scenario <scenario_name>
+  ros2 run cugo_ros2_control waypoint_navigator.py --scenario <scenario_name> \\
+      --record-bag --planner teb --trials 10
+  ros2 run cugo_ros2_control waypoint_navigator.py \\
+      --scenario-file evaluation/scenarios/generated/obstacle_course_s0.json --trials 5
   
-Note: --scenario option is required. Available scenarios: {scenarios}
+Note: --scenario or --scenario-file is required. Available scenarios: {scenarios}
         """.format(scenarios=', '.join(SCENARIOS.keys()))
     )
     parser.add_argument(
         '--scenario', 
-        required=True,
         choices=list(SCENARIOS.keys()),
-        help='Experiment scenario to run (required)'
+        help='Experiment scenario to run'
+    )
+    parser.add_argument(
+        '--scenario-file',
+        type=str,
+        default=None,
+        help='Generated scenario JSON from scenario_generator.py (instead of --scenario)'
     )
     parser.add_argument(
         '--record-bag',
@@ -284,6 +614,37 @@ Note: --scenario option is required. Available scenarios: {scenarios}
         default=None,
         help='Directory to save rosbag files (default: evaluation/rosbags/<planner>/)'
     )
+    parser.add_argument(
+        '--stall-timeout',
+        type=float,
+        default=STALL_TIMEOUT,
+        help=f'Cancel a trial once the robot has not moved for this many seconds (0 disables, default: {STALL_TIMEOUT:g})'
+    )
+    parser.add_argument(
+        '--no-sim-time',
+        action='store_true',
+        help='Stamp waypoint arrivals with the system clock instead of /clock'
+    )
+    parser.add_argument(
+        '--bag-compression',
+        type=str,
+        choices=['none', *COMPRESSION_FORMATS],
+        default='none',
+        help='Bag compression format (file mode, default: none)'
+    )
+    parser.add_argument(
+        '--bag-cache-size',
+        type=int,
+        default=DEFAULT_CACHE_SIZE,
+        help=f'Bag writer cache size in bytes (default: {DEFAULT_CACHE_SIZE})'
+    )
+    parser.add_argument(
+        '--proc-sample-rate',
+        type=float,
+        default=PROC_SAMPLE_RATE,
+        help=f'CPU/memory sampling rate in Hz for Nav2/Gazebo processes, saved next to the bag '
+             f'(or in <bag-dir>/<trial>/ without --record-bag; 0 disables, default: {PROC_SAMPLE_RATE:g})'
+    )
     parser.add_argument(
         '--planner',
         type=str,
@@ -291,16 +652,82 @@ Note: --scenario option is required. Available scenarios: {scenarios}
         default=None,
         help='Planner type (teb or mppi) - used for default bag directory naming'
     )
+    parser.add_argument(
+        '--trials',
+        type=int,
+        default=None,
+        help='Campaign mode: run N trials back-to-back, resetting the robot pose between trials'
+    )
+    parser.add_argument(
+        '--manifest',
+        type=str,
+        default=None,
+        help='Campaign manifest path (default: <bag-dir>/<scenario>_campaign_<timestamp>.json)'
+    )
+    parser.add_argument(
+        '--first-trial',
+        type=int,
+        default=1,
+        help='Campaign mode: number of the first trial (default: 1)'
+    )
+    parser.add_argument(
+        '--world',
+        type=str,
+        default=None,
+        help=f'Gazebo world name for the set_pose service (default: world_name of --scenario-file, else {DEFAULT_WORLD})'
+    )
+    parser.add_argument(
+        '--entity',
+        type=str,
+        default=DEFAULT_ENTITY,
+        help=f'Gazebo model name of the robot (default: {DEFAULT_ENTITY})'
+    )
+    parser.add_argument(
+        '--no-reset',
+        action='store_true',
+        help='Campaign mode: do not reset the robot pose between trials'
+    )
     args = parser.parse_args()
+    if args.trials is not None and args.trials < 1:
+        parser.error('--trials must be >= 1')
+    if (args.scenario is None) == (args.scenario_file is None):
+        parser.error('exactly one of --scenario and --scenario-file is required')
+    if args.scenario_file is not None:
+        try:
+            scenario = load_scenario_file(args.scenario_file)
+        except (OSError, ValueError, KeyError) as e:
+            parser.error(f'cannot load scenario file {args.scenario_file}: {e}')
+        args.scenario = scenario['name']
+        if args.world is None:
+            args.world = scenario.get('world_name') or DEFAULT_WORLD
+    if args.world is None:
+        args.world = DEFAULT_WORLD
     
     navigator = WaypointNavigator(
         scenario_name=args.scenario,
         record_bag=args.record_bag,
         bag_output_dir=args.bag_dir,
         planner_type=args.planner,
+        world_name=args.world,
+        entity_name=args.entity,
+        bag_compression=None if args.bag_compression == 'none' else args.bag_compression,
+        bag_cache_size=args.bag_cache_size,
+        use_sim_time=not args.no_sim_time,
+        stall_timeout=args.stall_timeout,
+        proc_sample_rate=args.proc_sample_rate,
     )
     try:
-        success = navigator.run_experiment()
+        if args.trials is not None:
+            manifest = navigator.run_campaign(
+                args.trials,
+                manifest_path=args.manifest,
+                reset_pose=not args.no_reset,
+                first_trial=args.first_trial,
+            )
+            success = all(t["success"] for t in manifest["trials"]) \
+                and len(manifest["trials"]) == args.trials
+        else:
+            success = navigator.run_experiment()["success"]
         sys.exit(0 if success else 1)
     except KeyboardInterrupt:
         print("\n\n⚠️  Interrupted by user. Shutting down...")
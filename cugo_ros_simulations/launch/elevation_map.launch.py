@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Elevation Map Launch File
+Builds a rolling 2.5D elevation grid from Ouster PointCloud2 data and publishes
+terrain costs (/elevation_map) and non-traversable cells (/terrain_obstacles)
+"""
+
+from launch import LaunchDescription
+from launch_ros.actions import Node
+from launch_ros.parameter_descriptions import ParameterValue
+from launch.actions import DeclareLaunchArgument
+from launch.substitutions import LaunchConfiguration
+
+
+def generate_launch_description():
+    # Declare launch arguments
+    use_sim_time_arg = DeclareLaunchArgument(
+        'use_sim_time',
+        default_value='true',
+        description='Use simulation (Gazebo) clock if true'
+    )
+    
+    max_slope_arg = DeclareLaunchArgument(
+        'max_slope_deg',
+        default_value='25.0',
+        description='이 경사(도)를 넘는 셀은 주행 불가로 표시'
+    )
+    
+    # Elevation map node
+    elevation_map_node = Node(
+        package='cugo_ros2_control',
+        executable='elevation_map_node.py',
+        name='elevation_map',
+        output='screen',
+        parameters=[{
+            'use_sim_time': LaunchConfiguration('use_sim_time'),
+            'cloud_topic': '/ouster/points',
+            'max_slope_deg': ParameterValue(LaunchConfiguration('max_slope_deg'), value_type=float),
+        }]
+    )
+    
+    return LaunchDescription([
+        use_sim_time_arg,
+        max_slope_arg,
+        elevation_map_node,
+    ])
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+LiDAR Scan Filter Launch File
+/scan에서 로봇 몸체/알루미늄 프레임 영역을 제거해 /scan_filtered로 발행
+
+기본은 이 패키지의 NumPy 구현(laser_scan_filter_node.py)을 사용하고,
+use_upstream:=true면 laser_filters 패키지의 scan_to_scan_filter_chain을 사용합니다.
+두 노드 모두 같은 파라미터 파일(config/laser_filters/v3ros_filter.yaml)을 읽습니다.
+"""
+
+from launch import LaunchDescription
+from launch_ros.actions import Node
+from launch.actions import DeclareLaunchArgument
+from launch.conditions import IfCondition, UnlessCondition
+from launch.substitutions import LaunchConfiguration
+from ament_index_python.packages import get_package_share_directory
+import os
+
+
+def generate_launch_description():
+    # Get package directory
+    pkg_dir = get_package_share_directory('cugo_ros2_control')
+
+    # Path to config file
+    config_file = os.path.join(
+        pkg_dir,
+        'config',
+        'laser_filters',
+        'v3ros_filter.yaml'
+    )
+
+    # Declare launch arguments
+    use_sim_time_arg = DeclareLaunchArgument(
+        'use_sim_time',
+        default_value='true',
+        description='Use simulation (Gazebo) clock if true'
+    )
+
+    use_upstream_arg = DeclareLaunchArgument(
+        'use_upstream',
+        default_value='false',
+        description='true: laser_filters 패키지 scan_to_scan_filter_chain 사용 (기본: NumPy 구현)'
+    )
+
+    # Laser scan filter node (NumPy, 같은 패키지)
+    laser_scan_filter_node = Node(
+        package='cugo_ros2_control',
+        executable='laser_scan_filter_node.py',
+        name='laser_scan_filter',
+        output='screen',
+        parameters=[
+            {'config_file': config_file},
+            {'input_topic': '/scan'},
+            {'output_topic': '/scan_filtered'},
+            {'use_sim_time': LaunchConfiguration('use_sim_time')}
+        ],
+        condition=UnlessCondition(LaunchConfiguration('use_upstream'))
+    )
+
+    # Laser scan filter node (upstream)
+    scan_to_scan_filter_chain_node = Node(
+        package='laser_filters',
+        executable='scan_to_scan_filter_chain',
+        output='screen',
+        parameters=[
+            config_file,
+            {'use_sim_time': LaunchConfiguration('use_sim_time')}
+        ],
+        remappings=[
+            ('scan', '/scan'),
+            ('scan_filtered', '/scan_filtered')
+        ],
+        condition=IfCondition(LaunchConfiguration('use_upstream'))
+    )
+
+    return LaunchDescription([
+        use_sim_time_arg,
+        use_upstream_arg,
+        laser_scan_filter_node,
+        scan_to_scan_filter_chain_node,
+    ])
@@ -2,11 +2,16 @@
 """
 Pointcloud to LaserScan Conversion Launch File
 Converts Ouster 3D LiDAR PointCloud2 data to 2D LaserScan for SLAM and Navigation
+
+기본은 이 패키지의 NumPy 구현(pointcloud_to_scan_node.py)을 사용하고,
+use_upstream:=true면 pointcloud_to_laserscan 패키지 노드를 사용합니다.
+두 노드 모두 같은 파라미터 파일을 읽습니다.
 """
 
 from launch import LaunchDescription
 from launch_ros.actions import Node
 from launch.actions import DeclareLaunchArgument
+from launch.conditions import IfCondition, UnlessCondition
 from launch.substitutions import LaunchConfiguration
 from ament_index_python.packages import get_package_share_directory
 import os
@@ -31,26 +36,49 @@ def generate_launch_description():
         description='Use simulation (Gazebo) clock if true'
     )
     
-    # Pointcloud to LaserScan node
+    use_upstream_arg = DeclareLaunchArgument(
+        'use_upstream',
+        default_value='false',
+        description='true: pointcloud_to_laserscan 패키지 노드 사용 (기본: NumPy 구현)'
+    )
+    
+    parameters = [
+        config_file,
+        {'use_sim_time': LaunchConfiguration('use_sim_time')}
+    ]
+    remappings = [
+        # Input: Ouster publishes to /ouster/points as PointCloud2
+        ('cloud_in', '/ouster/points'),
+        # Output: Standard 2D laser scan topic
+        ('scan', '/scan')
+    ]
+    
+    # Pointcloud to LaserScan node (NumPy, 같은 패키지)
+    pointcloud_to_scan_node = Node(
+        package='cugo_ros2_control',
+        executable='pointcloud_to_scan_node.py',
+        name='pointcloud_to_laserscan',
+        output='screen',
+        parameters=parameters,
+        remappings=remappings,
+        condition=UnlessCondition(LaunchConfiguration('use_upstream'))
+    )
+    
+    # Pointcloud to LaserScan node (upstream)
     pointcloud_to_laserscan_node = Node(
         package='pointcloud_to_laserscan',
         executable='pointcloud_to_laserscan_node',
         name='pointcloud_to_laserscan',
         output='screen',
-        parameters=[
-            config_file,
-            {'use_sim_time': LaunchConfiguration('use_sim_time')}
-        ],
-        remappings=[
-            # Input: Ouster publishes to /ouster/points as PointCloud2
-            ('cloud_in', '/ouster/points'),
-            # Output: Standard 2D laser scan topic
-            ('scan', '/scan')
-        ]
+        parameters=parameters,
+        remappings=remappings,
+        condition=IfCondition(LaunchConfiguration('use_upstream'))
     )
     
     return LaunchDescription([
         use_sim_time_arg,
+        use_upstream_arg,
+        pointcloud_to_scan_node,
         pointcloud_to_laserscan_node,
     ])
 
@@ -2,8 +2,9 @@ import os
 from ament_index_python.packages import get_package_share_directory
 from launch import LaunchDescription
 from launch.actions import IncludeLaunchDescription, ExecuteProcess, SetEnvironmentVariable, TimerAction, DeclareLaunchArgument
+from launch.conditions import IfCondition, UnlessCondition
 from launch.launch_description_sources import PythonLaunchDescriptionSource
-from launch.substitutions import LaunchConfiguration, PathJoinSubstitution
+from launch.substitutions import LaunchConfiguration, PathJoinSubstitution, PythonExpression
 from launch_ros.actions import Node
 
 def generate_launch_description():
@@ -35,12 +36,24 @@ def generate_launch_description():
         description='로봇 spawn 방향 (라디안)'
     )
     
+    declare_headless_arg = DeclareLaunchArgument(
+        'headless', default_value='false',
+        description='true: GUI 없이 서버만 실행 (병렬 실험 인스턴스용, 시뮬레이션 즉시 시작)'
+    )
+    
+    declare_world_file_arg = DeclareLaunchArgument(
+        'world_file', default_value='',
+        description='월드 SDF 파일 경로 (지정 시 world 인자 대신 사용, scenario_generator.py 생성 월드용)'
+    )
+    
     use_sim_time = LaunchConfiguration('use_sim_time', default='true')
     world_name = LaunchConfiguration('world')
     spawn_x = LaunchConfiguration('x')
     spawn_y = LaunchConfiguration('y')
     spawn_z = LaunchConfiguration('z')
     spawn_yaw = LaunchConfiguration('yaw')
+    headless = LaunchConfiguration('headless')
+    world_file = LaunchConfiguration('world_file')
 
     package_dir = get_package_share_directory('cugo_ros2_control')
     launch_file_dir = os.path.join(package_dir, 'launch', 'simulation')
@@ -48,10 +61,14 @@ def generate_launch_description():
     # Sensor description 패키지 경로 추가
     sensors_dir = get_package_share_directory('clearpath_sensors_description')
 
-    # World 파일 경로 생성
-    world_path = PathJoinSubstitution([
-        package_dir, 'worlds', 'sim_worlds', 
-        [world_name, '.sdf']
+    # World 파일 경로 생성 (world_file이 주어지면 그 경로를 사용)
+    world_path = PythonExpression([
+        "'", world_file, "' or '",
+        PathJoinSubstitution([
+            package_dir, 'worlds', 'sim_worlds', 
+            [world_name, '.sdf']
+        ]),
+        "'",
     ])
     
     # URDF 파일 경로
@@ -86,7 +103,16 @@ def generate_launch_description():
     # -r 플래그는 시뮬레이션을 즉시 실행하지만 GUI 초기화를 방해할 수 있음
     gazebo = ExecuteProcess(
         cmd=['ign', 'gazebo', world_path],
-        output='screen'
+        output='screen',
+        condition=UnlessCondition(headless)
+    )
+
+    # Headless 실행: 서버만 (-s), 즉시 시작 (-r), LiDAR 렌더링은 오프스크린으로
+    # 토픽 분리는 실행 환경의 IGN_PARTITION / ROS_DOMAIN_ID로 (parallel_campaign.py 참고)
+    gazebo_headless = ExecuteProcess(
+        cmd=['ign', 'gazebo', '-s', '-r', '--headless-rendering', world_path],
+        output='screen',
+        condition=IfCondition(headless)
     )
 
     # Robot State Publisher
@@ -153,6 +179,8 @@ def generate_launch_description():
             {'odom_topic': '/odom'},
             {'odom_frame': 'odom'},
             {'base_frame': 'base_footprint'},
+            {'max_rate': 0.0},       # 0: odom마다 발행, >0: 최신 odom만 최대 N Hz
+            {'qos_depth': 1},
             {'use_sim_time': use_sim_time}
         ],
         output='screen'
@@ -165,12 +193,15 @@ def generate_launch_description():
         declare_y_arg,
         declare_z_arg,
         declare_yaw_arg,
+        declare_headless_arg,
+        declare_world_file_arg,
         # Environment Variables
         ign_resource_path,
         gz_resource_path,
         ign_file_path,
         # Nodes and Processes
         gazebo,
+        gazebo_headless,
         robot_state_publisher,
         bridge,
         spawn_robot,
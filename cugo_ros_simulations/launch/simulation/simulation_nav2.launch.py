@@ -4,6 +4,7 @@ from ament_index_python.packages import get_package_share_directory
 from launch import LaunchDescription
 from launch.actions import DeclareLaunchArgument
 from launch.actions import IncludeLaunchDescription
+from launch.conditions import IfCondition
 from launch.launch_description_sources import PythonLaunchDescriptionSource
 from launch.substitutions import LaunchConfiguration
 from launch_ros.actions import Node
@@ -44,6 +45,8 @@ def generate_launch_description():
     use_sim_time = LaunchConfiguration('use_sim_time')
     autostart = LaunchConfiguration('autostart')
     slam = LaunchConfiguration('slam')
+    use_rviz = LaunchConfiguration('use_rviz')
+    use_composition = LaunchConfiguration('use_composition')
 
     nav2_launch_file_dir = os.path.abspath(os.path.join(get_package_share_directory('nav2_bringup'), 'launch'))
     rviz_config_dir = os.path.abspath(os.path.join(package_dir, 'rviz', 'nav2_default_view.rviz'))
@@ -75,6 +78,17 @@ def generate_launch_description():
             default_value='False',
             description='Whether to run SLAM (False = use map_server with pre-built map)'),
 
+        DeclareLaunchArgument(
+            'use_rviz',
+            default_value='true',
+            description='Start RViz2 (false for headless experiment instances)'),
+
+        DeclareLaunchArgument(
+            'use_composition',
+            default_value='False',
+            description='Run Nav2 servers in one component container (False keeps per-server '
+                        'processes so proc_sampler.py can attribute CPU/memory)'),
+
         # Nav2 bringup
         IncludeLaunchDescription(
             PythonLaunchDescriptionSource(
@@ -85,6 +99,7 @@ def generate_launch_description():
                 'params_file': params_file,
                 'autostart': autostart,
                 'slam': slam,
+                'use_composition': use_composition,
             }.items(),
         ),
 
@@ -95,5 +110,6 @@ def generate_launch_description():
             name='rviz2',
             arguments=['-d', rviz_config_dir],
             parameters=[{'use_sim_time': use_sim_time}],
+            condition=IfCondition(use_rviz),
             output='screen'),
     ])
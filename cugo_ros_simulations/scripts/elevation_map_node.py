@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+
+"""
+Elevation Map Node
+
+/ouster/points로 로봇 중심의 2.5D 고도 격자를 누적하고, 경사/단차로 계산한
+주행 비용을 Nav2가 쓸 수 있는 형태로 발행합니다. pointcloud_to_scan_node.py가
+2D 스캔으로 평탄화하면서 버리는 지형(경사) 정보를 보존하기 위한 단계입니다.
+
+격자:
+- odom frame에 고정된 셀(resolution) 위의 size x size 창, 로봇이 창 중앙에 오도록 이동
+- 고정 크기 ring buffer: 셀 (gx, gy)는 버퍼 [gx mod N, gy mod N]에 저장되므로
+  창이 움직여도 재할당/복사 없이 새로 들어온 행/열만 비움 (메모리 고정)
+- 클라우드마다 점이 들어간 셀만 이번 클라우드의 최대/최소 높이로 갱신
+  (비용은 점 수에 비례, 점이 없는 셀은 이전 값 유지)
+
+발행 (publish_rate, 창 전체):
+- /elevation_map (nav_msgs/OccupancyGrid): 0~100 주행 비용, 관측 안 된 셀은 -1
+  셀 경사 = 이웃 셀과의 고도 차(전/후진 중 큰 값) / resolution,
+  max_slope_deg 또는 셀 내부 단차 max_step을 넘으면 100
+- /terrain_obstacles (sensor_msgs/PointCloud2): 비용 100인 셀 중심점 (x, y, 고도)
+
+costmap obstacle layer의 관측 소스로 추가하면 플래너가 바로 사용합니다:
+    observation_sources: "scan terrain"
+    terrain:
+      topic: "/terrain_obstacles"
+      data_type: "PointCloud2"
+      marking: true
+      clearing: false
+      min_obstacle_height: -10.0
+      max_obstacle_height: 10.0
+"""
+
+import array
+import math
+import os
+import sys
+
+import numpy as np
+import rclpy
+from nav_msgs.msg import OccupancyGrid
+from rclpy.duration import Duration
+from rclpy.node import Node
+from rclpy.qos import qos_profile_sensor_data
+from rclpy.time import Time
+from sensor_msgs.msg import PointCloud2, PointField
+from tf2_ros import Buffer, TransformException, TransformListener
+
+# pointcloud_to_scan_node.py의 zero-copy PointCloud2 뷰를 재사용 (같은 디렉토리에 설치됨)
+script_dir = os.path.dirname(os.path.abspath(__file__))
+if script_dir not in sys.path:
+    sys.path.insert(0, script_dir)
+
+from pointcloud_to_scan_node import cloud_xyz_view, transform_from_msg
+
+LETHAL_COST = 100
+UNKNOWN_COST = -1
+
+
+class ElevationGrid:
+    """odom 고정 셀 위를 굴러가는 N x N ring buffer 고도 격자 (ROS와 무관)"""
+
+    def __init__(self, size, resolution):
+        self.resolution = resolution
+        self.cells = int(round(size / resolution))
+        if self.cells < 3:
+            raise ValueError('size must cover at least 3 cells')
+        n = self.cells
+        self.max_z = np.full((n, n), np.nan, dtype=np.float32)
+        self.min_z = np.full((n, n), np.nan, dtype=np.float32)
+        self.origin = None   # 창 왼쪽 아래 셀의 전역 인덱스 (gx, gy)
+
+    def _clear_span(self, axis, start, stop):
+        """전역 인덱스 [start, stop)의 행/열(axis 0: x, 1: y)을 비움"""
+        n = self.cells
+        if stop - start >= n:
+            index = slice(None)
+        else:
+            index = np.arange(start, stop) % n
+        for grid in (self.max_z, self.min_z):
+            if axis == 0:
+                grid[index, :] = np.nan
+            else:
+                grid[:, index] = np.nan
+
+    def recenter(self, x, y):
+        """(x, y)가 창 중앙 셀에 오도록 창 이동, 창 밖으로 나간 셀은 비움"""
+        n = self.cells
+        origin = (
+            math.floor(x / self.resolution) - n // 2,
+            math.floor(y / self.resolution) - n // 2,
+        )
+        if self.origin is None:
+            self.origin = origin
+            return
+        for axis in (0, 1):
+            old, new = self.origin[axis], origin[axis]
+            if new > old:
+                self._clear_span(axis, old + n, new + n)
+            elif new < old:
+                self._clear_span(axis, new, old)
+        self.origin = origin
+
+    def update(self, x, y, z):
+        """점 (odom 좌표 배열)으로 점이 들어간 셀만 갱신, 갱신한 셀 수 반환"""
+        n = self.cells
+        gx = np.floor(x / self.resolution).astype(np.int64)
+        gy = np.floor(y / self.resolution).astype(np.int64)
+        ox, oy = self.origin
+        inside = (gx >= ox) & (gx < ox + n) & (gy >= oy) & (gy < oy + n)
+        if not inside.any():
+            return 0
+        gx, gy, z = gx[inside], gy[inside], z[inside]
+
+        # 전역 셀 인덱스 → ring buffer 인덱스
+        flat = (gx % n) * n + gy % n
+        touched, inverse = np.unique(flat, return_inverse=True)
+        cell_max = np.full(len(touched), -np.inf, dtype=np.float32)
+        cell_min = np.full(len(touched), np.inf, dtype=np.float32)
+        np.maximum.at(cell_max, inverse, z)
+        np.minimum.at(cell_min, inverse, z)
+        self.max_z.ravel()[touched] = cell_max
+        self.min_z.ravel()[touched] = cell_min
+        return len(touched)
+
+    def window(self, grid):
+        """ring buffer를 창 순서([x, y], 0이 창 왼쪽 아래)로 펼친 복사본"""
+        n = self.cells
+        return np.roll(grid, (-(self.origin[0] % n), -(self.origin[1] % n)), axis=(0, 1))
+
+    def costs(self, max_slope, max_step):
+        """
+        창 순서의 (비용, 고도) 배열
+
+        비용: 0~99는 경사 / max_slope 비례, 경사나 셀 내부 단차가 기준을 넘으면 100,
+        관측 안 된 셀은 -1
+        """
+        elevation = self.window(self.max_z)
+        step = elevation - self.window(self.min_z)
+
+        # 이웃이 비어 있어도 반대쪽 차분으로 경사 계산 (fmax는 NaN을 무시)
+        dx = np.full_like(elevation, np.nan)
+        dy = np.full_like(elevation, np.nan)
+        diff_x = np.abs(np.diff(elevation, axis=0))
+        diff_y = np.abs(np.diff(elevation, axis=1))
+        dx[:-1] = diff_x
+        dx[1:] = np.fmax(dx[1:], diff_x)
+        dy[:, :-1] = diff_y
+        dy[:, 1:] = np.fmax(dy[:, 1:], diff_y)
+        slope = np.hypot(np.nan_to_num(dx), np.nan_to_num(dy)) / self.resolution
+
+        cost = np.minimum(slope / max_slope, 1.0) * (LETHAL_COST - 1)
+        cost = cost.astype(np.int8)
+        cost[(slope > max_slope) | (step > max_step)] = LETHAL_COST
+        cost[np.isnan(elevation)] = UNKNOWN_COST
+        return cost, elevation
+
+
+class ElevationMapNode(Node):
+    """PointCloud2로 고도 격자를 갱신하고 주행 비용 격자/장애물 점을 발행"""
+
+    def __init__(self):
+        super().__init__('elevation_map')
+
+        # Parameters
+        cloud_topic = self.declare_parameter('cloud_topic', '/ouster/points').value
+        self.odom_frame = self.declare_parameter('odom_frame', 'odom').value
+        self.robot_frame = self.declare_parameter('robot_frame', 'base_footprint').value
+        resolution = self.declare_parameter('resolution', 0.1).value
+        size = self.declare_parameter('size', 10.0).value
+        # 로봇 기준 높이 범위 (나뭇가지 등 머리 위 점 제외), 센서 최소 거리
+        self.min_height = self.declare_parameter('min_height', -1.0).value
+        self.max_height = self.declare_parameter('max_height', 1.5).value
+        self.min_range = self.declare_parameter('min_range', 0.5).value
+        max_slope_deg = self.declare_parameter('max_slope_deg', 25.0).value
+        self.max_step = self.declare_parameter('max_step', 0.15).value
+        publish_rate = self.declare_parameter('publish_rate', 2.0).value
+        self.transform_tolerance = self.declare_parameter('transform_tolerance', 0.1).value
+
+        self.max_slope = math.tan(math.radians(max_slope_deg))
+        self.grid = ElevationGrid(size, resolution)
+
+        self.tf_buffer = Buffer()
+        self.tf_listener = TransformListener(self.tf_buffer, self)
+
+        # 출력 메시지/버퍼 재사용
+        n = self.grid.cells
+        self.map_buf = array.array('b', bytes(n * n))
+        self.map_data = np.frombuffer(self.map_buf, dtype=np.int8).reshape(n, n)
+        self.map_msg = OccupancyGrid()
+        self.map_msg.header.frame_id = self.odom_frame
+        self.map_msg.info.resolution = resolution
+        self.map_msg.info.width = n
+        self.map_msg.info.height = n
+        self.map_msg.info.origin.orientation.w = 1.0
+        self.obstacle_msg = PointCloud2()
+        self.obstacle_msg.header.frame_id = self.odom_frame
+        self.obstacle_msg.height = 1
+        self.obstacle_msg.fields = [
+            PointField(name=name, offset=4 * i, datatype=PointField.FLOAT32, count=1)
+            for i, name in enumerate(('x', 'y', 'z'))
+        ]
+        self.obstacle_msg.is_bigendian = False
+        self.obstacle_msg.point_step = 12
+        self.obstacle_msg.is_dense = True
+        self.last_stamp = None
+
+        self.map_pub = self.create_publisher(OccupancyGrid, '/elevation_map', 1)
+        self.obstacle_pub = self.create_publisher(PointCloud2, '/terrain_obstacles', 1)
+        self.cloud_sub = self.create_subscription(
+            PointCloud2,
+            cloud_topic,
+            self.cloud_callback,
+            qos_profile_sensor_data
+        )
+        self.timer = self.create_timer(1.0 / publish_rate, self.publish_callback)
+
+        self.get_logger().info('=' * 60)
+        self.get_logger().info('🚀 Elevation Map 시작!')
+        self.get_logger().info(f'  입력 토픽: {cloud_topic}')
+        self.get_logger().info(f'  격자: {n} x {n} cells ({size} m, {resolution} m/cell), frame {self.odom_frame}')
+        self.get_logger().info(f'  주행 불가: 경사 > {max_slope_deg}° 또는 단차 > {self.max_step} m')
+        self.get_logger().info('=' * 60)
+
+    def _lookup(self, target, source, stamp):
+        return self.tf_buffer.lookup_transform(
+            target, source, stamp, timeout=Duration(seconds=self.transform_tolerance)
+        ).transform
+
+    def cloud_callback(self, msg):
+        """클라우드를 odom으로 변환해 창을 이동시키고 점이 들어간 셀 갱신"""
+        stamp = Time.from_msg(msg.header.stamp)
+        try:
+            sensor = self._lookup(self.odom_frame, msg.header.frame_id, stamp)
+            robot = self._lookup(self.odom_frame, self.robot_frame, stamp).translation
+        except TransformException as e:
+            self.get_logger().warn(f'TF 대기 중: {e}', throttle_duration_sec=5.0)
+            return
+        try:
+            points = cloud_xyz_view(msg)
+        except ValueError as e:
+            self.get_logger().error(str(e), throttle_duration_sec=5.0)
+            return
+
+        # 센서 frame에서 거리 필터 (NaN은 비교가 False라 함께 제외)
+        x = points['x'].astype(np.float32).ravel()
+        y = points['y'].astype(np.float32).ravel()
+        z = points['z'].astype(np.float32).ravel()
+        keep = x * x + y * y + z * z >= self.min_range * self.min_range
+        x, y, z = x[keep], y[keep], z[keep]
+
+        rotation, translation = transform_from_msg(sensor)
+        x, y, z = (
+            rotation[i, 0] * x + rotation[i, 1] * y + rotation[i, 2] * z + translation[i]
+            for i in range(3)
+        )
+        keep = (z >= robot.z + self.min_height) & (z <= robot.z + self.max_height)
+
+        self.grid.recenter(robot.x, robot.y)
+        self.grid.update(x[keep], y[keep], z[keep])
+        self.last_stamp = msg.header.stamp
+
+    def publish_callback(self):
+        """창 전체의 비용 격자와 주행 불가 셀 점을 발행"""
+        if self.grid.origin is None:
+            return
+        cost, elevation = self.grid.costs(self.max_slope, self.max_step)
+        resolution = self.grid.resolution
+
+        # OccupancyGrid는 row-major [y, x]
+        np.copyto(self.map_data, cost.T)
+        self.map_msg.header.stamp = self.last_stamp
+        self.map_msg.info.origin.position.x = self.grid.origin[0] * resolution
+        self.map_msg.info.origin.position.y = self.grid.origin[1] * resolution
+        self.map_msg.data = self.map_buf
+        self.map_pub.publish(self.map_msg)
+
+        ix, iy = np.nonzero(cost == LETHAL_COST)
+        points = np.empty((len(ix), 3), dtype=np.float32)
+        points[:, 0] = (ix + self.grid.origin[0] + 0.5) * resolution
+        points[:, 1] = (iy + self.grid.origin[1] + 0.5) * resolution
+        points[:, 2] = elevation[ix, iy]
+        self.obstacle_msg.header.stamp = self.last_stamp
+        self.obstacle_msg.width = len(points)
+        self.obstacle_msg.row_step = 12 * len(points)
+        self.obstacle_msg.data = array.array('B', points.tobytes())
+        self.obstacle_pub.publish(self.obstacle_msg)
+
+
+def main(args=None):
+    rclpy.init(args=args)
+
+    node = ElevationMapNode()
+
+    try:
+        rclpy.spin(node)
+    except KeyboardInterrupt:
+        node.get_logger().info('\n종료 중...')
+    finally:
+        node.destroy_node()
+        rclpy.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,38 +1,283 @@
 #!/usr/bin/env python3
 
+"""
+LiDAR Scan Filter Node
+
+v3ros_filter.yaml의 laser_filters 체인(LaserScanBoxFilter +
+LaserScanAngularBoundsFilterInPlace)을 같은 프로세스에서 NumPy로 적용합니다.
+예전에는 `ros2 run laser_filters scan_to_scan_filter_chain`을 서브프로세스로 실행했습니다.
+
+스캔 기하(frame_id, angle_min, angle_increment, 빔 수)가 바뀔 때만 다음을 미리 계산:
+1. 각도 필터: 제거할 빔의 boolean 마스크
+2. 로봇 몸체 박스: 빔마다 광선이 박스 안에 있는 거리 구간 [t_enter, t_exit]
+   (box_frame이 스캔 frame과 다르면 TF를 이때 한 번만 조회)
+
+스캔마다 하는 일은 ranges와 구간의 벡터 비교 + 마스크 대입뿐이며,
+출력 메시지와 ranges 버퍼는 재사용합니다.
+
+결과는 laser_filters와 동일:
+- 박스 안의 점 → NaN
+- 각도 구간 (angle_min, angle_max) 안의 빔 → range_max + 1.0, intensity 0
+
+시뮬레이션에서는 launch 파일로 실행해 use_sim_time을 설정합니다 (기본 true):
+    ros2 launch cugo_ros2_control laser_scan_filter.launch.py
+"""
+
+import array
 import os
+
+import numpy as np
+import rclpy
+import yaml
 from ament_index_python.packages import get_package_share_directory
-import subprocess
-import sys
-
-def main():
-    package_dir = get_package_share_directory('cugo_ros2_control')
-    config_file = os.path.join(package_dir, 'config', 'laser_filters', 'v3ros_filter.yaml')
-    
-    if not os.path.exists(config_file):
-        print(f'[ERROR] 설정 파일을 찾을 수 없습니다: {config_file}')
-        sys.exit(1)
-    
-    print(f'[INFO] LiDAR Scan Filter 시작...')
-    print(f'[INFO] 설정 파일: {config_file}')
-    print(f'[INFO] 입력 토픽: /scan')
-    print(f'[INFO] 출력 토픽: /scan_filtered')
-    print('[INFO] 필터 적용 중:')
-    print('  - 로봇 몸체 영역 제거 (Box Filter)')
-    print('  - 알루미늄 프레임 영역 제거 (각도별 필터)')
-    
-    # laser_filters 노드 실행
+from rclpy.node import Node
+from rclpy.qos import qos_profile_sensor_data
+from rclpy.time import Time
+from sensor_msgs.msg import LaserScan
+from tf2_ros import Buffer, TransformException, TransformListener
+
+BOX_FILTER = 'laser_filters/LaserScanBoxFilter'
+ANGULAR_FILTER = 'laser_filters/LaserScanAngularBoundsFilterInPlace'
+
+
+def load_filter_chain(config_file):
+    """
+    laser_filters 파라미터 파일에서 박스/각도 필터 설정 읽기
+
+    Returns:
+        (list, list): 박스 필터 params 리스트, (angle_min, angle_max) 리스트
+    """
+    with open(config_file, 'r') as f:
+        config = yaml.safe_load(f)
+
+    # 노드 이름(scan_to_scan_filter_chain)과 무관하게 첫 번째 섹션 사용
+    params = next(iter(config.values()))['ros__parameters']
+    filter_keys = sorted(
+        (k for k in params if k.startswith('filter')),
+        key=lambda k: int(k[len('filter'):] or 0)
+    )
+
+    boxes, bounds = [], []
+    for key in filter_keys:
+        spec = params[key]
+        if spec['type'] == BOX_FILTER:
+            boxes.append(spec['params'])
+        elif spec['type'] == ANGULAR_FILTER:
+            bounds.append((float(spec['params']['angle_min']), float(spec['params']['angle_max'])))
+        else:
+            raise ValueError(f"{key} ({spec.get('name', '')}): 지원하지 않는 필터 타입 {spec['type']}")
+    return boxes, bounds
+
+
+def angular_mask(angles, bounds):
+    """각도가 (angle_min, angle_max) 구간 중 하나에 들어가는 빔 (laser_filters처럼 경계 제외)"""
+    mask = np.zeros(len(angles), dtype=bool)
+    for lower, upper in bounds:
+        mask |= (angles > lower) & (angles < upper)
+    return mask
+
+
+def box_intervals(angles, box, rotation=None, translation=None):
+    """
+    빔별로 광선이 박스 안에 있는 거리 구간 (t_enter, t_exit)
+
+    센서 원점 translation, 빔 방향 rotation @ (cos, sin, 0)인 광선과 박스의
+    slab 교차를 계산합니다. 점 p(r) = translation + r * direction은 r에 선형이므로
+    range r가 t_enter < r < t_exit이면 박스 안입니다 (교차하지 않으면 빈 구간).
+    """
+    rotation = np.eye(3) if rotation is None else rotation
+    origin = np.zeros(3) if translation is None else np.asarray(translation, dtype=np.float64)
+    directions = rotation @ np.vstack([np.cos(angles), np.sin(angles), np.zeros(len(angles))])
+
+    lower = np.array([box['min_x'], box['min_y'], box['min_z']], dtype=np.float64)
+    upper = np.array([box['max_x'], box['max_y'], box['max_z']], dtype=np.float64)
+
+    t_enter = np.zeros(len(angles))
+    t_exit = np.full(len(angles), np.inf)
+    for axis in range(3):
+        d = directions[axis]
+        parallel = np.abs(d) < 1e-12
+        with np.errstate(divide='ignore'):
+            t1 = (lower[axis] - origin[axis]) / d
+            t2 = (upper[axis] - origin[axis]) / d
+        near = np.where(parallel, -np.inf, np.minimum(t1, t2))
+        far = np.where(parallel, np.inf, np.maximum(t1, t2))
+        # 축과 평행한 광선은 원점이 slab 밖이면 박스를 지나지 않음
+        if not lower[axis] < origin[axis] < upper[axis]:
+            far = np.where(parallel, -np.inf, far)
+        t_enter = np.maximum(t_enter, near)
+        t_exit = np.minimum(t_exit, far)
+    return t_enter.astype(np.float32), t_exit.astype(np.float32)
+
+
+def quaternion_to_matrix(q):
+    x, y, z, w = q.x, q.y, q.z, q.w
+    return np.array([
+        [1 - 2 * (y * y + z * z), 2 * (x * y - z * w), 2 * (x * z + y * w)],
+        [2 * (x * y + z * w), 1 - 2 * (x * x + z * z), 2 * (y * z - x * w)],
+        [2 * (x * z - y * w), 2 * (y * z + x * w), 1 - 2 * (x * x + y * y)],
+    ])
+
+
+class LaserScanFilterNode(Node):
+    """/scan을 구독해 로봇 몸체/알루미늄 프레임 영역을 제거한 /scan_filtered 발행"""
+
+    def __init__(self):
+        super().__init__('laser_scan_filter')
+
+        default_config = os.path.join(
+            get_package_share_directory('cugo_ros2_control'),
+            'config', 'laser_filters', 'v3ros_filter.yaml'
+        )
+
+        # Parameters
+        self.declare_parameter('config_file', default_config)
+        self.declare_parameter('input_topic', '/scan')
+        self.declare_parameter('output_topic', '/scan_filtered')
+
+        config_file = self.get_parameter('config_file').value
+        input_topic = self.get_parameter('input_topic').value
+        output_topic = self.get_parameter('output_topic').value
+
+        self.boxes, self.bounds = load_filter_chain(config_file)
+
+        # 박스 frame이 스캔 frame과 다를 때만 TF 사용
+        self.tf_buffer = None
+        self.tf_listener = None
+        if self.boxes:
+            self.tf_buffer = Buffer()
+            self.tf_listener = TransformListener(self.tf_buffer, self)
+
+        # 스캔 기하별 캐시 (기하가 바뀔 때만 다시 계산)
+        self.geometry = None
+        self.angular = None          # 각도 필터로 제거할 빔 인덱스
+        self.intervals = []          # 박스별 (t_enter, t_exit)
+        self.inside = None           # 박스 안 여부 버퍼
+        self.hit = None
+
+        # 출력 메시지/버퍼 재사용
+        self.out_msg = LaserScan()
+        self.ranges_buf = array.array('f')
+        self.ranges = np.frombuffer(self.ranges_buf, dtype=np.float32)
+        self.intensities_buf = array.array('f')
+        self.intensities = np.frombuffer(self.intensities_buf, dtype=np.float32)
+
+        self.scan_pub = self.create_publisher(LaserScan, output_topic, qos_profile_sensor_data)
+        self.scan_sub = self.create_subscription(
+            LaserScan,
+            input_topic,
+            self.scan_callback,
+            qos_profile_sensor_data
+        )
+
+        self.get_logger().info('=' * 60)
+        self.get_logger().info('🚀 LiDAR Scan Filter 시작!')
+        self.get_logger().info(f'  설정 파일: {config_file}')
+        self.get_logger().info(f'  입력 토픽: {input_topic}')
+        self.get_logger().info(f'  출력 토픽: {output_topic}')
+        self.get_logger().info(f'  로봇 몸체 영역 제거 (Box Filter): {len(self.boxes)}개')
+        self.get_logger().info(f'  알루미늄 프레임 영역 제거 (각도별 필터): {len(self.bounds)}개')
+        self.get_logger().info('=' * 60)
+
+    def _box_transform(self, box_frame, scan_frame):
+        """스캔 frame → box frame (회전 행렬, 이동), 같은 frame이면 항등"""
+        if not scan_frame or box_frame == scan_frame:
+            return None, None
+        t = self.tf_buffer.lookup_transform(box_frame, scan_frame, Time()).transform
+        return (
+            quaternion_to_matrix(t.rotation),
+            (t.translation.x, t.translation.y, t.translation.z),
+        )
+
+    def _update_geometry(self, msg, n):
+        """스캔 기하가 바뀌었으면 마스크/구간/버퍼를 다시 계산, 준비되면 True"""
+        geometry = (msg.header.frame_id, msg.angle_min, msg.angle_increment, n)
+        if geometry == self.geometry:
+            return True
+
+        angles = msg.angle_min + np.arange(n, dtype=np.float64) * msg.angle_increment
+        intervals = []
+        for box in self.boxes:
+            try:
+                rotation, translation = self._box_transform(box['box_frame'], msg.header.frame_id)
+            except TransformException as e:
+                self.get_logger().warn(
+                    f"{box['box_frame']} ← {msg.header.frame_id} TF 대기 중: {e}",
+                    throttle_duration_sec=5.0
+                )
+                return False
+            intervals.append(box_intervals(angles, box, rotation, translation))
+
+        self.angular = np.flatnonzero(angular_mask(angles, self.bounds))
+        self.intervals = intervals
+        self.inside = np.empty(n, dtype=bool)
+        self.hit = np.empty(n, dtype=bool)
+        self.ranges_buf = array.array('f', bytes(4 * n))
+        self.ranges = np.frombuffer(self.ranges_buf, dtype=np.float32)
+        self.geometry = geometry
+        self.get_logger().info(
+            f'스캔 기하 갱신: {n} beams, frame {msg.header.frame_id}, '
+            f'각도 필터 {len(self.angular)} beams'
+        )
+        return True
+
+    def scan_callback(self, msg):
+        """박스/각도 필터 적용 후 발행"""
+        ranges_in = np.frombuffer(msg.ranges, dtype=np.float32)
+        n = len(ranges_in)
+        if not self._update_geometry(msg, n):
+            return
+
+        ranges = self.ranges
+        np.copyto(ranges, ranges_in)
+
+        # 로봇 몸체 박스 → NaN (laser_filters LaserScanBoxFilter, invert: false)
+        for t_enter, t_exit in self.intervals:
+            np.greater(ranges_in, t_enter, out=self.inside)
+            np.less(ranges_in, t_exit, out=self.hit)
+            self.hit &= self.inside
+            np.copyto(ranges, np.float32(np.nan), where=self.hit)
+
+        # 각도 구간 → range_max + 1 (laser_filters LaserScanAngularBoundsFilterInPlace)
+        ranges[self.angular] = msg.range_max + 1.0
+
+        out = self.out_msg
+        out.header = msg.header
+        out.angle_min = msg.angle_min
+        out.angle_max = msg.angle_max
+        out.angle_increment = msg.angle_increment
+        out.time_increment = msg.time_increment
+        out.scan_time = msg.scan_time
+        out.range_min = msg.range_min
+        out.range_max = msg.range_max
+        out.ranges = self.ranges_buf
+
+        if len(msg.intensities) == n:
+            if len(self.intensities) != n:
+                self.intensities_buf = array.array('f', bytes(4 * n))
+                self.intensities = np.frombuffer(self.intensities_buf, dtype=np.float32)
+            np.copyto(self.intensities, np.frombuffer(msg.intensities, dtype=np.float32))
+            self.intensities[self.angular] = 0.0
+            out.intensities = self.intensities_buf
+        else:
+            out.intensities = msg.intensities
+
+        self.scan_pub.publish(out)
+
+
+def main(args=None):
+    rclpy.init(args=args)
+
+    node = LaserScanFilterNode()
+
     try:
-        subprocess.run([
-            'ros2', 'run', 'laser_filters', 'scan_to_scan_filter_chain',
-            '--ros-args',
-            '--params-file', config_file,
-            '-r', 'scan:=/scan',
-            '-r', 'scan_filtered:=/scan_filtered',
-            '-p', 'use_sim_time:=true'
-        ])
+        rclpy.spin(node)
     except KeyboardInterrupt:
-        print('\n[INFO] LiDAR Filter 종료')
+        node.get_logger().info('\nLiDAR Filter 종료')
+    finally:
+        node.destroy_node()
+        rclpy.shutdown()
+
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
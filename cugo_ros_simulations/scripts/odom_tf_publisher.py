@@ -10,75 +10,120 @@ odom → base_footprint TF를 발행하지 않습니다.
 1. /odom 토픽을 구독
 2. odom → base_footprint TF를 발행
 3. IMU 데이터가 제대로 작동하도록 TF tree를 완성
+
+메시지마다 새 객체를 만들지 않도록 TransformStamped와 TFMessage를 미리 만들어
+재사용하고, /tf에 직접 발행합니다 (TransformBroadcaster는 매번 TFMessage를 새로 만듦).
+
+발행 모드:
+- max_rate: 0 (기본) → /odom 메시지마다 즉시 발행
+- max_rate: N Hz → 최신 /odom만 보관했다가 최대 N Hz로 발행 (새 메시지가 없으면 건너뜀)
+
+qos_depth(기본 1)로 구독 큐를 줄여 부하가 걸려도 오래된 odom이 쌓이지 않게 합니다.
+
+노드 인자(namespace, parameter_overrides 등)는 Node로 그대로 넘기므로 다른 Python
+노드와 같은 프로세스/executor에 올려 실행할 수 있습니다:
+    executor.add_node(OdomTFPublisher(parameter_overrides=[...]))
 """
 
 import rclpy
 from rclpy.node import Node
+from rclpy.qos import QoSProfile
 from nav_msgs.msg import Odometry
 from geometry_msgs.msg import TransformStamped
-from tf2_ros import TransformBroadcaster
+from tf2_msgs.msg import TFMessage
 
 
 class OdomTFPublisher(Node):
     """Odometry 메시지를 받아서 TF로 브로드캐스트"""
-    
-    def __init__(self):
-        super().__init__('odom_tf_publisher')
-        
+
+    def __init__(self, **kwargs):
+        super().__init__('odom_tf_publisher', **kwargs)
+
         # Parameters
         self.declare_parameter('odom_topic', '/odom')
         self.declare_parameter('odom_frame', 'odom')
         self.declare_parameter('base_frame', 'base_footprint')
-        
+        self.declare_parameter('max_rate', 0.0)
+        self.declare_parameter('qos_depth', 1)
+
         odom_topic = self.get_parameter('odom_topic').value
         self.odom_frame = self.get_parameter('odom_frame').value
         self.base_frame = self.get_parameter('base_frame').value
-        
-        # TF Broadcaster
-        self.tf_broadcaster = TransformBroadcaster(self)
-        
+        max_rate = self.get_parameter('max_rate').value
+        qos_depth = self.get_parameter('qos_depth').value
+
+        # 재사용할 TransformStamped (frame은 고정이므로 한 번만 설정)
+        self.transform = TransformStamped()
+        self.transform.header.frame_id = self.odom_frame
+        self.transform.child_frame_id = self.base_frame
+        self.tf_message = TFMessage(transforms=[self.transform])
+
+        # TF Publisher (TransformBroadcaster와 같은 /tf, 큐 깊이만 설정값 사용)
+        self.tf_pub = self.create_publisher(TFMessage, '/tf', QoSProfile(depth=qos_depth))
+
+        # 최신 /odom만 보관 (max_rate 모드)
+        self.latest_odom = None
+        self.timer = None
+        if max_rate > 0.0:
+            callback = self.store_latest
+            self.timer = self.create_timer(1.0 / max_rate, self.timer_callback)
+        else:
+            callback = self.odom_callback
+
         # Subscriber
         self.odom_sub = self.create_subscription(
             Odometry,
             odom_topic,
-            self.odom_callback,
-            10
+            callback,
+            QoSProfile(depth=qos_depth)
         )
-        
+
+        mode = f'최신 odom만 최대 {max_rate:g} Hz' if max_rate > 0.0 else 'odom 메시지마다'
         self.get_logger().info('='*60)
         self.get_logger().info('🚀 Odom TF Publisher 시작!')
         self.get_logger().info(f'  Odom 토픽: {odom_topic}')
         self.get_logger().info(f'  TF: {self.odom_frame} → {self.base_frame}')
+        self.get_logger().info(f'  발행: {mode} (QoS depth {qos_depth})')
         self.get_logger().info('='*60)
-    
+
     def odom_callback(self, msg):
-        """Odometry 메시지를 TF로 변환"""
-        
-        # TransformStamped 메시지 생성
-        t = TransformStamped()
-        
+        """Odometry 메시지를 TF로 변환 (미리 만든 TransformStamped 재사용)"""
+        t = self.transform
+
         # Header
         t.header.stamp = msg.header.stamp
-        t.header.frame_id = self.odom_frame
-        t.child_frame_id = self.base_frame
-        
+
         # Position
-        t.transform.translation.x = msg.pose.pose.position.x
-        t.transform.translation.y = msg.pose.pose.position.y
-        t.transform.translation.z = msg.pose.pose.position.z
-        
+        position = msg.pose.pose.position
+        translation = t.transform.translation
+        translation.x = position.x
+        translation.y = position.y
+        translation.z = position.z
+
         # Orientation
         t.transform.rotation = msg.pose.pose.orientation
-        
+
         # TF 발행
-        self.tf_broadcaster.sendTransform(t)
+        self.tf_pub.publish(self.tf_message)
+
+    def store_latest(self, msg):
+        """max_rate 모드: 최신 메시지만 보관"""
+        self.latest_odom = msg
+
+    def timer_callback(self):
+        """max_rate 모드: 마지막 발행 이후 새 odom이 있으면 발행"""
+        msg = self.latest_odom
+        if msg is None:
+            return
+        self.latest_odom = None
+        self.odom_callback(msg)
 
 
 def main(args=None):
     rclpy.init(args=args)
-    
+
     node = OdomTFPublisher()
-    
+
     try:
         rclpy.spin(node)
     except KeyboardInterrupt:
@@ -90,4 +135,3 @@ def main(args=None):
 
 if __name__ == '__main__':
     main()
-
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+
+"""
+PointCloud2 → LaserScan Projection Node
+
+pointcloud_to_laserscan 패키지 노드를 대체하는 NumPy 구현입니다.
+같은 파라미터 파일(config/laser_filters/pointcloud_to_laserscan.yaml)을 그대로 읽고
+같은 규칙으로 투영합니다:
+1. (target_frame이 있으면) 점을 target_frame으로 변환
+2. min_height ≤ z ≤ max_height, range_min ≤ hypot(x, y) ≤ range_max인 점만 사용
+3. atan2(y, x)로 각도 bin을 정하고 bin마다 최소 거리
+4. 점이 없는 bin은 inf (use_inf: false면 range_max + inf_epsilon)
+
+PointCloud2의 data 버퍼를 x/y/z 필드만 가진 structured dtype으로 복사 없이 보고,
+필터는 벡터 마스크로, bin별 최소값은 np.minimum.at으로 계산합니다.
+concurrency_level이 1보다 크면 클라우드를 row 단위로 나눠 스레드마다 bin 최소값을
+구한 뒤 합치지만, np.minimum.at이 GIL을 잡고 있어 128x2048 클라우드에서도
+8.7 ms → 8.2 ms 정도로 이득이 거의 없습니다. 그래서 기본은 단일 스레드이고
+0(upstream에서는 CPU 코어 수)도 1로 취급합니다.
+
+센서가 target_frame에 고정되어 있으면(cugo_v3: ouster_sensor_link → base_link)
+TF는 frame별로 한 번만 조회해 재사용합니다 (cache_transform: false면 매 클라우드 조회).
+"""
+
+import array
+import math
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import rclpy
+from rclpy.duration import Duration
+from rclpy.node import Node
+from rclpy.qos import qos_profile_sensor_data
+from rclpy.time import Time
+from sensor_msgs.msg import LaserScan, PointCloud2, PointField
+from tf2_ros import Buffer, TransformException, TransformListener
+
+# PointField datatype → NumPy 타입 (x/y/z에 쓰이는 실수형만)
+FIELD_TYPES = {
+    PointField.FLOAT32: 'f4',
+    PointField.FLOAT64: 'f8',
+}
+
+
+def cloud_xyz_view(msg):
+    """
+    PointCloud2 data를 (height, width) 모양의 x/y/z structured 배열로 복사 없이 보기
+
+    row_step에 padding이 있어도 stride로 처리합니다.
+    """
+    fields = {f.name: f for f in msg.fields}
+    missing = [name for name in ('x', 'y', 'z') if name not in fields]
+    if missing:
+        raise ValueError(f"PointCloud2에 {', '.join(missing)} 필드가 없습니다")
+
+    order = '>' if msg.is_bigendian else '<'
+    formats = []
+    for name in ('x', 'y', 'z'):
+        field = fields[name]
+        if field.datatype not in FIELD_TYPES:
+            raise ValueError(f'{name} 필드 타입({field.datatype})은 지원하지 않습니다')
+        formats.append(order + FIELD_TYPES[field.datatype])
+
+    dtype = np.dtype({
+        'names': ['x', 'y', 'z'],
+        'formats': formats,
+        'offsets': [fields[name].offset for name in ('x', 'y', 'z')],
+        'itemsize': msg.point_step,
+    })
+    buffer = memoryview(msg.data).cast('B')
+    return np.ndarray(
+        shape=(msg.height, msg.width),
+        dtype=dtype,
+        buffer=buffer,
+        strides=(msg.row_step, msg.point_step),
+    )
+
+
+def transform_from_msg(transform):
+    """geometry_msgs/Transform → (3x3 회전 행렬, 이동 벡터)"""
+    q = transform.rotation
+    x, y, z, w = q.x, q.y, q.z, q.w
+    rotation = np.array([
+        [1 - 2 * (y * y + z * z), 2 * (x * y - z * w), 2 * (x * z + y * w)],
+        [2 * (x * y + z * w), 1 - 2 * (x * x + z * z), 2 * (y * z - x * w)],
+        [2 * (x * z - y * w), 2 * (y * z + x * w), 1 - 2 * (x * x + y * y)],
+    ], dtype=np.float32)
+    t = transform.translation
+    return rotation, np.array([t.x, t.y, t.z], dtype=np.float32)
+
+
+class ScanProjector:
+    """ROS와 무관한 투영 계산기 (파라미터는 pointcloud_to_laserscan과 동일)"""
+
+    def __init__(self, angle_min, angle_max, angle_increment, min_height, max_height,
+                 range_min, range_max, use_inf=True, inf_epsilon=1.0, num_threads=1):
+        self.angle_min = angle_min
+        self.angle_max = angle_max
+        self.angle_increment = angle_increment
+        self.min_height = min_height
+        self.max_height = max_height
+        self.range_min_sq = range_min * range_min
+        self.range_max_sq = range_max * range_max
+        self.num_bins = int(math.ceil((angle_max - angle_min) / angle_increment))
+        self.fill = np.inf if use_inf else range_max + inf_epsilon
+        self.num_threads = max(1, num_threads)
+        self.pool = ThreadPoolExecutor(self.num_threads) if self.num_threads > 1 else None
+
+    def _project(self, points, ranges, rotation=None, translation=None):
+        """points (structured, 임의 모양)의 bin별 최소 거리를 ranges에 반영"""
+        x = points['x'].astype(np.float32).ravel()
+        y = points['y'].astype(np.float32).ravel()
+        z = points['z'].astype(np.float32).ravel()
+        if rotation is not None:
+            x, y, z = (
+                rotation[i, 0] * x + rotation[i, 1] * y + rotation[i, 2] * z + translation[i]
+                for i in range(3)
+            )
+
+        # NaN은 비교가 모두 False라 자동으로 제외됨
+        range_sq = x * x + y * y
+        mask = (z >= self.min_height) & (z <= self.max_height)
+        mask &= (range_sq >= self.range_min_sq) & (range_sq <= self.range_max_sq)
+        x, y, range_sq = x[mask], y[mask], range_sq[mask]
+
+        angle = np.arctan2(y, x)
+        inside = (angle >= self.angle_min) & (angle <= self.angle_max)
+        index = ((angle[inside] - self.angle_min) / self.angle_increment).astype(np.intp)
+        np.minimum(index, self.num_bins - 1, out=index)   # angle == angle_max 경계
+        np.minimum.at(ranges, index, np.sqrt(range_sq[inside]))
+
+    def project(self, points, out, rotation=None, translation=None):
+        """
+        (height, width) 점 배열을 out(float32, num_bins)에 투영
+
+        스레드가 여러 개면 row 단위 샤드별로 bin 최소값을 구해 합칩니다.
+        """
+        out.fill(self.fill)
+        rows = points.shape[0]
+        if self.pool is None or rows < 2:
+            self._project(points, out, rotation, translation)
+            return out
+
+        bounds = np.linspace(0, rows, min(self.num_threads, rows) + 1).astype(int)
+        shards = [np.full(self.num_bins, self.fill, dtype=np.float32) for _ in bounds[1:]]
+        futures = [
+            self.pool.submit(self._project, points[start:end], shard, rotation, translation)
+            for start, end, shard in zip(bounds[:-1], bounds[1:], shards)
+        ]
+        for future in futures:
+            future.result()
+        for shard in shards:
+            np.minimum(out, shard, out=out)
+        return out
+
+    def shutdown(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+
+
+class PointCloudToScanNode(Node):
+    """cloud_in(PointCloud2)을 구독해 scan(LaserScan) 발행"""
+
+    def __init__(self):
+        super().__init__('pointcloud_to_laserscan')
+
+        # Parameters (pointcloud_to_laserscan과 같은 이름/기본값)
+        self.target_frame = self.declare_parameter('target_frame', '').value
+        self.transform_tolerance = self.declare_parameter('transform_tolerance', 0.01).value
+        min_height = self.declare_parameter('min_height', float(np.finfo(np.float64).min)).value
+        max_height = self.declare_parameter('max_height', float(np.finfo(np.float64).max)).value
+        angle_min = self.declare_parameter('angle_min', -math.pi).value
+        angle_max = self.declare_parameter('angle_max', math.pi).value
+        angle_increment = self.declare_parameter('angle_increment', math.pi / 180.0).value
+        self.scan_time = self.declare_parameter('scan_time', 1.0 / 30.0).value
+        self.range_min = self.declare_parameter('range_min', 0.0).value
+        self.range_max = self.declare_parameter('range_max', float(np.finfo(np.float64).max)).value
+        use_inf = self.declare_parameter('use_inf', True).value
+        inf_epsilon = self.declare_parameter('inf_epsilon', 1.0).value
+        concurrency_level = self.declare_parameter('concurrency_level', 1).value
+        self.cache_transform = self.declare_parameter('cache_transform', True).value
+
+        # 스레드 분할은 GIL 때문에 거의 빨라지지 않으므로 명시적으로 지정했을 때만 사용
+        num_threads = max(1, concurrency_level)
+        self.projector = ScanProjector(
+            angle_min, angle_max, angle_increment, min_height, max_height,
+            self.range_min, self.range_max, use_inf, inf_epsilon, num_threads
+        )
+
+        self.tf_buffer = Buffer()
+        self.tf_listener = TransformListener(self.tf_buffer, self)
+        self.transforms = {}   # source frame → (rotation, translation), cache_transform일 때
+
+        # 출력 메시지/버퍼 재사용
+        self.ranges_buf = array.array('f', bytes(4 * self.projector.num_bins))
+        self.ranges = np.frombuffer(self.ranges_buf, dtype=np.float32)
+        self.out_msg = LaserScan()
+        self.out_msg.angle_min = angle_min
+        self.out_msg.angle_max = angle_max
+        self.out_msg.angle_increment = angle_increment
+        self.out_msg.time_increment = 0.0
+        self.out_msg.scan_time = self.scan_time
+        self.out_msg.range_min = self.range_min
+        self.out_msg.range_max = self.range_max
+
+        self.scan_pub = self.create_publisher(LaserScan, 'scan', qos_profile_sensor_data)
+        self.cloud_sub = self.create_subscription(
+            PointCloud2,
+            'cloud_in',
+            self.cloud_callback,
+            qos_profile_sensor_data
+        )
+
+        self.get_logger().info('=' * 60)
+        self.get_logger().info('🚀 PointCloud → LaserScan 시작!')
+        self.get_logger().info(f'  Target frame: {self.target_frame or "(cloud frame)"}')
+        self.get_logger().info(f'  높이: {min_height} ~ {max_height} m, 거리: {self.range_min} ~ {self.range_max} m')
+        self.get_logger().info(f'  Bins: {self.projector.num_bins}, 스레드: {num_threads}')
+        self.get_logger().info('=' * 60)
+
+    def _lookup_transform(self, msg):
+        """cloud frame → target_frame 변환, target_frame이 없거나 같으면 (None, None)"""
+        source = msg.header.frame_id
+        if not self.target_frame or source == self.target_frame:
+            return None, None
+        if self.cache_transform:
+            if source not in self.transforms:
+                t = self.tf_buffer.lookup_transform(self.target_frame, source, Time())
+                self.transforms[source] = transform_from_msg(t.transform)
+            return self.transforms[source]
+        t = self.tf_buffer.lookup_transform(
+            self.target_frame, source, Time.from_msg(msg.header.stamp),
+            timeout=Duration(seconds=self.transform_tolerance)
+        )
+        return transform_from_msg(t.transform)
+
+    def cloud_callback(self, msg):
+        """PointCloud2를 LaserScan으로 투영해 발행"""
+        try:
+            rotation, translation = self._lookup_transform(msg)
+        except TransformException as e:
+            self.get_logger().warn(
+                f'{self.target_frame} ← {msg.header.frame_id} TF 대기 중: {e}',
+                throttle_duration_sec=5.0
+            )
+            return
+
+        try:
+            points = cloud_xyz_view(msg)
+        except ValueError as e:
+            self.get_logger().error(str(e), throttle_duration_sec=5.0)
+            return
+
+        self.projector.project(points, self.ranges, rotation, translation)
+
+        out = self.out_msg
+        out.header.stamp = msg.header.stamp
+        out.header.frame_id = self.target_frame or msg.header.frame_id
+        out.ranges = self.ranges_buf
+        self.scan_pub.publish(out)
+
+    def destroy_node(self):
+        self.projector.shutdown()
+        super().destroy_node()
+
+
+def main(args=None):
+    rclpy.init(args=args)
+
+    node = PointCloudToScanNode()
+
+    try:
+        rclpy.spin(node)
+    except KeyboardInterrupt:
+        node.get_logger().info('\n종료 중...')
+    finally:
+        node.destroy_node()
+        rclpy.shutdown()
+
+
+if __name__ == '__main__':
+    main()